@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import views_async
 from .views import (
     LoginView, LogoutView, SignUpView, CurrentUserView,
     CSRFTokenView, APIRootView, BoardViewSet, TaskViewSet,
     UserViewSet, UserAssignmentsView, UserAssignedBoardsView,
-    TaskStatusUpdateView
+    TaskStatusUpdateView, TaskMoveView, SearchView, ChangeFeedView,
+    ResponseCacheStatsView, RequestMetricsView
 )
 
 router = DefaultRouter()
@@ -22,5 +24,16 @@ urlpatterns = [
     path('users/<int:user_id>/assignments/', UserAssignmentsView.as_view(), name='user-assignments'),
     path('users/<int:user_id>/assigned-boards/', UserAssignedBoardsView.as_view(), name='user-assigned-boards'),
     path('tasks/<int:task_id>/status/', TaskStatusUpdateView.as_view(), name='task-status-update'),
+    path('tasks/<int:task_id>/move/', TaskMoveView.as_view(), name='task-move'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('changes/', ChangeFeedView.as_view(), name='change-feed'),
+    path('metrics/requests/', RequestMetricsView.as_view(), name='request-metrics'),
+    path('metrics/response-cache/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
+    path('async/boards/', views_async.board_list, name='async-board-list'),
+    path('async/boards/<int:pk>/', views_async.board_detail, name='async-board-detail'),
+    path('async/tasks/', views_async.task_list, name='async-task-list'),
+    path('async/users/me/', views_async.current_user, name='async-current-user'),
+    path('async/users/<int:user_id>/assignments/', views_async.user_assignments, name='async-user-assignments'),
+    path('async/users/<int:user_id>/assigned-boards/', views_async.user_assigned_boards, name='async-user-assigned-boards'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class BoardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'boards'
\ No newline at end of file
+    name = 'boards'
+
+    def ready(self):
+        from . import signals  # noqa: F401
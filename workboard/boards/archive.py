@@ -0,0 +1,327 @@
+# boards/archive.py
+"""
+Board export and import in a streaming NDJSON format, behind
+``GET /api/boards/export/``, ``GET /api/boards/<id>/export/``,
+``POST /api/boards/import/`` and ``manage.py export_boards``/``import_boards``.
+
+An archive is one JSON object per line, optionally gzip-compressed::
+
+    {"type": "archive", "version": 1, "exported_at": "2026-01-01T00:00:00Z"}
+    {"type": "board", "id": 1, "name": "Launch", "description": "", "owner": "a@b.com", ...}
+    {"type": "task", "board": 1, "title": "Write docs", "status": "To-Do", "rank": "i",
+     "assignee": "c@d.com", "created_by": "a@b.com", ...}
+
+Every board line comes before its tasks, and users appear by email only.
+
+Both directions run in constant memory, whatever the number of tasks. The
+export reads ``EXPORT_CHUNK_SIZE`` boards at a time with one query for all of
+their tasks (``.values_list()`` rows with the users' emails joined in), and
+writes ``BLOCK_SIZE`` pieces of output. The import reads the archive line by
+line and creates ``IMPORT_BATCH_SIZE`` tasks per ``bulk_create`` and
+transaction. The emails of a batch are resolved with one query, and counters,
+the change feed and board versions are updated once per batch, as in
+``boards.bulk``. No realtime events are published.
+
+Imported boards and tasks are new objects, with new ids and timestamps, and
+keep the order of their columns through their ranks. Boards belong to the
+importing user, or to their archived owner when the command is run without
+``--owner``. Assignees are matched by email, case-insensitively, and unknown
+ones are left unassigned. Tasks imported through the API are created by the
+importing user; only the command (``match_creators``) matches archived
+creators by email, with unknown ones becoming the board's owner. A malformed line stops the import with ``ArchiveError``; the batches
+committed before it stay.
+
+Configured with ``settings.BOARD_ARCHIVES``.
+"""
+import json
+import zlib
+from collections import Counter
+from itertools import chain, islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from . import changelog, counters, renderers
+from .models import Board, Task
+from .ranking import DIGITS, MAX_LENGTH, between
+
+User = get_user_model()
+
+DEFAULTS = {
+    # Boards read per query on export; their tasks are read in chunks of this many rows too.
+    'EXPORT_CHUNK_SIZE': 500,
+    # Tasks created per bulk_create and transaction on import.
+    'IMPORT_BATCH_SIZE': 1000,
+}
+
+VERSION = 1
+BLOCK_SIZE = 64 * 1024
+# Longer lines are rejected rather than buffered.
+MAX_LINE_LENGTH = 1024 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+VALID_STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+BOARD_COLUMNS = ('id', 'name', 'description', 'owner__email', 'created_at', 'updated_at')
+BOARD_KEYS = ('id', 'name', 'description', 'owner', 'created_at', 'updated_at')
+TASK_COLUMNS = (
+    'board_id', 'title', 'description', 'status', 'rank', 'assignee__email', 'created_by__email',
+    'created_at', 'updated_at',
+)
+TASK_KEYS = ('board', 'title', 'description', 'status', 'rank', 'assignee', 'created_by', 'created_at', 'updated_at')
+
+
+class ArchiveError(Exception):
+    # What was committed before the error, set by import_archive.
+    imported = None
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'BOARD_ARCHIVES', {})}
+
+
+def _line(record):
+    return renderers.dumps(record) + b'\n'
+
+
+def _blocks(pieces, size=BLOCK_SIZE):
+    # Few large writes rather than one per line.
+    buffer, length = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzip(blocks):
+    compressor = zlib.compressobj(wbits=31)
+    for block in blocks:
+        if data := compressor.compress(block):
+            yield data
+    yield compressor.flush()
+
+
+def _records(boards, chunk_size):
+    yield {'type': 'archive', 'version': VERSION, 'exported_at': timezone.now()}
+    rows = boards.order_by('pk').values_list(*BOARD_COLUMNS).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        tasks = (
+            Task.objects.using(boards.db)
+            .filter(board_id__in=[row[0] for row in chunk])
+            .order_by('board_id', 'status', 'rank', 'pk')
+            .values_list(*TASK_COLUMNS)
+            .iterator(chunk_size=chunk_size)
+        )
+        task = next(tasks, None)
+        for row in chunk:
+            yield {'type': 'board', **dict(zip(BOARD_KEYS, row))}
+            while task is not None and task[0] == row[0]:
+                yield {'type': 'task', **dict(zip(TASK_KEYS, task))}
+                task = next(tasks, None)
+
+
+def export_archive(boards, compress=False):
+    """
+    The archive of ``boards`` (a queryset) and their tasks, as pieces of
+    bytes of about ``BLOCK_SIZE``; gzip-compressed when ``compress`` is set.
+    """
+    # Pin the database now: the rows are read lazily, possibly after a view
+    # returned and its replica routing (boards.replicas) ended.
+    boards = boards.using(boards.db)
+    blocks = _blocks(_line(record) for record in _records(boards, get_config()['EXPORT_CHUNK_SIZE']))
+    return _gzip(blocks) if compress else blocks
+
+
+def _gunzip(blocks):
+    decompressor = zlib.decompressobj(wbits=31)
+    try:
+        for block in blocks:
+            # Bounded output per call, so a small archive cannot inflate into memory at once.
+            data = decompressor.decompress(block, BLOCK_SIZE)
+            while data:
+                yield data
+                data = decompressor.decompress(decompressor.unconsumed_tail, BLOCK_SIZE)
+        yield decompressor.flush()
+    except zlib.error as e:
+        raise ArchiveError(f'The archive is not valid gzip: {e}')
+
+
+def archive_lines(stream):
+    """The lines of the archive read from ``stream`` (a binary file object), gunzipped when compressed."""
+    blocks = iter(lambda: stream.read(BLOCK_SIZE), b'')
+    first = next(blocks, b'')
+    blocks = chain([first], blocks)
+    if first.startswith(GZIP_MAGIC):
+        blocks = _gunzip(blocks)
+    pending = b''
+    for block in blocks:
+        *lines, pending = (pending + block).split(b'\n')
+        if len(pending) > MAX_LINE_LENGTH:
+            raise ArchiveError(f'Lines are limited to {MAX_LINE_LENGTH} bytes.')
+        yield from lines
+    if pending:
+        yield pending
+
+
+def users_by_email(emails):
+    """``{lowercased email: user}`` for ``emails``, in one query."""
+    emails = {email.strip().lower() for email in emails if email}
+    if not emails:
+        return {}
+    users = User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=emails)
+    return {user.email_lower: user for user in users}
+
+
+def _valid_rank(rank):
+    return (
+        isinstance(rank, str) and 0 < len(rank) <= MAX_LENGTH
+        and rank[-1] != '0' and all(digit in DIGITS for digit in rank)
+    )
+
+
+def _text(record, key, number, required=False, max_length=None):
+    value = record.get(key)
+    if value is None and not required:
+        return ''
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise ArchiveError(f'Line {number}: "{key}" must be a{" non-empty" if required else ""} string.')
+    if max_length is not None and len(value) > max_length:
+        raise ArchiveError(f'Line {number}: "{key}" is limited to {max_length} characters.')
+    return value.strip() if required else value
+
+
+def _email(record, key, number):
+    value = record.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ArchiveError(f'Line {number}: "{key}" must be an email address or null.')
+    return value or None
+
+
+class _Importer:
+    def __init__(self, owner, batch_size, match_creators):
+        self.owner = owner
+        self.match_creators = match_creators
+        self.batch_size = batch_size
+        # Archived board id -> (new board id, owner id).
+        self.boards = {}
+        self.pending = []
+        # (board id, status) -> highest rank imported so far.
+        self.last_ranks = {}
+        self.stats = Counter(boards=0, tasks=0, unassigned=0)
+
+    def run(self, lines):
+        started = False
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ArchiveError(f'Line {number}: not valid JSON.')
+            if not isinstance(record, dict):
+                raise ArchiveError(f'Line {number}: expected a JSON object.')
+            kind = record.get('type')
+            if not started:
+                if kind != 'archive' or record.get('version') != VERSION:
+                    raise ArchiveError(f'Not a version {VERSION} board archive.')
+                started = True
+            elif kind == 'board':
+                self.add_board(record, number)
+            elif kind == 'task':
+                self.add_task(record, number)
+            else:
+                raise ArchiveError(f'Line {number}: unknown record type {kind!r}.')
+        if not started:
+            raise ArchiveError('The archive is empty.')
+        self.flush()
+        return dict(self.stats)
+
+    def add_board(self, record, number):
+        ref = record.get('id')
+        if not isinstance(ref, (int, str)) or ref in self.boards:
+            raise ArchiveError(f'Line {number}: boards need a unique "id".')
+        name = _text(record, 'name', number, required=True, max_length=255)
+        description = _text(record, 'description', number)
+        owner = self.owner
+        if owner is None:
+            email = _email(record, 'owner', number)
+            owner = users_by_email([email]).get(email.strip().lower()) if email else None
+            if owner is None:
+                raise ArchiveError(f'Line {number}: no user with the email {email!r} to own the board.')
+        with transaction.atomic():
+            board = Board.objects.create(name=name, description=description, owner=owner)
+        self.boards[ref] = (board.pk, owner.pk)
+        self.stats['boards'] += 1
+
+    def add_task(self, record, number):
+        ref = record.get('board')
+        board = self.boards.get(ref) if isinstance(ref, (int, str)) else None
+        if board is None:
+            raise ArchiveError(f'Line {number}: tasks must follow the line of their board.')
+        task_status = record.get('status', 'To-Do')
+        if task_status not in VALID_STATUSES:
+            raise ArchiveError(f'Line {number}: invalid status {task_status!r}.')
+        self.pending.append((
+            board, _text(record, 'title', number, required=True, max_length=255),
+            _text(record, 'description', number), task_status, record.get('rank'),
+            _email(record, 'assignee', number),
+            _email(record, 'created_by', number) if self.match_creators else None,
+        ))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        # One query for every assignee and creator of the batch.
+        users = users_by_email(email for *_, assignee, creator in self.pending for email in (assignee, creator))
+        tasks, snapshots = [], []
+        for (board_id, owner_id), title, description, task_status, rank, assignee_email, creator in self.pending:
+            assignee = users.get(assignee_email.strip().lower()) if assignee_email else None
+            creator = users.get(creator.strip().lower()) if creator else None
+            if assignee_email and assignee is None:
+                self.stats['unassigned'] += 1
+            column = (board_id, task_status)
+            last = self.last_ranks.get(column)
+            if not _valid_rank(rank):
+                # bulk_create skips Task.save, which would put the task at the bottom of its column.
+                rank = between(last, None)
+            self.last_ranks[column] = rank if last is None or rank > last else last
+            task = Task(
+                board_id=board_id, title=title, description=description, status=task_status, rank=rank,
+                assignee=assignee, created_by_id=creator.pk if creator else owner_id,
+            )
+            tasks.append(task)
+            snapshots.append(
+                counters.TaskSnapshot(board_id, owner_id, task.assignee_id, task.created_by_id, task_status)
+            )
+        with transaction.atomic(), counters.suspended():
+            created = Task.objects.bulk_create(tasks)
+            counters.record_changes([(None, after) for after in snapshots])
+            changelog.record_tasks([(task.pk, 'created', None, after) for task, after in zip(created, snapshots)])
+            Board.objects.touch(task.board_id for task in created)
+        self.stats['tasks'] += len(created)
+        self.pending = []
+
+
+def import_archive(lines, owner=None, batch_size=None, match_creators=False):
+    """
+    Create the boards and tasks of an archive from ``lines`` (bytes, as from
+    ``archive_lines``); boards belong to ``owner``, or to their archived owner
+    when it is None. Tasks are created by their board's owner unless
+    ``match_creators`` is set, which trusts the archive's ``created_by``
+    emails and is only for administrators (``import_boards``). Returns ``{'boards': n, 'tasks': n, 'unassigned': n}``,
+    ``unassigned`` counting the tasks whose assignee email matched no user.
+    """
+    importer = _Importer(owner, batch_size or get_config()['IMPORT_BATCH_SIZE'], match_creators)
+    try:
+        return importer.run(lines)
+    except ArchiveError as e:
+        e.imported = dict(importer.stats)
+        raise
@@ -0,0 +1,183 @@
+# boards/authentication.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+DEFAULTS = {
+    # Entries kept in each process' LRU.
+    'MAX_ENTRIES': 4096,
+    # Seconds a process-local entry is trusted; 0 turns the local tier off.
+    # Without a shared cache this also bounds how long a revoked token can
+    # survive in *other* processes.
+    'TTL': 30,
+    # Optional Django cache alias shared by all processes (e.g. Redis). It
+    # also holds a generation per token that every hit is checked against,
+    # so a revocation in one process reaches the others at once.
+    'SHARED_CACHE': None,
+    'SHARED_TTL': 300,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+
+
+class TokenLRUCache:
+    """Bounded, thread-safe LRU of token key -> (user, token, generation) with a TTL."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            stale = [key for key, (_, (user, _token, _generation)) in self._entries.items() if user.pk == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache():
+    global _local_cache
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                config = get_config()
+                _local_cache = TokenLRUCache(config['MAX_ENTRIES'], config['TTL'])
+    return _local_cache
+
+
+def _shared_cache():
+    alias = get_config()['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    return f'token_auth_{key}'
+
+
+def _generation_key(key):
+    return f'token_auth_generation_{key}'
+
+
+def _retire(shared, keys):
+    # Any new generation retires the entries of every process that were
+    # filled before it; it only has to outlive them.
+    config = get_config()
+    generation = time.time_ns()
+    shared.set_many(
+        {_generation_key(key): generation for key in keys},
+        timeout=max(config['TTL'], config['SHARED_TTL']),
+    )
+
+
+def invalidate_token(key):
+    """Forget a cached token, e.g. after logout."""
+    get_local_cache().delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_shared_key(key))
+        _retire(shared, [key])
+
+
+def invalidate_user(user):
+    """Forget every cached token of ``user`` (password change, deactivation)."""
+    from rest_framework.authtoken.models import Token
+
+    get_local_cache().delete_user(user.pk)
+    shared = _shared_cache()
+    if shared is not None:
+        keys = list(Token.objects.filter(user_id=user.pk).values_list('key', flat=True))
+        shared.delete_many([_shared_key(key) for key in keys])
+        _retire(shared, keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that remembers recent token -> user lookups.
+
+    Lookups are served from a per-process LRU first, then from the optional
+    shared cache tier (``TOKEN_AUTH_CACHE['SHARED_CACHE']``), and only then
+    from the ``authtoken_token`` table. Entries are dropped when the token is
+    deleted and when its user is saved (password change, deactivation). With
+    a shared tier, those drops also bump the token's generation there, and
+    entries filled under an older generation are ignored by every process.
+    """
+
+    def authenticate_credentials(self, key):
+        local = get_local_cache()
+        shared = _shared_cache()
+        cached = local.get(key)
+        if shared is None:
+            if cached is None:
+                cached = (*super().authenticate_credentials(key), None)
+                local.set(key, cached)
+        else:
+            # Read the generation before the token: a revocation racing with
+            # the lookup then leaves an entry that is already outdated.
+            generation = shared.get(_generation_key(key))
+            if cached is None or cached[2] != generation:
+                cached = shared.get(_shared_key(key))
+                if cached is None or cached[2] != generation:
+                    cached = (*super().authenticate_credentials(key), generation)
+                    shared.set(_shared_key(key), cached, timeout=get_config()['SHARED_TTL'])
+                local.set(key, cached)
+
+        # Hand out copies so per-request state set on the user never leaks
+        # into the shared entry.
+        user, token, _generation = cached
+        return copy.copy(user), token
+
+    async def aauthenticate_credentials(self, key):
+        """
+        Async variant for async views: local hits never leave the event loop
+        (beyond the generation check against the shared tier), misses go
+        through ``authenticate_credentials`` in a worker thread.
+        """
+        cached = get_local_cache().get(key)
+        if cached is not None:
+            shared = _shared_cache()
+            if shared is None or await shared.aget(_generation_key(key)) == cached[2]:
+                user, token, _generation = cached
+                return copy.copy(user), token
+        return await sync_to_async(self.authenticate_credentials)(key)
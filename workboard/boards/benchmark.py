@@ -0,0 +1,399 @@
+# boards/benchmark.py
+"""
+Load-testing harness behind ``manage.py benchmark_api``.
+
+``generate_dataset`` bulk-inserts users (with tokens and a shared password),
+boards and tasks. ``build_scenarios`` describes one scripted request per
+endpoint in ``boards/api_urls.py``; any setup a request needs (a board to
+delete, a token to log out) happens while the request is prepared, outside the
+timed section. ``run_workload`` sends the prepared requests through a runner
+and ``summarize`` reduces the samples to latency percentiles, queries per
+request and requests/sec.
+
+Two runners are provided: ``TestClientRunner`` drives the app in-process with
+DRF's test client and counts queries exactly; ``HTTPRunner`` talks to a live
+server (gunicorn/uvicorn) over keep-alive connections from a thread pool and
+reads query counts from the ``Server-Timing`` header of sampled responses.
+"""
+import http.client
+import json
+import math
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import counters
+from .models import Board, Task
+from .ranking import spread
+
+User = get_user_model()
+
+PASSWORD = 'bench-Password-1'
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+BenchRequest = namedtuple('BenchRequest', ['method', 'path', 'body', 'token'])
+Sample = namedtuple('Sample', ['status', 'seconds', 'queries'])
+Scenario = namedtuple('Scenario', ['prepare', 'expected'])
+
+
+class Dataset:
+    def __init__(self, prefix, users, tokens, boards, tasks):
+        self.prefix = prefix
+        self.users = users
+        self.tokens = tokens
+        self.boards = boards
+        self.tasks = tasks
+        self.users_by_id = {user.pk: user for user in users}
+        self.owner_of = {board.pk: board.owner_id for board in boards}
+
+    def token_for_board(self, board_id):
+        return self.tokens[self.owner_of[board_id]]
+
+
+def generate_dataset(users=20, boards=10, tasks_per_board=20, prefix='bench'):
+    """Bulk-insert a dataset whose usernames all start with ``prefix``."""
+    password = make_password(PASSWORD)
+    user_objs = User.objects.bulk_create(
+        User(username=f'{prefix}_user{i}', email=f'{prefix}_user{i}@example.com', password=password)
+        for i in range(users)
+    )
+    tokens = Token.objects.bulk_create(Token(key=Token.generate_key(), user=user) for user in user_objs)
+    board_objs = Board.objects.bulk_create(
+        Board(name=f'{prefix} board {i}', owner=user_objs[i % users]) for i in range(boards)
+    )
+    ranks = spread(tasks_per_board)
+    Task.objects.bulk_create(
+        (
+            Task(
+                board=board,
+                title=f'Task {j}',
+                status=STATUSES[j % len(STATUSES)],
+                assignee=user_objs[(b * 7 + j) % users],
+                created_by=board.owner,
+                rank=ranks[j],
+            )
+            for b, board in enumerate(board_objs)
+            for j in range(tasks_per_board)
+        ),
+        batch_size=5000,
+    )
+    # bulk_create bypasses the signals that maintain the counters.
+    counters.rebuild()
+    task_objs = list(Task.objects.filter(board__in=board_objs).order_by('pk'))
+    return Dataset(prefix, user_objs, {token.user_id: token.key for token in tokens}, board_objs, task_objs)
+
+
+def remove_dataset(prefix='bench'):
+    """Delete every user created under ``prefix``; their boards and tasks cascade."""
+    for user in User.objects.filter(username__startswith=f'{prefix}_'):
+        user.delete()
+
+
+def build_scenarios(ds, run_id):
+    """Scenario name -> ``Scenario(prepare(i) -> BenchRequest, expected status codes)``."""
+
+    def board(i):
+        return ds.boards[i % len(ds.boards)]
+
+    def task(i):
+        return ds.tasks[i % len(ds.tasks)]
+
+    def user(i):
+        return ds.users[i % len(ds.users)]
+
+    def as_user(method, path, body=None):
+        return lambda i: BenchRequest(method, path(i), body(i) if body else None, ds.tokens[user(i).pk])
+
+    def as_board_owner(method, path, body=None):
+        return lambda i: BenchRequest(method, path(i), body(i) if body else None, ds.token_for_board(board(i).pk))
+
+    def as_task_owner(method, path, body=None):
+        return lambda i: BenchRequest(method, path(i), body(i) if body else None, ds.token_for_board(task(i).board_id))
+
+    def login(i):
+        return BenchRequest('POST', '/api/login/', {'username': user(i).username, 'password': PASSWORD}, None)
+
+    def signup(i):
+        name = f'{ds.prefix}_signup_{run_id}_{i}'
+        return BenchRequest(
+            'POST', '/api/signup/', {'username': name, 'email': f'{name}@example.com', 'password': PASSWORD}, None
+        )
+
+    def logout(i):
+        name = f'{ds.prefix}_logout_{run_id}_{i}'
+        spare = User.objects.create_user(username=name, email=f'{name}@example.com')
+        return BenchRequest('POST', '/api/logout/', None, Token.objects.create(user=spare).key)
+
+    def update_task(i):
+        # The task serializer clears the assignee unless it is sent again.
+        current = ds.users_by_id.get(task(i).assignee_id)
+        return {'title': f'Task {i} (edited)', 'assignee_email': current.email if current else ''}
+
+    def delete_board(i):
+        owner = user(i)
+        doomed = Board.objects.create(name=f'{ds.prefix} doomed {i}', owner=owner)
+        return BenchRequest('DELETE', f'/api/boards/{doomed.pk}/', None, ds.tokens[owner.pk])
+
+    def delete_task(i):
+        target = board(i)
+        doomed = Task.objects.create(board=target, title=f'Doomed {i}', created_by_id=target.owner_id)
+        return BenchRequest('DELETE', f'/api/tasks/{doomed.pk}/', None, ds.token_for_board(target.pk))
+
+    def bulk_move(i):
+        target = board(i)
+        moves = [
+            {'op': 'move', 'id': t.pk, 'status': STATUSES[(i + n) % len(STATUSES)]}
+            for n, t in enumerate(t for t in ds.tasks if t.board_id == target.pk)
+        ][:20]
+        return {'operations': moves}
+
+    ok, created, no_content = {200}, {201}, {204}
+    return {
+        'api-root': Scenario(lambda i: BenchRequest('GET', '/api/', None, None), ok),
+        'csrf': Scenario(lambda i: BenchRequest('GET', '/api/csrf/', None, None), ok),
+        'login': Scenario(login, ok),
+        'signup': Scenario(signup, created),
+        'logout': Scenario(logout, ok),
+        'current-user': Scenario(as_user('GET', lambda i: '/api/users/me/'), ok),
+        'user-list': Scenario(as_user('GET', lambda i: '/api/users/'), ok),
+        'user-detail': Scenario(as_user('GET', lambda i: f'/api/users/{user(i).pk}/'), ok),
+        'user-assignments': Scenario(as_user('GET', lambda i: f'/api/users/{user(i).pk}/assignments/'), ok),
+        'user-assigned-boards': Scenario(as_user('GET', lambda i: f'/api/users/{user(i).pk}/assigned-boards/'), ok),
+        'board-list': Scenario(as_user('GET', lambda i: '/api/boards/'), ok),
+        'board-detail': Scenario(as_board_owner('GET', lambda i: f'/api/boards/{board(i).pk}/'), ok),
+        'board-create': Scenario(
+            as_user('POST', lambda i: '/api/boards/', lambda i: {'name': f'{ds.prefix} new {i}', 'description': ''}),
+            created,
+        ),
+        'board-update': Scenario(
+            as_board_owner('PATCH', lambda i: f'/api/boards/{board(i).pk}/', lambda i: {'name': f'{ds.prefix} board {i}'}),
+            ok,
+        ),
+        'board-delete': Scenario(delete_board, no_content),
+        'task-list': Scenario(as_user('GET', lambda i: '/api/tasks/'), ok),
+        'task-detail': Scenario(as_task_owner('GET', lambda i: f'/api/tasks/{task(i).pk}/'), ok),
+        'task-create': Scenario(
+            as_board_owner('POST', lambda i: '/api/tasks/', lambda i: {'board': board(i).pk, 'title': f'New {i}'}),
+            created,
+        ),
+        'task-update': Scenario(as_task_owner('PATCH', lambda i: f'/api/tasks/{task(i).pk}/', update_task), ok),
+        'task-status': Scenario(
+            as_task_owner(
+                'PATCH', lambda i: f'/api/tasks/{task(i).pk}/status/',
+                lambda i: {'status': STATUSES[i % len(STATUSES)]},
+            ),
+            ok,
+        ),
+        'task-delete': Scenario(delete_task, no_content),
+        'task-bulk': Scenario(as_board_owner('POST', lambda i: '/api/tasks/bulk/', bulk_move), ok),
+        'async-current-user': Scenario(as_user('GET', lambda i: '/api/async/users/me/'), ok),
+        'async-user-assignments': Scenario(
+            as_user('GET', lambda i: f'/api/async/users/{user(i).pk}/assignments/'), ok
+        ),
+        'async-user-assigned-boards': Scenario(
+            as_user('GET', lambda i: f'/api/async/users/{user(i).pk}/assigned-boards/'), ok
+        ),
+        'async-board-list': Scenario(as_user('GET', lambda i: '/api/async/boards/'), ok),
+        'async-board-detail': Scenario(as_board_owner('GET', lambda i: f'/api/async/boards/{board(i).pk}/'), ok),
+        'async-task-list': Scenario(as_user('GET', lambda i: '/api/async/tasks/'), ok),
+    }
+
+
+class TestClientRunner:
+    """Sends requests in-process through DRF's test client, counting queries."""
+    name = 'test-client'
+
+    def __init__(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.raise_request_exception = False
+
+    def send(self, request):
+        extra = {'HTTP_AUTHORIZATION': f'Token {request.token}'} if request.token else {}
+        body = json.dumps(request.body) if request.body is not None else ''
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = self.client.generic(
+                request.method, request.path, data=body, content_type='application/json', **extra
+            )
+            elapsed = time.perf_counter() - start
+        return Sample(response.status_code, elapsed, len(ctx.captured_queries))
+
+
+class HTTPRunner:
+    """Sends requests to a live server, one keep-alive connection per thread."""
+    name = 'http'
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.prefix = parts.path.rstrip('/')
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = self._local.connection = self.connection_class(self.host, self.port, timeout=30)
+        return conn
+
+    def send(self, request):
+        headers = {'Content-Type': 'application/json', 'Host': self.host}
+        if request.token:
+            headers['Authorization'] = f'Token {request.token}'
+        body = json.dumps(request.body) if request.body is not None else None
+        conn = self._connection()
+        start = time.perf_counter()
+        try:
+            conn.request(request.method, self.prefix + request.path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.connection = None
+            return Sample(0, time.perf_counter() - start, None)
+        return Sample(response.status, time.perf_counter() - start, _server_timing_queries(response))
+
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def _server_timing_queries(response):
+    # Sampled responses report their query count (boards.instrumentation).
+    match = SERVER_TIMING_QUERIES.search(response.getheader('Server-Timing') or '')
+    return int(match.group(1)) if match else None
+
+
+def _percentile(ordered, percent):
+    # Nearest-rank percentile of an already sorted list.
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples, expected, wall_seconds):
+    latencies = sorted(sample.seconds * 1000 for sample in samples)
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample.status not in expected),
+        'p50_ms': _round(_percentile(latencies, 50)),
+        'p95_ms': _round(_percentile(latencies, 95)),
+        'p99_ms': _round(_percentile(latencies, 99)),
+        'mean_ms': _round(sum(latencies) / len(latencies)) if latencies else None,
+        'queries_per_request': _round(sum(queries) / len(queries)) if queries else None,
+        'rps': _round(len(samples) / wall_seconds) if wall_seconds else None,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def run_workload(runner, scenarios, requests=100, warmup=5, concurrency=1, names=None):
+    """Run each scenario (all of them unless ``names`` is given) and return its summary."""
+    results = {}
+    for name, scenario in scenarios.items():
+        if names and name not in names:
+            continue
+        prepared = [scenario.prepare(i) for i in range(warmup + requests)]
+        for request in prepared[:warmup]:
+            runner.send(request)
+        start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = list(pool.map(runner.send, prepared[warmup:]))
+        else:
+            samples = [runner.send(request) for request in prepared[warmup:]]
+        results[name] = summarize(samples, scenario.expected, time.perf_counter() - start)
+    return results
+
+
+def run_mixed(runner, scenarios, reads, writes, requests=200, concurrency=8, write_every=5):
+    """
+    Interleave one write (round-robin over ``writes``) after every
+    ``write_every - 1`` reads (round-robin over ``reads``) and send them all
+    from ``concurrency`` threads at once. Returns summaries for the reads, the
+    writes and the whole mix.
+    """
+    plan = []
+    for i in range(requests):
+        names = writes if i % write_every == write_every - 1 else reads
+        name = names[i % len(names)]
+        plan.append((name in writes, scenarios[name].expected, scenarios[name].prepare(i)))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(runner.send, [request for _, _, request in plan]))
+    wall = time.perf_counter() - start
+
+    def part(is_write):
+        selected = [(sample, expected) for (write, expected, _), sample in zip(plan, samples) if write == is_write]
+        summary = summarize([sample for sample, _ in selected], set(), wall)
+        summary['errors'] = sum(1 for sample, expected in selected if sample.status not in expected)
+        return summary
+
+    total = summarize(samples, set(), wall)
+    total['errors'] = sum(1 for (_, expected, _), sample in zip(plan, samples) if sample.status not in expected)
+    return {'reads': part(False), 'writes': part(True), 'total': total}
+
+
+def start_server(base_dir, workers=2, timeout=30, env=None):
+    """
+    Start gunicorn with uvicorn workers on a free local port; returns
+    ``(process, url)``. ``env`` adds to the server's environment variables.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    url = f'http://127.0.0.1:{port}'
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', 'workboard.asgi',
+            '-k', 'uvicorn.workers.UvicornWorker', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+        ],
+        cwd=base_dir,
+        env={**os.environ, **env} if env else None,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup; is it installed?')
+        try:
+            urllib.request.urlopen(f'{url}/api/', timeout=1).read()
+            return server, url
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'gunicorn did not start within {timeout} seconds')
+
+
+def compare(previous, current):
+    """Rows of ``(scenario, metric, before, after, change %)`` between two result files."""
+    rows = []
+    for name, stats in current['scenarios'].items():
+        before = previous.get('scenarios', {}).get(name)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request', 'rps'):
+            old, new = before.get(metric), stats.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            rows.append((name, metric, old, new, round(change, 1)))
+    return rows
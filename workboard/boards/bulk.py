@@ -0,0 +1,249 @@
+# boards/bulk.py
+"""
+Batch task operations behind ``POST /api/tasks/bulk/``.
+
+A request carries a list of operations::
+
+    {"operations": [
+        {"op": "create", "board": 1, "title": "Write docs", "status": "To-Do", "assignee_email": "a@b.com"},
+        {"op": "move", "id": 10, "status": "Completed"},
+        {"op": "reassign", "id": 11, "assignee_email": "c@d.com"},
+        {"op": "delete", "id": 12}
+    ]}
+
+Permissions for the whole set are checked with one query per kind of object
+(tasks, boards, assignees), and every valid operation is applied inside a
+single transaction with ``bulk_create``/``bulk_update`` and one ``DELETE``.
+Invalid operations are reported per item and do not block the rest.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from . import changelog, counters
+from .models import Board, Task
+from .ranking import between
+from .query_planner import plan_queryset
+from .realtime import publish_task_event, TASK_CREATED, TASK_UPDATED, TASK_STATUS_CHANGED, TASK_DELETED
+from .serializers import TaskSerializer
+
+User = get_user_model()
+
+MAX_OPERATIONS = 500
+VALID_STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+OPERATIONS = ('create', 'move', 'reassign', 'delete')
+# Largest id a database integer column holds.
+MAX_ID = 2 ** 63 - 1
+ASCII_DIGITS = re.compile(r'[0-9]+')
+
+
+class BulkOperationError(Exception):
+    pass
+
+
+def _id(value):
+    """``value`` as an object id (an int, or a string of ASCII digits, in range), or None."""
+    if isinstance(value, str) and ASCII_DIGITS.fullmatch(value):
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value if 0 < value <= MAX_ID else None
+
+
+def _resolve_assignees(operations):
+    emails = {
+        op['assignee_email'].strip().lower()
+        for op in operations
+        if op.get('op') in ('create', 'reassign') and isinstance(op.get('assignee_email'), str)
+        and op['assignee_email'].strip()
+    }
+    if not emails:
+        return {}
+    users = User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=emails)
+    return {user.email_lower: user for user in users}
+
+
+def _assignee_for(op, assignees):
+    email = op.get('assignee_email') or ''
+    if not isinstance(email, str):
+        raise BulkOperationError('assignee_email must be an email address or null.')
+    email = email.strip()
+    if not email:
+        return None
+    try:
+        return assignees[email.lower()]
+    except KeyError:
+        raise BulkOperationError('User with this email does not exist.')
+
+
+def _task_id(op):
+    task_id = _id(op.get('id'))
+    if task_id is None:
+        raise BulkOperationError('A valid task id is required.')
+    return task_id
+
+
+def apply_operations(user, operations):
+    """Validate and apply ``operations`` for ``user``; returns one result per operation."""
+    if not isinstance(operations, list) or not operations:
+        raise BulkOperationError('Provide a non-empty list of operations.')
+    if len(operations) > MAX_OPERATIONS:
+        raise BulkOperationError(f'At most {MAX_OPERATIONS} operations are allowed per request.')
+
+    operations = [op if isinstance(op, dict) else {} for op in operations]
+    task_ids = {_id(op.get('id')) for op in operations if op.get('op') in ('move', 'reassign', 'delete')}
+    board_ids = {_id(op.get('board')) for op in operations if op.get('op') == 'create'}
+
+    with transaction.atomic(), counters.suspended():
+        # One query each for the tasks, the boards and the assignees involved.
+        # The tasks are locked (in id order, so two batches cannot deadlock) until
+        # the batch commits: their before states stay what the writes replace.
+        tasks = {
+            task.pk: task
+            for task in Task.objects.select_for_update(of=('self',)).filter(pk__in=task_ids - {None})
+            .select_related('board').order_by('pk')
+        }
+        owned_boards = set(
+            Board.objects.filter(pk__in=board_ids - {None}, owner=user).values_list('pk', flat=True)
+        )
+        assignees = _resolve_assignees(operations)
+
+        results = [None] * len(operations)
+        to_create = []
+        to_update = {}
+        # task id -> the fields its operations changed.
+        changed_fields = {}
+        to_delete = {}
+        changes = []
+        # task id -> (state before the batch, state after it) for the change feed.
+        logged = {}
+        now = timezone.now()
+
+        for index, op in enumerate(operations):
+            kind = op.get('op')
+            try:
+                if kind not in OPERATIONS:
+                    raise BulkOperationError(f"Unknown operation. Use one of: {', '.join(OPERATIONS)}.")
+
+                if kind == 'create':
+                    board_id = _id(op.get('board'))
+                    if board_id not in owned_boards:
+                        raise BulkOperationError("You don't have permission to add tasks to this board.")
+                    title = op.get('title')
+                    title = title.strip() if isinstance(title, str) else ''
+                    if not title or len(title) > 255:
+                        raise BulkOperationError('A title of at most 255 characters is required.')
+                    if not isinstance(op.get('description') or '', str):
+                        raise BulkOperationError('description must be a string.')
+                    task_status = op.get('status', 'To-Do')
+                    if task_status not in VALID_STATUSES:
+                        raise BulkOperationError('Invalid status')
+                    task = Task(
+                        board_id=board_id, title=title, description=op.get('description') or '',
+                        status=task_status, assignee=_assignee_for(op, assignees), created_by=user,
+                    )
+                    to_create.append((index, task))
+                    continue
+
+                task_id = _task_id(op)
+                task = tasks.get(task_id)
+                if task is None or task_id in to_delete:
+                    raise BulkOperationError('Task not found')
+                before = counters.TaskSnapshot(
+                    task.board_id, task.board.owner_id, task.assignee_id, task.created_by_id, task.status
+                )
+
+                if kind == 'delete':
+                    if user.pk not in (task.board.owner_id, task.created_by_id):
+                        raise BulkOperationError("You don't have permission to delete this task")
+                    to_delete[task_id] = task
+                    to_update.pop(task_id, None)
+                    changes.append((before, None))
+                    logged[task_id] = (logged.get(task_id, (before,))[0], None)
+                    results[index] = {'index': index, 'op': kind, 'id': task_id, 'ok': True}
+                    continue
+
+                if user.pk not in (task.board.owner_id, task.assignee_id, task.created_by_id):
+                    raise BulkOperationError("You don't have permission to edit this task.")
+                if kind == 'move':
+                    if op.get('status') not in VALID_STATUSES:
+                        raise BulkOperationError('Invalid status')
+                    task.status = op['status']
+                    field = 'status'
+                else:
+                    task.assignee = _assignee_for(op, assignees)
+                    field = 'assignee'
+                task.updated_at = now
+                to_update[task_id] = task
+                changed_fields.setdefault(task_id, {'updated_at'}).add(field)
+                after = counters.TaskSnapshot(
+                    task.board_id, task.board.owner_id, task.assignee_id, task.created_by_id, task.status
+                )
+                changes.append((before, after))
+                logged[task_id] = (logged.get(task_id, (before,))[0], after)
+                results[index] = {'index': index, 'op': kind, 'id': task_id, 'ok': True, 'event': (
+                    TASK_STATUS_CHANGED if task.status != before.status else TASK_UPDATED
+                )}
+            except BulkOperationError as e:
+                results[index] = {'index': index, 'op': kind, 'ok': False, 'error': str(e)}
+
+        # bulk_create and bulk_update skip Task.save, which would put each new
+        # task, and each task moved to another column, at the bottom of it.
+        moved = [
+            task for task_id, task in to_update.items() if task.status != logged[task_id][0].status
+        ]
+        placed = [task for _, task in to_create] + moved
+        last_ranks = Task.objects.last_ranks(task.board_id for task in placed) if placed else {}
+        for task in placed:
+            column = (task.board_id, task.status)
+            task.rank = last_ranks[column] = between(last_ranks.get(column), None)
+        for task in moved:
+            changed_fields[task.pk].add('rank')
+        created = Task.objects.bulk_create([task for _, task in to_create])
+        # Only the columns each task's operations changed, so a move does not
+        # write back the assignee (or a reassignment the status) it read.
+        by_fields = {}
+        for task_id, task in to_update.items():
+            by_fields.setdefault(frozenset(changed_fields[task_id]), []).append(task)
+        for fields, group in by_fields.items():
+            Task.objects.bulk_update(group, sorted(fields))
+        for task in to_delete.values():
+            publish_task_event(TASK_DELETED, task)
+        if to_delete:
+            Task.objects.filter(pk__in=list(to_delete)).delete()
+
+        log_entries = [
+            (task_id, 'deleted' if after is None else 'updated', before, after)
+            for task_id, (before, after) in logged.items()
+        ]
+        for (index, _), task in zip(to_create, created):
+            after = counters.TaskSnapshot(task.board_id, user.pk, task.assignee_id, task.created_by_id, task.status)
+            changes.append((None, after))
+            log_entries.append((task.pk, 'created', None, after))
+            results[index] = {'index': index, 'op': 'create', 'id': task.pk, 'ok': True, 'event': TASK_CREATED}
+        counters.record_changes(changes)
+        changelog.record_tasks(log_entries)
+        Board.objects.touch(
+            [task.board_id for task in created] + [task.board_id for task in to_update.values()]
+            + [task.board_id for task in to_delete.values()]
+        )
+
+        # Re-read everything that still exists in one planned query to render
+        # the results and the realtime events.
+        rendered_ids = [task.pk for task in created] + list(to_update)
+        rendered_tasks = list(plan_queryset(Task.objects.filter(pk__in=rendered_ids), TaskSerializer()))
+        rendered = {
+            task.pk: (task, data)
+            for task, data in zip(rendered_tasks, TaskSerializer(rendered_tasks, many=True).data)
+        }
+        for result in results:
+            event = result.pop('event', None)
+            if result['ok'] and result['id'] in rendered:
+                task, data = rendered[result['id']]
+                result['task'] = data
+                publish_task_event(event, task, data=data)
+
+    return results
@@ -0,0 +1,201 @@
+# boards/changelog.py
+"""
+Per-user change feed behind ``GET /api/changes/?since=<cursor>``.
+
+Every create/update/delete of a board or task writes one ``Change`` row per
+user who can see the object, in the same transaction as the change: the task's
+board owner, assignee and creator (before and after the change, so someone
+who is unassigned hears about it too), or a board's owner and the assignees of
+its tasks. A task change that makes a board appear in or disappear from an
+assignee's board list (their first task on it assigned, their last one
+unassigned, moved or deleted) also records the board as ``created`` or
+``deleted`` for them. Reading a feed is then a range scan of ``(user, id)``
+from the client's cursor, whatever the size of the tables.
+
+The feed is compacted per object and carries the object's current state, so
+applying it is idempotent: ``created``/``updated`` entries upsert the
+rendered ``object``, ``deleted`` entries (also given when the object is no
+longer visible to the caller) remove it. Board payloads leave out the tasks,
+which arrive as entries of their own; when a board is deleted its tasks go
+with it.
+
+Model signals record every ``save()``/``delete()``; code paths that bypass
+them (``boards.bulk``, ``boards.task_status``) call ``record_tasks``. Rank
+rebalancing is not recorded since it keeps the order of every column.
+
+Cursors are ids, so a client reading past an id that is not committed yet
+would never see that entry. SQLite serializes writers, so ids follow commit
+order there. PostgreSQL hands out sequence values before commit, so there a
+writer first makes sure it has a transaction id, then draws its ids, then
+stores with its rows the ``xmax`` of a snapshot taken after that
+(``Change.horizon``): every transaction that drew a lower id had an xid below
+it. Readers only serve entries up to the last one whose horizon is at or
+below the ``xmin`` of their own snapshot, i.e. whose lower ids all belong to
+finished transactions; later entries wait for the next poll. Other databases
+are not supported by the feed.
+
+``manage.py prune_change_log`` drops old entries and records the last id it
+dropped (``ChangeLogPrune``); clients with a cursor below it (``since=0``
+included, once anything has been pruned) get ``410 Gone`` and reload. Ids
+missing for other reasons (rolled-back transactions, deleted users) do not
+expire anything.
+"""
+from collections import Counter
+
+from django.db import connections, router
+from django.db.models import BooleanField, Count, ExpressionWrapper, Max, Q, Value
+from django.db.models.expressions import RawSQL
+
+from . import counters
+from .models import Change, ChangeLogPrune, Task
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+class CursorExpired(Exception):
+    pass
+
+
+# Users being deleted in this process. Their feeds go with them, and rows
+# written for them during the cascade would point at a deleted user.
+_deleting_users = set()
+
+
+def _recipients(users):
+    return sorted(users - _deleting_users)
+
+
+def _insert(rows):
+    rows = list(rows)
+    if not rows:
+        return
+    using = router.db_for_write(Change)
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # Assigns this transaction its xid (if it has none yet) before any id is drawn.
+            cursor.execute('SELECT pg_current_xact_id()')
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [Change._meta.db_table, len(rows)],
+            )
+            ids = sorted(row[0] for row in cursor.fetchall())
+            # A new statement, so a snapshot taken after the ids were drawn.
+            cursor.execute('SELECT pg_snapshot_xmax(pg_current_snapshot())::text::bigint')
+            (horizon,) = cursor.fetchone()
+        for row, pk in zip(rows, ids):
+            row.id, row.horizon = pk, horizon
+    Change.objects.using(using).bulk_create(rows)
+
+
+def _board_visibility_changes(entries):
+    """
+    ``(user_id, board_id, action)`` for the assignees who started (``created``)
+    or stopped (``deleted``) seeing a board through these task changes, which
+    have already been written.
+    """
+    deltas = Counter()
+    for _, _, before, after in entries:
+        for state, delta in ((before, -1), (after, 1)):
+            # Owners see their boards whatever the assignments.
+            if state is not None and state.assignee_id is not None and state.assignee_id != state.owner_id:
+                deltas[(state.assignee_id, state.board_id)] += delta
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return []
+    rows = (
+        Task.objects.filter(
+            assignee_id__in={user_id for user_id, _ in deltas}, board_id__in={board_id for _, board_id in deltas}
+        )
+        .order_by().values_list('assignee_id', 'board_id').annotate(total=Count('id'))
+    )
+    assigned = {(user_id, board_id): total for user_id, board_id, total in rows}
+    changes = []
+    for (user_id, board_id), delta in sorted(deltas.items()):
+        now = assigned.get((user_id, board_id), 0)
+        if now and now == delta:
+            changes.append((user_id, board_id, 'created'))
+        elif not now:
+            changes.append((user_id, board_id, 'deleted'))
+    return changes
+
+
+def record_tasks(entries):
+    """Record ``(task_id, action, before, after)`` task changes; ``before``/``after`` are ``TaskSnapshot``s or None."""
+    boards = [
+        Change(user_id=user_id, kind='board', object_id=board_id, board_id=board_id, action=action)
+        for user_id, board_id, action in _board_visibility_changes(entries)
+        if user_id not in _deleting_users
+    ]
+    # A board a user starts seeing comes before its tasks, one they stop seeing after them.
+    rows = [row for row in boards if row.action == 'created']
+    for task_id, action, before, after in entries:
+        current = after or before
+        users = (counters.audience(before) if before else set()) | (counters.audience(after) if after else set())
+        rows.extend(
+            Change(user_id=user_id, kind='task', object_id=task_id, board_id=current.board_id, action=action)
+            for user_id in _recipients(users)
+        )
+    rows.extend(row for row in boards if row.action == 'deleted')
+    _insert(rows)
+
+
+def board_audience(board):
+    """Ids of the users ``board`` is visible to: its owner and the assignees of its tasks."""
+    assignees = (
+        Task.objects.filter(board_id=board.pk, assignee__isnull=False)
+        .order_by().values_list('assignee_id', flat=True).distinct()
+    )
+    return {board.owner_id, *assignees}
+
+
+def record_board(board, action, users=None):
+    users = board_audience(board) if users is None else users
+    _insert(
+        Change(user_id=user_id, kind='board', object_id=board.pk, board_id=board.pk, action=action)
+        for user_id in _recipients(users)
+    )
+
+
+def pruned_through():
+    return ChangeLogPrune.objects.values_list('pruned_through', flat=True).first() or 0
+
+
+def latest_cursor(user):
+    cursor = Change.objects.filter(user=user).aggregate(cursor=Max('id'))['cursor'] or 0
+    # A user whose entries were all pruned starts past the pruned range.
+    return max(cursor, pruned_through())
+
+
+def read(user, since, limit=DEFAULT_LIMIT):
+    """
+    Up to ``limit`` feed entries of ``user`` after cursor ``since``, compacted
+    to the last entry per object. Returns ``(entries, cursor, has_more)``,
+    where each entry is ``(cursor, kind, object_id, board_id, action)``.
+    """
+    # since=0 (from the start) is expired too once the first entries were pruned.
+    if since < pruned_through():
+        raise CursorExpired()
+    rows = Change.objects.filter(user=user, id__gt=since).order_by('id')
+    if connections[rows.db].vendor == 'postgresql':
+        # Evaluated in the statement's own snapshot, together with the rows.
+        xmin = RawSQL('pg_snapshot_xmin(pg_current_snapshot())::text::bigint', [])
+        final = ExpressionWrapper(Q(horizon__isnull=True) | Q(horizon__lte=xmin), output_field=BooleanField())
+    else:
+        final = Value(True)
+    rows = list(rows.annotate(final=final).values_list('id', 'kind', 'object_id', 'board_id', 'action', 'final')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # Entries after the last final one may have uncommitted ids below them;
+    # they are served by a later poll.
+    if rows and not rows[-1][5]:
+        while rows and not rows[-1][5]:
+            rows.pop()
+        has_more = False
+    rows = [row[:5] for row in rows]
+    latest = {}
+    for row in rows:
+        latest.pop((row[1], row[2]), None)
+        latest[(row[1], row[2])] = row
+    return list(latest.values()), (rows[-1][0] if rows else since), has_more
@@ -0,0 +1,176 @@
+# boards/conditional.py
+"""
+ETag / Last-Modified support for the board and task viewsets.
+
+Validators are computed with one small query against the same visibility-
+filtered queryset the view serves, before anything is loaded or serialized:
+
+* a single object is identified by its ``updated_at`` (and, for boards, the
+  ``version`` that ``Board.objects.touch`` bumps whenever one of the board's
+  tasks, or a user they reference, changes);
+* a list is identified by ``COUNT``/``MAX(updated_at)``/``SUM(version)`` over
+  the filtered queryset, so additions, edits and deletions all change it.
+  Lists get no ``Last-Modified``: deleting a row does not move
+  ``MAX(updated_at)``, so ``If-Modified-Since`` would answer 304 for a list
+  that lost rows.
+
+The request's query string (``fields``, ``expand``, ``cursor``...) is part of
+every tag since it changes the representation. ``If-None-Match`` and
+``If-Modified-Since`` (single objects) on ``GET``/``HEAD`` answer ``304 Not Modified``;
+``If-Match`` on ``PUT``/``PATCH``/``DELETE`` answers ``412 Precondition
+Failed`` when the object changed since the client read it. Such a request
+runs in one transaction that locks the row (``SELECT ... FOR UPDATE``) for
+the comparison, so two writers holding the same tag cannot both pass it.
+
+The same validators key the payload cache in ``boards.response_cache``.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import router, transaction
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from . import response_cache
+
+UNSAFE_METHODS = ('PUT', 'PATCH', 'DELETE')
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has been modified since it was last fetched.'
+    default_code = 'precondition_failed'
+
+
+def _make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+class ConditionalRequestMixin:
+    """
+    Adds validators to ``retrieve``/``list`` responses, serves their payloads
+    from the response cache and honours conditional request headers.
+
+    ``etag_fields`` are the model fields an object's tag is built from, starting
+    with ``updated_at``. ``cache_fields`` also change the rendered payload but
+    should not fail ``If-Match`` (e.g. ``board__version``, which moves when a
+    sibling task or a nested user changes); they only key the payload cache.
+    Lists use all of them.
+    """
+    etag_fields = ('updated_at',)
+    cache_fields = ()
+
+    def _representation_key(self, request):
+        # If-Match checks compare against the plain representation.
+        return '' if request.method in UNSAFE_METHODS else request.META.get('QUERY_STRING', '')
+
+    def get_object_validators(self, request, lock=False):
+        """
+        ``(etag, last_modified, cache_key_parts)`` for the requested object, or
+        ``None``s. With ``lock`` its row stays locked until the transaction ends.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset()
+        if lock:
+            queryset = queryset.select_for_update(of=('self',))
+        try:
+            values = (
+                queryset
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list('pk', *self.etag_fields, *self.cache_fields)
+                .first()
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            # Malformed lookups 404 in get_object as usual.
+            values = None
+        if values is None:
+            return None, None, None
+        own = values[:1 + len(self.etag_fields)]
+        etag = _make_etag(*own, self._representation_key(request))
+        return etag, values[1], (etag, values[len(own):])
+
+    def get_list_validators(self, request):
+        aggregates = {'count': Count('pk'), 'updated_at': Max('updated_at')}
+        for field in (*self.etag_fields[1:], *self.cache_fields):
+            aggregates[field] = Sum(field)
+        values = self.filter_queryset(self.get_queryset()).order_by().aggregate(**aggregates)
+        etag = _make_etag(request.user.pk, sorted(values.items()), self._representation_key(request))
+        # The ETag only: see the module docstring.
+        return etag, None, (etag,)
+
+    def _conditional_response(self, request, etag, last_modified):
+        return get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def _set_validators(self, response, etag, last_modified):
+        if etag is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def _cached_response(self, request, kind, key_parts, render):
+        rendered = {}
+
+        def build():
+            rendered['response'] = response = render()
+            # Streamed lists (boards.renderers) are too long to cache.
+            if response.status_code != status.HTTP_200_OK or response.streaming:
+                return None
+            return response.data
+
+        # Paginated payloads embed absolute next/previous links.
+        data, hit = response_cache.get_or_build(f'{self.basename}-{kind}', (*key_parts, request.get_host()), build)
+        response = rendered.get('response') or Response(data)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in UNSAFE_METHODS and request.META.get('HTTP_IF_MATCH'):
+            # The check in initial() and the write share this transaction.
+            with transaction.atomic(using=router.db_for_write(self.queryset.model)):
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in UNSAFE_METHODS and request.META.get('HTTP_IF_MATCH'):
+            etag, last_modified, _ = self.get_object_validators(request, lock=True)
+            if etag is not None and self._conditional_response(request, etag, last_modified) is not None:
+                raise PreconditionFailed()
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified, key_parts = self.get_object_validators(request)
+        if etag is not None:
+            not_modified = self._conditional_response(request, etag, last_modified)
+            if not_modified is not None:
+                return self._set_validators(not_modified, etag, last_modified)
+            response = self._cached_response(
+                request, 'detail', key_parts, lambda: super(ConditionalRequestMixin, self).retrieve(request, *args, **kwargs)
+            )
+            return self._set_validators(response, etag, last_modified)
+        return super().retrieve(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified, key_parts = self.get_list_validators(request)
+        not_modified = self._conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return self._set_validators(not_modified, etag, last_modified)
+        response = self._cached_response(
+            request, 'list', key_parts, lambda: super(ConditionalRequestMixin, self).list(request, *args, **kwargs)
+        )
+        return self._set_validators(response, etag, last_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Hand the new validators back after a successful write so the client
+        # can chain If-Match requests without refetching.
+        if request.method in ('PUT', 'PATCH') and response.status_code == status.HTTP_200_OK and 'pk' in self.kwargs:
+            etag, last_modified, _ = self.get_object_validators(request)
+            self._set_validators(response, etag, last_modified)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,174 @@
+# boards/counters.py
+"""
+Denormalized task counters.
+
+``BoardTaskCount`` holds the number of tasks per status on each board and
+``UserTaskCount`` the number of tasks per status visible to each user (the
+same set as ``Task.objects.visible_to``). Model signals keep them current for
+every ``save()``/``delete()``; code paths that bypass signals (queryset
+``update()``, ``bulk_create``/``bulk_update``) report their changes with
+``record_changes``. ``manage.py rebuild_task_counters`` recomputes both tables
+from scratch.
+"""
+import threading
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import Board, BoardTaskCount, Task, UserTaskCount
+
+TaskSnapshot = namedtuple('TaskSnapshot', ['board_id', 'owner_id', 'assignee_id', 'created_by_id', 'status'])
+
+SNAPSHOT_FIELDS = ('board_id', 'assignee_id', 'created_by_id', 'status')
+
+_local = threading.local()
+
+
+@contextmanager
+def suspended():
+    """
+    Turn off the signal-driven task bookkeeping (counters, board versions) in
+    this thread, for batch code paths that report all of their changes at once
+    with ``record_changes`` and ``Board.objects.touch``.
+    """
+    previous = is_suspended()
+    _local.suspended = True
+    try:
+        yield
+    finally:
+        _local.suspended = previous
+
+
+def is_suspended():
+    return getattr(_local, 'suspended', False)
+
+
+def audience(snapshot):
+    """Ids of the users a task counts towards."""
+    return {
+        user_id for user_id in (snapshot.owner_id, snapshot.assignee_id, snapshot.created_by_id)
+        if user_id is not None
+    }
+
+
+def _board_owner_id(task, board_id):
+    if Task.board.is_cached(task) and task.board.pk == board_id:
+        return task.board.owner_id
+    return Board.objects.filter(pk=board_id).values_list('owner_id', flat=True).first()
+
+
+def snapshot(task):
+    """The counter-relevant state of ``task`` as it is in memory."""
+    return TaskSnapshot(
+        task.board_id, _board_owner_id(task, task.board_id), task.assignee_id, task.created_by_id, task.status
+    )
+
+
+def stored_snapshot(task):
+    """
+    The counter-relevant state of ``task`` as it is stored, or None when its
+    row is gone. The row stays locked until the caller's transaction ends, so
+    a concurrent save of the same task waits and then diffs against this
+    one's result rather than against what its own instance loaded.
+    """
+    values = Task.objects.select_for_update().filter(pk=task.pk).values_list(*SNAPSHOT_FIELDS).first()
+    if values is None:
+        return None
+    board_id, assignee_id, created_by_id, status = values
+    return TaskSnapshot(board_id, _board_owner_id(task, board_id), assignee_id, created_by_id, status)
+
+
+def load_snapshots(task_ids):
+    """Snapshots for many tasks in one query, keyed by task id."""
+    rows = Task.objects.filter(pk__in=task_ids).values_list('pk', 'board_id', 'board__owner_id', *SNAPSHOT_FIELDS[1:])
+    return {row[0]: TaskSnapshot(*row[1:]) for row in rows}
+
+
+def record_changes(changes):
+    """
+    Apply ``(before, after)`` snapshot pairs to the counters; ``before`` is
+    ``None`` for created tasks and ``after`` is ``None`` for deleted ones.
+    """
+    board_deltas = Counter()
+    user_deltas = Counter()
+    for before, after in changes:
+        for state, delta in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            board_deltas[(state.board_id, state.status)] += delta
+            for user_id in audience(state):
+                user_deltas[(user_id, state.status)] += delta
+
+    with transaction.atomic():
+        _apply(BoardTaskCount, 'board_id', board_deltas)
+        _apply(UserTaskCount, 'user_id', user_deltas)
+
+
+def record_change(before, after):
+    if before != after:
+        record_changes([(before, after)])
+
+
+def _apply(model, key_field, deltas):
+    # Sorted so concurrent writers lock counter rows in the same order.
+    for (key, status), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        lookup = {key_field: key, 'status': status}
+        if model.objects.filter(**lookup).update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Someone else created the row first.
+            model.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def forget_board(board):
+    """
+    Remove the tasks of a board that is about to be deleted from the user
+    counters with one grouped query (its BoardTaskCount rows cascade).
+    """
+    user_deltas = Counter()
+    rows = (
+        Task.objects.filter(board=board)
+        .order_by()
+        .values_list('assignee_id', 'created_by_id', 'status')
+        .annotate(total=Count('id'))
+    )
+    for assignee_id, created_by_id, status, total in rows:
+        state = TaskSnapshot(board.pk, board.owner_id, assignee_id, created_by_id, status)
+        for user_id in audience(state):
+            user_deltas[(user_id, status)] -= total
+    with transaction.atomic():
+        _apply(UserTaskCount, 'user_id', user_deltas)
+
+
+def rebuild():
+    """Recompute every counter from the task table."""
+    with transaction.atomic():
+        user_totals = Counter()
+        rows = (
+            Task.objects.order_by()
+            .values_list('board__owner_id', 'assignee_id', 'created_by_id', 'status')
+            .annotate(total=Count('id'))
+        )
+        for owner_id, assignee_id, created_by_id, status, total in rows:
+            for user_id in audience(TaskSnapshot(None, owner_id, assignee_id, created_by_id, status)):
+                user_totals[(user_id, status)] += total
+        board_rows = list(Task.objects.order_by().values_list('board_id', 'status').annotate(total=Count('id')))
+
+        BoardTaskCount.objects.all().delete()
+        UserTaskCount.objects.all().delete()
+        BoardTaskCount.objects.bulk_create(
+            (BoardTaskCount(board_id=board_id, status=status, count=total) for board_id, status, total in board_rows),
+            batch_size=1000,
+        )
+        UserTaskCount.objects.bulk_create(
+            (UserTaskCount(user_id=user_id, status=status, count=total)
+             for (user_id, status), total in user_totals.items()),
+            batch_size=1000,
+        )
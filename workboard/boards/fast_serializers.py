@@ -0,0 +1,220 @@
+# boards/fast_serializers.py
+"""
+Read-only fast paths for ``TaskSerializer``, ``BoardSerializer`` and
+``UserSerializer`` on the list endpoints.
+
+Rendering a task through DRF runs a field object per attribute, two nested
+``UserSerializer`` instances and two ``DateTimeField`` conversions, which is
+most of the CPU time of a long list. The serializers here read
+``.values_list()`` tuples (joined user columns included) instead of model
+instances and build the same dicts directly: same keys in the same order, same
+values, so the rendered bytes match DRF's (``FastSerializerParityTests``).
+Each user is rendered once per request and shared by the rows that reference
+it.
+
+``for_serializer()`` returns the fast path for a DRF serializer class, or
+None when it has none, ``ENABLED`` is off or ``DATETIME_FORMAT`` is not ISO
+8601; callers fall back to DRF then. ``?fields=``/``?expand=`` trim the
+top-level representation as ``SparseFieldsetMixin`` does.
+
+A field added to one of the DRF serializers has to be added here as well; the
+parity tests fail until it is.
+
+Configured with ``settings.FAST_SERIALIZERS``.
+"""
+import datetime
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.fields import ISO_8601
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+
+from .models import BoardTaskCount, Task
+from .serializers import BoardSerializer, SparseFieldsetMixin, TaskSerializer, UserSerializer, _split_param
+
+DEFAULTS = {
+    'ENABLED': True,
+}
+
+USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name')
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'FAST_SERIALIZERS', {})}
+
+
+def datetime_formatter():
+    """``DateTimeField.to_representation`` with the ISO 8601 format, for the current time zone."""
+    field_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def format_datetime(value):
+        if not value:
+            return None
+        if field_timezone is not None:
+            if timezone.is_aware(value):
+                value = value.astimezone(field_timezone)
+            else:
+                value = timezone.make_aware(value, field_timezone)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return format_datetime
+
+
+class FastSerializer:
+    """Renders ``columns`` tuples of ``serializer_class``'s model as ``serializer_class`` would."""
+    serializer_class = None
+    columns = ()
+
+    def __init__(self, context=None, users=None):
+        self.context = context or {}
+        self.format_datetime = datetime_formatter()
+        # User id -> representation, shared with nested fast serializers.
+        self.users = {} if users is None else users
+        self.keep = self._sparse_fields()
+
+    def _sparse_fields(self):
+        request = self.context.get('request')
+        if not issubclass(self.serializer_class, SparseFieldsetMixin) or request is None:
+            return None
+        if request.method not in SAFE_METHODS:
+            return None
+        requested = _split_param(request.query_params.get('fields'))
+        if not requested:
+            return None
+        return set(requested) | set(_split_param(request.query_params.get('expand')))
+
+    def wants(self, name):
+        return self.keep is None or name in self.keep
+
+    def user(self, pk, *values):
+        if pk is None:
+            return None
+        user = self.users.get(pk)
+        if user is None:
+            user = self.users[pk] = dict(zip(USER_FIELDS, (pk, *values)))
+        return user
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    def render(self, row, *args):
+        representation = self.to_representation(row, *args)
+        if self.keep is None:
+            return representation
+        return {name: value for name, value in representation.items() if name in self.keep}
+
+    def rows(self, queryset):
+        # values_list() ignores select_related; prefetches do not apply to tuples.
+        return queryset.prefetch_related(None).values_list(*self.columns)
+
+    def iterate(self, queryset, chunk_size=2000):
+        """The representation of every row of ``queryset``, read ``chunk_size`` rows at a time."""
+        for row in self.rows(queryset).iterator(chunk_size=chunk_size):
+            yield self.render(row)
+
+
+def _prefixed(prefix, names):
+    return tuple(f'{prefix}{name}' for name in names)
+
+
+class UserFastSerializer(FastSerializer):
+    serializer_class = UserSerializer
+    columns = USER_FIELDS
+
+    def to_representation(self, row):
+        return self.user(*row)
+
+
+class TaskFastSerializer(FastSerializer):
+    serializer_class = TaskSerializer
+    columns = (
+        'id', 'title', 'description', 'status', 'rank', 'board_id', 'created_at', 'updated_at',
+        *_prefixed('assignee__', USER_FIELDS), *_prefixed('created_by__', USER_FIELDS),
+    )
+
+    def to_representation(self, row):
+        (
+            pk, title, description, status, rank, board_id, created_at, updated_at,
+            assignee_id, assignee_username, assignee_email, assignee_first_name, assignee_last_name,
+            creator_id, creator_username, creator_email, creator_first_name, creator_last_name,
+        ) = row
+        return {
+            'id': pk,
+            'title': title,
+            'description': description,
+            'status': status,
+            'rank': rank,
+            'assignee': self.user(
+                assignee_id, assignee_username, assignee_email, assignee_first_name, assignee_last_name
+            ),
+            'created_by': self.user(
+                creator_id, creator_username, creator_email, creator_first_name, creator_last_name
+            ),
+            'board': board_id,
+            'created_at': self.format_datetime(created_at),
+            'updated_at': self.format_datetime(updated_at),
+        }
+
+
+class BoardFastSerializer(FastSerializer):
+    serializer_class = BoardSerializer
+    columns = ('id', 'name', 'description', 'created_at', 'updated_at', *_prefixed('owner__', USER_FIELDS))
+
+    def to_representation(self, row, tasks=(), counts=None):
+        pk, name, description, created_at, updated_at, *owner = row
+        return {
+            'id': pk,
+            'name': name,
+            'description': description,
+            'tasks': tasks,
+            'task_counts': counts,
+            'owner': self.user(*owner),
+            'created_at': self.format_datetime(created_at),
+            'updated_at': self.format_datetime(updated_at),
+        }
+
+    def iterate(self, queryset, chunk_size=2000):
+        # Tasks and counters are read per chunk of boards, in the order the
+        # serializer's prefetches return them.
+        db = queryset.db
+        tasks = TaskFastSerializer(users=self.users)
+        rows = self.rows(queryset).iterator(chunk_size=chunk_size)
+        while chunk := list(islice(rows, chunk_size)):
+            ids = [row[0] for row in chunk]
+            board_tasks = defaultdict(list)
+            if self.wants('tasks'):
+                for row in tasks.rows(Task.objects.using(db).filter(board_id__in=ids)):
+                    board_tasks[row[5]].append(tasks.render(row))
+            counts = {}
+            if self.wants('task_counts'):
+                counts = {pk: dict.fromkeys(STATUSES, 0) for pk in ids}
+                counters = BoardTaskCount.objects.using(db).filter(board_id__in=ids)
+                for board_id, status, count in counters.values_list('board_id', 'status', 'count'):
+                    counts[board_id][status] = count
+            for row in chunk:
+                yield self.render(row, board_tasks.get(row[0], []), counts.get(row[0]))
+
+
+FAST_SERIALIZERS = {
+    TaskSerializer: TaskFastSerializer,
+    BoardSerializer: BoardFastSerializer,
+    UserSerializer: UserFastSerializer,
+}
+
+
+def for_serializer(serializer_class, context=None):
+    """The fast serializer standing in for ``serializer_class``, or None to use DRF."""
+    fast_class = FAST_SERIALIZERS.get(serializer_class)
+    output_format = api_settings.DATETIME_FORMAT
+    if fast_class is None or not get_config()['ENABLED']:
+        return None
+    if output_format is None or output_format.lower() != ISO_8601:
+        return None
+    return fast_class(context)
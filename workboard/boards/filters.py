@@ -0,0 +1,109 @@
+# boards/filters.py
+import datetime
+import re
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Task
+
+VALID_STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+ASCII_DIGITS = re.compile(r'^[0-9]+$')
+# Largest id a database integer column holds.
+MAX_ID = 2 ** 63 - 1
+
+
+def _ids(name, value, request):
+    """Comma-separated ids; ``me`` stands for the requesting user, ``none`` for NULL."""
+    ids, include_null = [], False
+    for part in value.split(','):
+        part = part.strip().lower()
+        if part == 'me':
+            ids.append(request.user.pk)
+        elif part == 'none':
+            include_null = True
+        elif ASCII_DIGITS.match(part) and int(part) <= MAX_ID:
+            ids.append(int(part))
+        elif part:
+            raise ValidationError({name: f'Expected ids, "me" or "none", got "{part}".'})
+    return ids, include_null
+
+
+def _moment(name, value, end_of_day=False):
+    """An ISO 8601 datetime, or a date meaning its start (or its end with ``end_of_day``)."""
+    error = ValidationError({name: f'Expected an ISO 8601 date or datetime, got "{value}".'})
+    try:
+        # Well-formed but impossible values (2024-02-30, 25:00) raise ValueError.
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        raise error
+    if moment is None:
+        if day is None:
+            raise error
+        moment = datetime.datetime.combine(day, datetime.time.max if end_of_day else datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Server-side filters for ``/api/tasks/``, applied on top of the visibility
+    rules (and therefore also to the list ETag and cached payload):
+
+    * ``status`` – one or more comma-separated statuses;
+    * ``board``, ``assignee``, ``created_by`` – comma-separated ids, where
+      ``me`` is the requesting user and ``none`` (assignee only) unassigned;
+    * ``created_after``/``created_before``, ``updated_after``/``updated_before``
+      – inclusive ISO 8601 bounds; a bare date covers the whole day;
+    * ``updated_since`` – tasks changed strictly after the given moment, for
+      incremental sync: pass the largest ``updated_at`` seen so far.
+
+    Each filter lines up with an index on ``Task``: the board and status
+    filters with ``(board, status, ...)``, the people filters with
+    ``(assignee, created_at)``/``(created_by, created_at)``, and the
+    ``updated_*`` bounds with ``(board, updated_at)`` on the owned-boards
+    branch of the visibility rules.
+    """
+    relation_params = ('board', 'assignee', 'created_by')
+    range_params = {
+        'created_after': ('created_at__gte', False),
+        'created_before': ('created_at__lte', True),
+        'updated_after': ('updated_at__gte', False),
+        'updated_before': ('updated_at__lte', True),
+        'updated_since': ('updated_at__gt', False),
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        statuses = [status.strip() for status in params.get('status', '').split(',') if status.strip()]
+        for status in statuses:
+            if status not in VALID_STATUSES:
+                raise ValidationError({'status': f'Invalid status "{status}". Use one of: {", ".join(VALID_STATUSES)}.'})
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+
+        for name in self.relation_params:
+            if not params.get(name):
+                continue
+            ids, include_null = _ids(name, params[name], request)
+            if include_null and name != 'assignee':
+                raise ValidationError({name: '"none" is only allowed for assignee.'})
+            if include_null and not ids:
+                queryset = queryset.filter(**{f'{name}__isnull': True})
+            elif include_null:
+                queryset = queryset.filter(Q(**{f'{name}__in': ids}) | Q(**{f'{name}__isnull': True}))
+            elif len(ids) == 1:
+                queryset = queryset.filter(**{f'{name}_id': ids[0]})
+            else:
+                queryset = queryset.filter(**{f'{name}__in': ids})
+
+        for name, (lookup, end_of_day) in self.range_params.items():
+            if params.get(name):
+                queryset = queryset.filter(**{lookup: _moment(name, params[name], end_of_day)})
+        return queryset
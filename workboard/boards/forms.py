@@ -1,7 +1,9 @@
 from django import forms
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from .models import Board, Task
 
+User = get_user_model()
+
 class BoardForm(forms.ModelForm):
     class Meta:
         model = Board
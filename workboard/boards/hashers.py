@@ -0,0 +1,18 @@
+# boards/hashers.py
+"""
+Password hashers with the cost taken from settings.
+
+``PBKDF2PasswordHasher`` keeps Django's ``pbkdf2_sha256`` algorithm name, so
+existing hashes verify unchanged; with ``LOGIN['PASSWORD_ITERATIONS']`` set,
+hashes of any other iteration count report ``must_update`` and are re-hashed
+at the configured count on the next login (see ``boards.login``).
+"""
+from django.contrib.auth import hashers
+
+from .login import get_config
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return get_config()['PASSWORD_ITERATIONS'] or hashers.PBKDF2PasswordHasher.iterations
@@ -0,0 +1,293 @@
+# boards/instrumentation.py
+"""
+Per-request timing and SQL instrumentation.
+
+``RequestMetricsMiddleware`` samples a share of requests
+(``REQUEST_METRICS['SAMPLE_RATE']``) and, for those, records:
+
+* ``db``: number of queries and time spent in them, via an
+  ``execute_wrapper`` installed on every database connection;
+* ``serializer``: time spent in ``to_representation`` of serializers that use
+  ``TimedSerializerMixin``;
+* ``view``: time from URL resolution to the rendered response;
+* ``total``: time spent below this middleware.
+
+Each sampled request gets a ``Server-Timing`` header and a JSON log line on the
+``boards.requests`` logger, and is added to a rolling per-endpoint window that
+staff can read at ``/api/metrics/requests/``.
+
+The current request's metrics live in a context variable, so queries that
+async views run through ``sync_to_async`` are attributed to them as well; the
+middleware itself works in both sync and async stacks.
+
+A request is flagged ``repeated_query`` when the same SQL statement ran
+``REPEATED_QUERY_THRESHOLD`` times or more, which is what an N+1 looks like
+from the inside. Endpoints are flagged ``queries_scale_with_results`` when,
+over their window, the query count grows with the number of items returned.
+"""
+import json
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('boards.requests')
+
+DEFAULTS = {
+    'ENABLED': True,
+    # Share of requests that are measured; the rest pass straight through.
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': True,
+    'LOG': True,
+    # Samples kept per endpoint for the aggregate view.
+    'WINDOW': 500,
+    'REPEATED_QUERY_THRESHOLD': 5,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'REQUEST_METRICS', {})}
+
+
+_current = ContextVar('request_metrics', default=None)
+_serializing = ContextVar('request_metrics_serializing', default=False)
+
+
+def current():
+    """The metrics of the request being measured in this context, if any."""
+    return _current.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install(connection):
+    if not getattr(connection, '_request_metrics_installed', False):
+        connection.execute_wrappers.insert(0, _record_query)
+        connection._request_metrics_installed = True
+
+
+@receiver(connection_created)
+def _instrument_new_connection(sender, connection, **kwargs):
+    install(connection)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def repeated_statement(self, threshold):
+        if not self.statements:
+            return None
+        sql, count = self.statements.most_common(1)[0]
+        return (sql, count) if count >= threshold else None
+
+
+class TimedSerializerMixin:
+    """Adds the serializer's top-level ``to_representation`` time to the current request's metrics."""
+
+    def to_representation(self, instance):
+        metrics = current()
+        if metrics is None or _serializing.get():
+            return super().to_representation(instance)
+        token = _serializing.set(True)
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_seconds += time.perf_counter() - start
+            _serializing.reset(token)
+
+
+class EndpointStats:
+    """Rolling per-endpoint window of request samples, shared by the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def add(self, endpoint, sample, window):
+        with self._lock:
+            samples = self._windows.get(endpoint)
+            if samples is None or samples.maxlen != window:
+                samples = self._windows[endpoint] = deque(samples or (), maxlen=window)
+            samples.append(sample)
+
+    def snapshot(self):
+        with self._lock:
+            windows = {endpoint: list(samples) for endpoint, samples in self._windows.items()}
+        return {endpoint: _aggregate(samples) for endpoint, samples in sorted(windows.items())}
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+
+
+endpoint_stats = EndpointStats()
+
+
+def _percentile(ordered, percent):
+    # Nearest-rank percentile of an already sorted list.
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)] if ordered else None
+
+
+def _slope(points):
+    # Least-squares slope of queries over result size.
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def _aggregate(samples):
+    totals = sorted(sample['total_ms'] for sample in samples)
+    sized = [(sample['results'], sample['queries']) for sample in samples if sample['results'] is not None]
+    slope = _slope(sized) if len({x for x, _ in sized}) > 1 else 0.0
+    return {
+        'requests': len(samples),
+        'p50_ms': _percentile(totals, 50),
+        'p95_ms': _percentile(totals, 95),
+        'p99_ms': _percentile(totals, 99),
+        'mean_db_ms': round(sum(s['db_ms'] for s in samples) / len(samples), 3),
+        'mean_serializer_ms': round(sum(s['serializer_ms'] for s in samples) / len(samples), 3),
+        'mean_queries': round(sum(s['queries'] for s in samples) / len(samples), 2),
+        'max_queries': max(s['queries'] for s in samples),
+        'repeated_query_requests': sum(1 for s in samples if s['repeated_query']),
+        'queries_per_result': round(slope, 3),
+        'queries_scale_with_results': slope >= 0.5,
+    }
+
+
+def _result_count(response):
+    data = getattr(response, 'data', None)
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        data = data['results']
+    return len(data) if isinstance(data, list) else None
+
+
+def _endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f'{request.method} {request.path}'
+    return f'{request.method} {match.view_name or match.route}'
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Keep Django from running process_view through sync_to_async.
+            self.process_view = self.aprocess_view
+        # Connections opened before this module was imported.
+        for alias in connections:
+            install(connections[alias])
+
+    def _sampled(self, config):
+        return config['ENABLED'] and random.random() < config['SAMPLE_RATE']
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        config = get_config()
+        if not self._sampled(config):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, config)
+        return response
+
+    async def __acall__(self, request):
+        config = get_config()
+        if not self._sampled(config):
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, config)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = current()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.__class__.process_view(self, request, view_func, view_args, view_kwargs)
+
+    def record(self, request, response, metrics, config):
+        finished = time.perf_counter()
+        total_ms = (finished - metrics.started) * 1000
+        view_ms = (finished - metrics.view_started) * 1000 if metrics.view_started else 0.0
+        db_ms = metrics.db_seconds * 1000
+        serializer_ms = metrics.serializer_seconds * 1000
+        repeated = metrics.repeated_statement(config['REPEATED_QUERY_THRESHOLD'])
+
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={db_ms:.2f};desc="{metrics.queries} queries"',
+                f'serializer;dur={serializer_ms:.2f}',
+                f'view;dur={view_ms:.2f}',
+                f'total;dur={total_ms:.2f}',
+            ])
+
+        endpoint = _endpoint(request)
+        sample = {
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 3),
+            'view_ms': round(view_ms, 3),
+            'db_ms': round(db_ms, 3),
+            'serializer_ms': round(serializer_ms, 3),
+            'queries': metrics.queries,
+            'results': _result_count(response),
+            'repeated_query': {'sql': repeated[0][:200], 'count': repeated[1]} if repeated else None,
+        }
+        endpoint_stats.add(endpoint, sample, config['WINDOW'])
+        if config['LOG']:
+            log = logger.warning if repeated else logger.info
+            log(json.dumps(sample))
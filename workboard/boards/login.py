@@ -0,0 +1,128 @@
+# boards/login.py
+"""
+The login pipeline behind ``POST /api/login/``.
+
+``authenticate()`` followed by ``Token.objects.get_or_create()`` costs three
+queries and a password hash that holds a worker for the whole ~0.5 s of
+PBKDF2. Here a login is one query (the user together with its token) plus a
+hash that runs on a small per-process thread pool:
+
+* ``HASH_WORKERS`` threads hash at a time, so a login storm takes at most that
+  many CPUs per worker process and the event loop keeps serving everything
+  else while hashes run;
+* at most ``MAX_PENDING`` more logins queue for the pool; beyond that a login
+  is refused with a 503 (``LoginBusy``) instead of piling up.
+
+Unknown usernames still pay for one hash, as with ``ModelBackend``, so
+response times do not tell which usernames exist.
+
+Passwords stored with another hasher or another cost than the configured one
+(``PASSWORD_ITERATIONS``, see ``boards.hashers``) are re-hashed at that cost on
+the next successful login. The upgrade writes the ``password`` column only and
+sends no ``post_save``: the password did not change, so cached tokens stay
+valid.
+
+With backends other than ``ModelBackend`` in ``AUTHENTICATION_BACKENDS`` the
+pipeline falls back to ``aauthenticate()``.
+
+Configured with ``settings.LOGIN``.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import aauthenticate, get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password, verify_password
+from django.contrib.auth.signals import user_login_failed
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+DEFAULTS = {
+    # Threads hashing passwords, per process.
+    'HASH_WORKERS': 2,
+    # Logins allowed to wait for a hashing thread, per process.
+    'MAX_PENDING': 32,
+    # PBKDF2 iterations for new and upgraded hashes; None keeps Django's default.
+    'PASSWORD_ITERATIONS': None,
+}
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'LOGIN', {})}
+
+
+class LoginBusy(Exception):
+    """Every hashing thread is busy and the queue is full."""
+
+
+class HashPool:
+    """Runs password hashes on ``workers`` threads, refusing work beyond ``max_pending`` queued calls."""
+
+    def __init__(self, workers, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hash')
+        self.slots = threading.BoundedSemaphore(workers + max_pending)
+
+    async def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            raise LoginBusy
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        # Freed when the hash ends rather than when this coroutine does: a
+        # cancelled login leaves its hash running on the pool.
+        future.add_done_callback(lambda _: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = get_config()
+            _pool = HashPool(config['HASH_WORKERS'], config['MAX_PENDING'])
+        return _pool
+
+
+async def _token_for(user):
+    try:
+        # Loaded with the user by select_related; None there raises without a query.
+        return user.auth_token
+    except Token.DoesNotExist:
+        token, _ = await Token.objects.aget_or_create(user=user)
+        return token
+
+
+async def alogin(request, username, password):
+    """
+    ``(user, token)`` for valid credentials of an active user, else None.
+    Raises ``LoginBusy`` when the hashing pool is saturated.
+    """
+    if list(settings.AUTHENTICATION_BACKENDS) != [MODEL_BACKEND]:
+        user = await aauthenticate(request, username=username, password=password)
+        return (user, await _token_for(user)) if user is not None else None
+
+    pool = get_hash_pool()
+    user = await User._default_manager.select_related('auth_token').filter(
+        **{User.USERNAME_FIELD: username}
+    ).afirst()
+    # verify_password() runs a dummy hash for an unusable password, which
+    # stands in for the missing user's.
+    encoded = user.password if user is not None else UNUSABLE_PASSWORD_PREFIX
+    is_correct, must_update = await pool.run(verify_password, password, encoded)
+    if is_correct and must_update:
+        user.password = await pool.run(make_password, password)
+        await User._default_manager.filter(pk=user.pk).aupdate(password=user.password)
+    if not is_correct or not user.is_active:
+        await user_login_failed.asend(sender=__name__, credentials={'username': username}, request=request)
+        return None
+    return user, await _token_for(user)
@@ -0,0 +1,125 @@
+import json
+import platform
+import time
+import uuid
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from boards import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Run scripted workloads against every API endpoint and report latency percentiles, '
+        'queries per request and requests/sec. Uses the Django test client on a scratch database '
+        'by default; --url targets a running server and --serve starts a local gunicorn/uvicorn.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--tasks-per-board', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=1, help='Client threads (HTTP runs only)')
+        parser.add_argument('--scenarios', help='Comma-separated scenario names (default: all)')
+        parser.add_argument('--url', help='Base URL of a running server sharing this database')
+        parser.add_argument('--serve', action='store_true', help='Start gunicorn with uvicorn workers for the run')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes for --serve')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--compare', help='Print the change against a previous JSON result file')
+        parser.add_argument('--keep-data', action='store_true', help='Keep the generated rows (HTTP runs)')
+
+    def handle(self, *args, **options):
+        self.prefix = None
+        names = [name.strip() for name in (options['scenarios'] or '').split(',') if name.strip()]
+        live = options['url'] or options['serve']
+        if options['url'] and options['serve']:
+            raise CommandError('Use either --url or --serve, not both.')
+
+        if not live:
+            # In-process runs get a throwaway database.
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                results = self.run(benchmark.TestClientRunner(), names, options, concurrency=1)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+        else:
+            # A live server reads the configured database, so the dataset is
+            # written there under a unique prefix and removed afterwards.
+            server = None
+            url = options['url']
+            if options['serve']:
+                try:
+                    server, url = benchmark.start_server(settings.BASE_DIR, options['workers'])
+                except RuntimeError as e:
+                    raise CommandError(str(e))
+            try:
+                results = self.run(benchmark.HTTPRunner(url), names, options, concurrency=options['concurrency'])
+            finally:
+                if server is not None:
+                    server.terminate()
+                    server.wait(timeout=30)
+                if self.prefix and not options['keep_data']:
+                    benchmark.remove_dataset(self.prefix)
+                    self.stdout.write(f'Removed {self.prefix}_* users and their boards')
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved results to {options['output']}"))
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f)
+            for name, metric, old, new, change in benchmark.compare(previous, results):
+                self.stdout.write(f'{name:<22} {metric:<20} {old:>10} -> {new:<10} ({change:+.1f}%)')
+
+    def run(self, runner, names, options, concurrency):
+        run_id = uuid.uuid4().hex[:8]
+        self.prefix = f'bench{run_id}'
+        dataset = benchmark.generate_dataset(
+            options['users'], options['boards'], options['tasks_per_board'], prefix=self.prefix
+        )
+        scenarios = benchmark.build_scenarios(dataset, run_id)
+        unknown = set(names) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        return {
+            'meta': {
+                'runner': runner.name,
+                'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': settings.DATABASES['default']['ENGINE'],
+                'users': options['users'],
+                'boards': options['boards'],
+                'tasks_per_board': options['tasks_per_board'],
+                'requests': options['requests'],
+                'concurrency': concurrency,
+            },
+            'scenarios': benchmark.run_workload(
+                runner, scenarios, requests=options['requests'], warmup=options['warmup'],
+                concurrency=concurrency, names=names,
+            ),
+        }
+
+    def report(self, results):
+        meta = results['meta']
+        self.stdout.write(
+            f"{meta['runner']} runner, {meta['users']} users, {meta['boards']} boards x "
+            f"{meta['tasks_per_board']} tasks, {meta['requests']} requests/scenario, concurrency {meta['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'scenario':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'req/s':>9} {'errors':>7}"
+        )
+        for name, stats in results['scenarios'].items():
+            queries = '-' if stats['queries_per_request'] is None else f"{stats['queries_per_request']:.1f}"
+            line = (
+                f"{name:<22} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                f"{queries:>8} {stats['rps']:>9.1f} {stats['errors']:>7}"
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['errors'] else line)
@@ -0,0 +1,85 @@
+import json
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from boards import benchmark
+
+READS = {
+    'sync': ['board-list', 'board-detail', 'task-list', 'user-assignments', 'current-user'],
+    'async': ['async-board-list', 'async-board-detail', 'async-task-list', 'async-user-assignments',
+              'async-current-user'],
+}
+WRITES = ['task-status', 'task-update']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync /api/ read endpoints with their async /api/async/ versions under a concurrent '
+        'mixed read/write load against a gunicorn/uvicorn server (started here unless --url is given). '
+        'The dataset is written to the configured database and removed afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--tasks-per-board', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=500, help='Requests per variant')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--write-every', type=int, default=5, help='One write per this many requests')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes for the started server')
+        parser.add_argument('--url', help='Base URL of a running ASGI server sharing this database')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        server = None
+        url = options['url']
+        if not url:
+            try:
+                server, url = benchmark.start_server(settings.BASE_DIR, options['workers'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        run_id = uuid.uuid4().hex[:8]
+        prefix = f'bench{run_id}'
+        try:
+            dataset = benchmark.generate_dataset(
+                options['users'], options['boards'], options['tasks_per_board'], prefix=prefix
+            )
+            scenarios = benchmark.build_scenarios(dataset, run_id)
+            runner = benchmark.HTTPRunner(url)
+            results = {}
+            for variant, reads in READS.items():
+                # One warm-up pass so both variants start with loaded workers and warm caches.
+                benchmark.run_mixed(runner, scenarios, reads, WRITES, requests=len(reads) * 2, concurrency=1)
+                results[variant] = benchmark.run_mixed(
+                    runner, scenarios, reads, WRITES, requests=options['requests'],
+                    concurrency=options['concurrency'], write_every=options['write_every'],
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+            benchmark.remove_dataset(prefix)
+
+        self.stdout.write(
+            f"{options['requests']} requests per variant, concurrency {options['concurrency']}, "
+            f"1 write per {options['write_every']} requests"
+        )
+        self.stdout.write(
+            f"{'variant':<8} {'read p50':>9} {'read p95':>9} {'read p99':>9} "
+            f"{'write p50':>10} {'write p95':>10} {'req/s':>8} {'errors':>7}"
+        )
+        for variant, result in results.items():
+            reads, writes, total = result['reads'], result['writes'], result['total']
+            self.stdout.write(
+                f"{variant:<8} {reads['p50_ms']:>9.1f} {reads['p95_ms']:>9.1f} {reads['p99_ms']:>9.1f} "
+                f"{writes['p50_ms']:>10.1f} {writes['p95_ms']:>10.1f} {total['rps']:>8.1f} {total['errors']:>7}"
+            )
+        speedup = results['async']['total']['rps'] / results['sync']['total']['rps']
+        self.stdout.write(self.style.SUCCESS(f'Throughput async/sync: {speedup:.2f}x'))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from boards.authentication import CachedTokenAuthentication, get_local_cache
+
+User = get_user_model()
+
+
+class PingView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'user': request.user.pk})
+
+
+class Command(BaseCommand):
+    help = 'Compare requests/sec of TokenAuthentication and CachedTokenAuthentication on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help='Requests per authentication class')
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            user = User.objects.create_user(username='bench', email='bench@example.com')
+            token = Token.objects.create(user=user)
+            factory = APIRequestFactory()
+            results = {}
+            for auth_class in (TokenAuthentication, CachedTokenAuthentication):
+                get_local_cache().clear()
+                view = PingView.as_view(authentication_classes=[auth_class])
+                results[auth_class.__name__] = self.run(view, factory, token.key, options['requests'])
+
+            for name, rps in results.items():
+                self.stdout.write(f'{name:<28} {rps:>10.0f} req/s')
+            speedup = results['CachedTokenAuthentication'] / results['TokenAuthentication']
+            self.stdout.write(self.style.SUCCESS(f'Speedup: {speedup:.2f}x'))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    def run(self, view, factory, key, count):
+        def call():
+            response = view(factory.get('/', HTTP_AUTHORIZATION=f'Token {key}'))
+            assert response.status_code == 200, response.status_code
+
+        for _ in range(100):
+            call()
+        start = time.perf_counter()
+        for _ in range(count):
+            call()
+        return count / (time.perf_counter() - start)
@@ -0,0 +1,135 @@
+import sqlite3
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from boards import benchmark
+from boards.models import Task
+
+# Environment of the server for each mode (see workboard/database.py).
+SQLITE_MODES = {
+    # The settings before DATABASE_URL: rollback journal, fsync on every
+    # commit, deferred transactions and a new connection per request.
+    'baseline': {
+        'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_TRANSACTION_MODE': 'DEFERRED', 'DB_CONN_MAX_AGE': '0',
+    },
+    'wal': {
+        'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_TRANSACTION_MODE': 'DEFERRED', 'DB_CONN_MAX_AGE': '0',
+    },
+    'tuned': {
+        'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL',
+        'SQLITE_TRANSACTION_MODE': 'IMMEDIATE', 'DB_CONN_MAX_AGE': '600',
+    },
+}
+POSTGRES_MODES = {
+    'per-request': {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '600'},
+    'pooled': {'DB_POOL': 'True'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the write throughput of PATCH /api/tasks/<id>/status/ across database connection modes '
+        '(SQLite: baseline, wal, tuned; PostgreSQL: per-request, persistent, pooled) by starting gunicorn '
+        'against the configured database once per mode.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--tasks-per-board', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per mode')
+        parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Client threads')
+        parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+        parser.add_argument('--modes', help='Comma-separated modes (default: all modes of the configured database)')
+
+    def handle(self, *args, **options):
+        database = settings.DATABASES['default']
+        vendor = connections['default'].vendor
+        if vendor == 'sqlite':
+            modes = SQLITE_MODES
+            if str(database['NAME']).startswith(':memory:') or 'mode=memory' in str(database['NAME']):
+                raise CommandError('The server processes need an SQLite file; set DATABASE_URL=sqlite:///path')
+        elif vendor == 'postgresql':
+            modes = POSTGRES_MODES
+        else:
+            raise CommandError(f'No connection modes to compare for {vendor}.')
+        names = [name.strip() for name in (options['modes'] or '').split(',') if name.strip()] or list(modes)
+        unknown = set(names) - set(modes)
+        if unknown:
+            raise CommandError(f"Unknown modes for {vendor}: {', '.join(sorted(unknown))}")
+
+        run_id = uuid.uuid4().hex[:8]
+        prefix = f'bench{run_id}'
+        dataset = benchmark.generate_dataset(
+            options['users'], options['boards'], options['tasks_per_board'], prefix=prefix
+        )
+        scenarios = self.status_changes(dataset)
+        results = {}
+        try:
+            for name in names:
+                results[name] = self.run(name, modes[name], database, scenarios, options)
+        finally:
+            benchmark.remove_dataset(prefix)
+
+        self.stdout.write(
+            f"{vendor}, {options['workers']} workers, {options['concurrency']} client threads, "
+            f"{options['requests']} status changes per mode"
+        )
+        self.stdout.write(f"{'mode':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for name, stats in results.items():
+            line = (
+                f"{name:<14} {stats['rps']:>9.1f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                f"{stats['p99_ms']:>9.2f} {stats['errors']:>7}"
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['errors'] else line)
+        baseline = results.get(names[0])
+        if baseline and baseline['rps'] and len(results) > 1:
+            best = max(results, key=lambda name: results[name]['rps'] or 0)
+            self.stdout.write(self.style.SUCCESS(
+                f"{best}: {results[best]['rps'] / baseline['rps']:.2f}x the throughput of {names[0]}"
+            ))
+
+    def status_changes(self, dataset):
+        # Every request moves its task on to the next status. Setting the
+        # status a task already has is answered without writing anything, so
+        # replaying the same requests for each mode would measure no writes.
+        current = dict(Task.objects.filter(pk__in=[task.pk for task in dataset.tasks]).values_list('pk', 'status'))
+
+        def prepare(i):
+            task = dataset.tasks[i % len(dataset.tasks)]
+            status = benchmark.STATUSES[(benchmark.STATUSES.index(current[task.pk]) + 1) % len(benchmark.STATUSES)]
+            current[task.pk] = status
+            return benchmark.BenchRequest(
+                'PATCH', f'/api/tasks/{task.pk}/status/', {'status': status}, dataset.token_for_board(task.board_id)
+            )
+
+        return {'task-status': benchmark.Scenario(prepare, {200})}
+
+    def run(self, name, env, database, scenarios, options):
+        # Nothing in this process may hold the database open while the
+        # journal mode changes, and the workers must not inherit a connection.
+        connections.close_all()
+        if database['ENGINE'] == 'django.db.backends.sqlite3':
+            with sqlite3.connect(database['NAME']) as db:
+                db.execute(f"PRAGMA journal_mode={env['SQLITE_JOURNAL_MODE']}")
+            db.close()
+        try:
+            server, url = benchmark.start_server(settings.BASE_DIR, options['workers'], env=env)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        try:
+            self.stdout.write(f'Running {name}...')
+            return benchmark.run_workload(
+                benchmark.HTTPRunner(url), scenarios, requests=options['requests'], warmup=options['warmup'],
+                concurrency=options['concurrency'], names=['task-status'],
+            )['task-status']
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
@@ -0,0 +1,102 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from boards import benchmark, renderers
+
+# API_RENDERING and Accept header of each mode; buffered-json is the
+# renderer and encoder the API used before streaming.
+MODES = {
+    'buffered-json': ({'JSON_ENCODER': 'json', 'STREAM_MIN_ROWS': None}, 'application/json'),
+    'buffered-orjson': ({'JSON_ENCODER': 'orjson', 'STREAM_MIN_ROWS': None}, 'application/json'),
+    'streaming-json': ({'JSON_ENCODER': 'json'}, 'application/json'),
+    'streaming-orjson': ({'JSON_ENCODER': 'orjson'}, 'application/json'),
+    'streaming-msgpack': ({}, 'application/msgpack'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare peak memory and latency of exporting a large task list (GET /api/tasks/ and '
+        '/api/users/<id>/assignments/) buffered and streamed, as JSON (stdlib or orjson) and MessagePack, '
+        'in-process on a scratch database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=1, help='Timed requests per mode (the fastest is kept)')
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            boards = max(1, options['tasks'] // 1000)
+            # One user owning and assigned every task.
+            dataset = benchmark.generate_dataset(1, boards, options['tasks'] // boards)
+            user = dataset.users[0]
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Token {dataset.tokens[user.pk]}')
+            paths = {'tasks': '/api/tasks/', 'assignments': f'/api/users/{user.pk}/assignments/'}
+            results = {}
+            for name, (rendering, accept) in MODES.items():
+                if accept == 'application/msgpack' and renderers.msgpack is None:
+                    self.stdout.write(f'Skipping {name}: msgpack is not installed')
+                    continue
+                with override_settings(
+                    API_RENDERING={**renderers.get_config(), **rendering}, BOARD_RESPONSE_CACHE={'ENABLED': False}
+                ):
+                    for label, path in paths.items():
+                        self.stdout.write(f'Running {name} {label}...')
+                        results[(name, label)] = self.run(client, path, accept, options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(f"{len(dataset.tasks)} tasks")
+        self.stdout.write(
+            f"{'mode':<18} {'endpoint':<12} {'first byte ms':>14} {'total ms':>9} {'peak MB':>8} {'size MB':>8}"
+        )
+        for (name, label), stats in results.items():
+            self.stdout.write(
+                f"{name:<18} {label:<12} {stats['first_byte_ms']:>14.0f} {stats['total_ms']:>9.0f} "
+                f"{stats['peak_mb']:>8.1f} {stats['size_mb']:>8.1f}"
+            )
+        before, after = results.get(('buffered-json', 'tasks')), results.get(('streaming-orjson', 'tasks'))
+        if before and after:
+            self.stdout.write(self.style.SUCCESS(
+                f"Task list, streaming-orjson vs buffered-json: {before['peak_mb'] / after['peak_mb']:.0f}x less "
+                f"peak memory, {before['total_ms'] / after['total_ms']:.2f}x faster"
+            ))
+
+    def fetch(self, client, path, accept):
+        """``(seconds to the first byte, total seconds, bytes)``, reading streamed content piece by piece."""
+        start = time.perf_counter()
+        response = client.get(path, HTTP_ACCEPT=accept)
+        assert response.status_code == 200, response.status_code
+        if not response.streaming:
+            elapsed = time.perf_counter() - start
+            return elapsed, elapsed, len(response.content)
+        first_byte, size = None, 0
+        for piece in response.streaming_content:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(piece)
+        response.close()
+        return first_byte, time.perf_counter() - start, size
+
+    def run(self, client, path, accept, repeat):
+        timings = [self.fetch(client, path, accept) for _ in range(repeat)]
+        first_byte, total, size = min(timings, key=lambda timing: timing[1])
+
+        # Memory is traced in a separate, slower request.
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            self.fetch(client, path, accept)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        return {
+            'first_byte_ms': first_byte * 1000, 'total_ms': total * 1000,
+            'peak_mb': peak / 2 ** 20, 'size_mb': size / 2 ** 20,
+        }
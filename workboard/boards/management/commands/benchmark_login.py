@@ -0,0 +1,95 @@
+import json
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from boards import benchmark
+
+READS = ['board-list', 'current-user']
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure a login storm: concurrent POST /api/login/ mixed with authenticated reads against a '
+        'gunicorn/uvicorn server (started here, with the login rate limit off, unless --url is given). '
+        'Reports login throughput and latency and the latency of the reads behind the logins.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--tasks-per-board', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--login-every', type=int, default=2, help='One login per this many requests')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes for the started server')
+        parser.add_argument('--hash-workers', type=int, help='LOGIN_HASH_WORKERS of the started server')
+        parser.add_argument('--url', help='Base URL of a running server sharing this database')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        server = None
+        url = options['url']
+        if not url:
+            env = {'RATE_LIMIT_LOGIN': ''}
+            if options['hash_workers']:
+                env['LOGIN_HASH_WORKERS'] = str(options['hash_workers'])
+            try:
+                server, url = benchmark.start_server(settings.BASE_DIR, options['workers'], env=env)
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        run_id = uuid.uuid4().hex[:8]
+        prefix = f'bench{run_id}'
+        try:
+            dataset = benchmark.generate_dataset(
+                options['users'], options['boards'], options['tasks_per_board'], prefix=prefix
+            )
+            scenarios = benchmark.build_scenarios(dataset, run_id)
+            runner = benchmark.HTTPRunner(url)
+            # Warm the workers and the token cache, then measure the reads on
+            # their own and during the storm.
+            benchmark.run_mixed(runner, scenarios, READS, ['login'], requests=len(READS) * 2, concurrency=1)
+            results = {
+                'reads-only': benchmark.run_mixed(
+                    runner, scenarios, READS, [], requests=options['requests'],
+                    concurrency=options['concurrency'], write_every=options['requests'] + 1,
+                ),
+                'login-storm': benchmark.run_mixed(
+                    runner, scenarios, READS, ['login'], requests=options['requests'],
+                    concurrency=options['concurrency'], write_every=options['login_every'],
+                ),
+            }
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+            benchmark.remove_dataset(prefix)
+
+        storm = results['login-storm']
+        self.stdout.write(
+            f"{options['requests']} requests, concurrency {options['concurrency']}, "
+            f"1 login per {options['login_every']} requests"
+        )
+        self.stdout.write(
+            f"{'run':<12} {'read p50':>9} {'read p95':>9} {'login p50':>10} {'login p95':>10} "
+            f"{'logins/s':>9} {'errors':>7}"
+        )
+        for name, result in results.items():
+            reads, logins = result['reads'], result['writes']
+            self.stdout.write(
+                f"{name:<12} {reads['p50_ms']:>9.1f} {reads['p95_ms']:>9.1f} "
+                f"{logins['p50_ms'] or 0:>10.1f} {logins['p95_ms'] or 0:>10.1f} "
+                f"{logins['rps'] if logins['requests'] else 0:>9.1f} "
+                f"{result['total']['errors']:>7}"
+            )
+        # Client threads waiting on logins send no reads during the storm, so its reads
+        # are not directly comparable with reads-only; compare storms between runs.
+        self.stdout.write(self.style.SUCCESS(
+            f"{storm['writes']['rps']:.1f} logins/s, read p95 {storm['reads']['p95_ms']:.1f} ms during the storm"
+        ))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
@@ -0,0 +1,71 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from boards import benchmark, fast_serializers, renderers
+from boards.models import Board, Task
+from boards.query_planner import plan_queryset
+from boards.serializers import BoardSerializer, TaskSerializer, UserSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the DRF serializers with their fast read-only versions (boards.fast_serializers) on a '
+        'scratch database: time to load and render every task, board and user, and whether the rendered '
+        'JSON is identical.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--boards', type=int, default=100)
+        parser.add_argument('--tasks-per-board', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per serializer (the fastest is kept)')
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            benchmark.generate_dataset(options['users'], options['boards'], options['tasks_per_board'])
+            cases = {
+                'tasks': (Task.objects.all(), TaskSerializer),
+                'boards': (Board.objects.all(), BoardSerializer),
+                'users': (User.objects.all(), UserSerializer),
+            }
+            results = {}
+            for name, (queryset, serializer_class) in cases.items():
+                self.stdout.write(f'Running {name}...')
+                results[name] = self.run(queryset, serializer_class, options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(f"{'serializer':<10} {'rows':>7} {'DRF ms':>9} {'fast ms':>9} {'speedup':>8}")
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<10} {stats['rows']:>7} {stats['drf_ms']:>9.1f} {stats['fast_ms']:>9.1f} "
+                f"{stats['drf_ms'] / stats['fast_ms']:>7.1f}x"
+            )
+        self.stdout.write(self.style.SUCCESS('Rendered JSON identical for every serializer'))
+
+    def run(self, queryset, serializer_class, repeat):
+        def drf():
+            return serializer_class(plan_queryset(queryset, serializer_class()), many=True).data
+
+        def fast():
+            return list(fast_serializers.for_serializer(serializer_class).iterate(queryset))
+
+        drf_seconds, drf_data = self.best(drf, repeat)
+        fast_seconds, fast_data = self.best(fast, repeat)
+        if renderers.dumps(drf_data) != renderers.dumps(fast_data):
+            raise CommandError(f'{serializer_class.__name__}: the fast serializer rendered different JSON')
+        return {'rows': len(drf_data), 'drf_ms': drf_seconds * 1000, 'fast_ms': fast_seconds * 1000}
+
+    def best(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = render()
+            timings.append(time.perf_counter() - start)
+        return min(timings), data
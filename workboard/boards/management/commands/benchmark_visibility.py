@@ -0,0 +1,70 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.test.utils import setup_databases, teardown_databases
+
+from boards.models import Board, Task
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compare the OR-join + DISTINCT board visibility query with Board.objects.visible_to on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--boards', type=int, default=500)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            user = self.populate(options['users'], options['boards'], options['tasks'])
+            queries = {
+                'join + distinct': lambda: list(
+                    Board.objects.filter(Q(owner=user) | Q(tasks__assignee=user)).distinct().values_list('id', flat=True)
+                ),
+                'visible_to': lambda: list(Board.objects.visible_to(user).values_list('id', flat=True)),
+            }
+            results = {}
+            for name, run in queries.items():
+                run()
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    ids = run()
+                results[name] = ((time.perf_counter() - start) / options['repeat'] * 1000, sorted(ids))
+
+            baseline, expected = results['join + distinct']
+            for name, (ms, ids) in results.items():
+                if ids != expected:
+                    self.stderr.write(self.style.ERROR(f'{name} returned different boards'))
+                self.stdout.write(f'{name:<22} {ms:>9.2f} ms  ({len(ids)} boards)')
+            self.stdout.write(self.style.SUCCESS(
+                f"Speedup: {baseline / results['visible_to'][0]:.2f}x"
+            ))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    def populate(self, user_count, board_count, task_count):
+        users = User.objects.bulk_create(
+            User(username=f'user{i}', email=f'user{i}@example.com') for i in range(user_count)
+        )
+        boards = Board.objects.bulk_create(
+            Board(name=f'Board {i}', owner=users[i % user_count]) for i in range(board_count)
+        )
+        Task.objects.bulk_create(
+            (
+                Task(
+                    board=boards[i % board_count],
+                    title=f'Task {i}',
+                    assignee=users[(i * 7) % user_count],
+                    created_by=boards[i % board_count].owner,
+                )
+                for i in range(task_count)
+            ),
+            batch_size=5000,
+        )
+        return users[0]
@@ -0,0 +1,48 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from boards.archive import export_archive
+from boards.models import Board
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Write boards and their tasks to an NDJSON archive (see boards.archive), gzip-compressed when the '
+        'file name ends in .gz. Reads and writes in constant memory, whatever the number of tasks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Archive file, or '-' for standard output")
+        parser.add_argument('--board', type=int, action='append', dest='boards', help='Only this board (repeatable)')
+        parser.add_argument('--owner', help='Only boards owned by this user (username or email)')
+        parser.add_argument('--gzip', action='store_true', help='Compress, whatever the file name')
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['boards']:
+            boards = boards.filter(pk__in=options['boards'])
+        if options['owner']:
+            owner = User.objects.filter(Q(username=options['owner']) | Q(email__iexact=options['owner'])).first()
+            if owner is None:
+                raise CommandError(f"No user {options['owner']!r}.")
+            boards = boards.filter(owner=owner)
+        compress = options['gzip'] or options['output'].endswith('.gz')
+        count = boards.count()
+
+        size = 0
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for block in export_archive(boards, compress=compress):
+                output.write(block)
+                size += len(block)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        # Keep standard output for the archive.
+        report = self.stderr if options['output'] == '-' else self.stdout
+        report.write(self.style.SUCCESS(f'Exported {count} boards ({size} bytes).'))
@@ -0,0 +1,47 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from boards.archive import ArchiveError, archive_lines, import_archive
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the boards and tasks of an NDJSON archive written by export_boards (gzip-compressed or not), '
+        'in batched transactions and constant memory. Boards keep their archived owner unless --owner is given; '
+        'task creators are matched by email.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Archive file, or '-' for standard input")
+        parser.add_argument('--owner', help='Owner of every imported board (username or email)')
+        parser.add_argument(
+            '--batch-size', type=int,
+            help="Tasks per transaction (default: BOARD_ARCHIVES['IMPORT_BATCH_SIZE'])",
+        )
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['owner']:
+            owner = User.objects.filter(Q(username=options['owner']) | Q(email__iexact=options['owner'])).first()
+            if owner is None:
+                raise CommandError(f"No user {options['owner']!r}.")
+
+        stream = sys.stdin.buffer if options['input'] == '-' else open(options['input'], 'rb')
+        try:
+            imported = import_archive(
+                archive_lines(stream), owner=owner, batch_size=options['batch_size'], match_creators=True
+            )
+        except ArchiveError as e:
+            raise CommandError(f"{e} Imported before the error: {e.imported}.")
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported['boards']} boards and {imported['tasks']} tasks "
+            f"({imported['unassigned']} with an unknown assignee left unassigned)."
+        ))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from boards.models import Change, ChangeLogPrune
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete change feed entries older than --days. Clients whose cursor predates the '
+        'remaining entries get 410 Gone from /api/changes/ and reload.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Ids grow with time, so everything up to the newest old entry goes,
+        # and the feed expires cursors below it.
+        last_old = Change.objects.filter(recorded_at__lt=cutoff).order_by('-id').values_list('id', flat=True).first()
+        deleted = 0
+        if last_old is not None:
+            with transaction.atomic():
+                deleted = Change.objects.filter(id__lte=last_old).delete()[0]
+                ChangeLogPrune.objects.update_or_create(pk=1, defaults={'pruned_through': last_old})
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries.'))
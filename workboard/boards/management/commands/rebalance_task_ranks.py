@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from boards import ranking
+from boards.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        'Respace task ranks in columns whose ranks have grown long or contain duplicates. '
+        'Safe to run periodically (e.g. from cron); order within each column is preserved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-length', type=int,
+            help="Rebalance columns with a rank at least this long (default: TASK_RANKING['REBALANCE_LENGTH'])",
+        )
+        parser.add_argument('--board', type=int, action='append', dest='boards', help='Only this board (repeatable)')
+        parser.add_argument('--all', action='store_true', help='Rebalance every column of the selected boards')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            columns = Task.objects.order_by().values_list('board_id', 'status').distinct()
+            if options['boards']:
+                columns = columns.filter(board_id__in=options['boards'])
+            columns = list(columns)
+        else:
+            columns = [
+                column for column in ranking.crowded_columns(options['min_length'])
+                if not options['boards'] or column[0] in options['boards']
+            ]
+
+        changed = sum(ranking.rebalance(board_id, status) for board_id, status in columns)
+        self.stdout.write(self.style.SUCCESS(f'Rebalanced {len(columns)} columns ({changed} tasks re-ranked).'))
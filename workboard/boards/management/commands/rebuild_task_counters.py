@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from boards import counters
+from boards.models import BoardTaskCount, UserTaskCount
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-board and per-user task counters from the task table'
+
+    def handle(self, *args, **options):
+        counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {BoardTaskCount.objects.count()} board counters and '
+            f'{UserTaskCount.objects.count()} user counters.'
+        ))
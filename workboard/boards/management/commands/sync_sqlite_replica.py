@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from boards.replicas import get_config
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into the SQLite replicas of DATABASE_REPLICA_URLS, '
+        'once or every --interval seconds, to try replica routing locally. The interval plays '
+        'the part of the replication lag.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep copying, pausing this many seconds between copies')
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES['default']
+        replicas = [settings.DATABASES[alias] for alias in get_config()['ALIASES']]
+        if not replicas:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_URLS.')
+        engines = {primary['ENGINE'], *(replica['ENGINE'] for replica in replicas)}
+        if engines != {'django.db.backends.sqlite3'}:
+            raise CommandError('sync_sqlite_replica only copies SQLite databases; other replicas use their own replication.')
+
+        while True:
+            start = time.perf_counter()
+            source = sqlite3.connect(primary['NAME'])
+            try:
+                for replica in replicas:
+                    target = sqlite3.connect(replica['NAME'])
+                    try:
+                        # The backup API copies a consistent snapshot while
+                        # both files stay in use.
+                        source.backup(target)
+                    finally:
+                        target.close()
+            finally:
+                source.close()
+            self.stdout.write(self.style.SUCCESS(
+                f'Copied {primary["NAME"]} to {len(replicas)} replicas in {(time.perf_counter() - start) * 1000:.0f} ms'
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.1 on 2026-10-17 21:25
+
+import django.db.models.deletion
+from django.conf import settings
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_counters(apps, schema_editor):
+    Task = apps.get_model('boards', 'Task')
+    BoardTaskCount = apps.get_model('boards', 'BoardTaskCount')
+    UserTaskCount = apps.get_model('boards', 'UserTaskCount')
+
+    rows = Task.objects.order_by().values_list('board_id', 'status').annotate(total=Count('id'))
+    BoardTaskCount.objects.bulk_create(
+        BoardTaskCount(board_id=board_id, status=status, count=total) for board_id, status, total in rows
+    )
+
+    user_totals = Counter()
+    rows = (
+        Task.objects.order_by()
+        .values_list('board__owner_id', 'assignee_id', 'created_by_id', 'status')
+        .annotate(total=Count('id'))
+    )
+    for owner_id, assignee_id, created_by_id, status, total in rows:
+        for user_id in {owner_id, assignee_id, created_by_id} - {None}:
+            user_totals[(user_id, status)] += total
+    UserTaskCount.objects.bulk_create(
+        UserTaskCount(user_id=user_id, status=status, count=total) for (user_id, status), total in user_totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0003_access_control_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardTaskCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('To-Do', 'To-Do'), ('In Progress', 'In Progress'), ('Completed', 'Completed')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counts', to='boards.board')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('board', 'status'), name='unique_board_task_count')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserTaskCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('To-Do', 'To-Do'), ('In Progress', 'In Progress'), ('Completed', 'Completed')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'status'), name='unique_user_task_count')],
+            },
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
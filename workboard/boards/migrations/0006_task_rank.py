@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-17 21:45
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def spread(count):
+    # Same as boards.ranking.spread, frozen here.
+    width = 1
+    while len(DIGITS) ** width < (count + 1) * len(DIGITS):
+        width += 1
+    step = len(DIGITS) ** width // (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value, digits = position * step, []
+        for _ in range(width):
+            value, digit = divmod(value, len(DIGITS))
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+BATCH_SIZE = 500
+
+
+def rank_existing_tasks(apps, schema_editor):
+    # Keep the order the board page used so far: oldest first within a column.
+    # Streamed and written in batches, so only one column (plus a batch) is
+    # held in memory however many tasks there are.
+    Task = apps.get_model('boards', 'Task')
+    tasks = Task.objects.order_by('board_id', 'status', 'created_at', 'id').only('pk', 'board_id', 'status')
+    changed = []
+    for _, column in groupby(tasks.iterator(chunk_size=2000), key=lambda task: (task.board_id, task.status)):
+        column = list(column)
+        for task, rank in zip(column, spread(len(column))):
+            task.rank = rank
+            changed.append(task)
+        if len(changed) >= BATCH_SIZE:
+            Task.objects.bulk_update(changed, ['rank'], batch_size=BATCH_SIZE)
+            changed = []
+    if changed:
+        Task.objects.bulk_update(changed, ['rank'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0005_board_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'rank'], name='task_board_status_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-17 22:05
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # Vendor-specific (FTS5 tables and triggers on SQLite, GIN expression
+    # indexes on PostgreSQL); see boards.search.
+    from boards import search
+    search.ensure_index(schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    from boards import search
+    search.drop_index(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0006_task_rank'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0010_ratelimitcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='horizon',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 # boards/models.py
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 class CustomUser(AbstractUser):
@@ -31,6 +32,67 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.username
 
+class BoardQuerySet(models.QuerySet):
+    def touch(self, board_ids):
+        """
+        Record that something on these boards (e.g. one of their tasks)
+        changed: bumps ``version`` and ``updated_at`` in a single UPDATE.
+        """
+        return self.filter(pk__in=set(board_ids)).update(version=models.F('version') + 1, updated_at=timezone.now())
+
+    def referencing(self, user):
+        """Boards whose payload mentions ``user``: as owner, assignee or task creator."""
+        tasks = Task.objects.filter(models.Q(assignee=user) | models.Q(created_by=user)).values('board_id')
+        return self.filter(models.Q(owner=user) | models.Q(pk__in=tasks))
+
+    def assigned_to(self, user):
+        """Boards with at least one task assigned to ``user``."""
+        return self.filter(pk__in=Task.objects.filter(assignee=user).values('board_id'))
+
+    def visible_to(self, user):
+        """
+        Boards ``user`` owns or has a task assigned on.
+
+        Written as ``owner = user OR id IN (boards of assigned tasks)`` rather
+        than a join to tasks plus DISTINCT: the subquery is evaluated once from
+        the assignee index, so the cost follows the number of boards and of
+        the user's assignments instead of the size of the task table.
+        """
+        assigned = Task.objects.filter(assignee=user).values('board_id')
+        return self.filter(models.Q(owner=user) | models.Q(pk__in=assigned))
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Tasks on boards ``user`` owns, assigned to them, or created by them."""
+        owned_boards = Board.objects.filter(owner=user).values('pk')
+        return self.filter(
+            models.Q(board__in=owned_boards) | models.Q(assignee=user) | models.Q(created_by=user)
+        )
+
+    def listed_for(self, user):
+        """
+        Tasks on boards ``user`` owns or assigned to them, as the web pages
+        list them; unlike ``visible_to``, tasks they only created are left out.
+        """
+        owned_boards = Board.objects.filter(owner=user).values('pk')
+        return self.filter(models.Q(board__in=owned_boards) | models.Q(assignee=user))
+
+    def last_ranks(self, board_ids):
+        """``{(board_id, status): highest rank}`` for the columns of these boards."""
+        rows = (
+            self.filter(board_id__in=set(board_ids)).order_by()
+            .values_list('board_id', 'status').annotate(last=models.Max('rank'))
+        )
+        return {(board_id, status): last for board_id, status, last in rows}
+
+    def next_rank(self, board_id, status):
+        """Rank that sorts after every task currently in the column."""
+        from .ranking import between
+        last = self.filter(board_id=board_id, status=status).aggregate(last=models.Max('rank'))['last']
+        return between(last or None, None)
+
+
 class Board(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -41,12 +103,32 @@ class Board(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped whenever one of the board's tasks changes; see BoardQuerySet.touch.
+    version = models.PositiveIntegerField(default=1)
+
+    objects = BoardQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    @property
+    def task_counts_by_status(self):
+        """Task counts per status, read from the maintained counters."""
+        counts = {status: 0 for status, _ in Task.STATUS_CHOICES}
+        for counter in self.task_counts.all():
+            counts[counter.status] = counter.count
+        return counts
+
+    @property
+    def task_total(self):
+        return sum(counter.count for counter in self.task_counts.all())
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Boards a user owns, newest first.
+            models.Index(fields=['owner', 'created_at'], name='board_owner_created_idx'),
+        ]
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -79,11 +161,155 @@ class Task(models.Model):
         on_delete=models.CASCADE,
         related_name='created_tasks'
     )
+    # Position within the (board, status) column; see boards.ranking.
+    rank = models.CharField(max_length=64, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # One transaction for the save and its signals, so boards.counters can
+        # lock the stored row in pre_save and diff against it in post_save.
+        using = kwargs.get('using') or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            if not self.rank:
+                # New tasks go to the bottom of their column.
+                self.rank = Task.objects.using(using).next_rank(self.board_id, self.status)
+            elif not self._state.adding and self._rank_if_moved(using, kwargs.get('update_fields')):
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'rank'}
+            super().save(*args, **kwargs)
+
+    def _rank_if_moved(self, using, update_fields):
+        """
+        Put the task at the bottom of its column if this save moves it to
+        another one; the rank it had only means something in the old column.
+        Returns whether the rank changed.
+        """
+        if update_fields is not None and not {'board', 'board_id', 'status'} & set(update_fields):
+            return False
+        # Compared with the stored row rather than what this instance loaded,
+        # which may be stale.
+        stored = (
+            Task.objects.using(using).select_for_update()
+            .filter(pk=self.pk).values_list('board_id', 'status').first()
+        )
+        if stored is None or stored == (self.board_id, self.status):
+            return False
+        self.rank = Task.objects.using(using).next_rank(self.board_id, self.status)
+        return True
+
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Columns of a board, and the access-control predicates used by
+            # BoardViewSet/TaskViewSet, each ordered by created_at.
+            models.Index(fields=['board', 'status', 'created_at'], name='task_board_status_created_idx'),
+            # Manual order within a column.
+            models.Index(fields=['board', 'status', 'rank'], name='task_board_status_rank_idx'),
+            models.Index(fields=['assignee', 'created_at'], name='task_assignee_created_idx'),
+            models.Index(fields=['created_by', 'created_at'], name='task_creator_created_idx'),
+            # updated_since/updated_* filters (incremental sync) on owned boards;
+            # assigned/created tasks are reached through the indexes above.
+            models.Index(fields=['board', 'updated_at'], name='task_board_updated_idx'),
+        ]
+
+
+class BoardTaskCount(models.Model):
+    """Number of tasks per status on a board, kept up to date by boards.counters."""
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.CASCADE,
+        related_name='task_counts'
+    )
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'status'], name='unique_board_task_count'),
+        ]
+
+
+class UserTaskCount(models.Model):
+    """
+    Number of tasks per status visible to a user (on boards they own,
+    assigned to them or created by them), kept up to date by boards.counters.
+    """
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='task_counts'
+    )
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'status'], name='unique_user_task_count'),
+        ]
+
+
+class Change(models.Model):
+    """
+    One entry in a user's change feed (``GET /api/changes/``): a board or task
+    that was created, updated or deleted, written by boards.changelog in the
+    same transaction as the change itself. The auto-incrementing id is the
+    feed cursor.
+    """
+    KIND_CHOICES = [
+        ('board', 'board'),
+        ('task', 'task'),
+    ]
+    ACTION_CHOICES = [
+        ('created', 'created'),
+        ('updated', 'updated'),
+        ('deleted', 'deleted'),
+    ]
+
+    # Who may see the change; one row per user the object is visible to.
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+    )
+    kind = models.CharField(max_length=5, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    # Plain ids rather than foreign keys so entries outlive deleted objects.
+    board_id = models.BigIntegerField()
+    action = models.CharField(max_length=7, choices=ACTION_CHOICES)
+    recorded_at = models.DateTimeField(auto_now_add=True)
+    # PostgreSQL only: xmax of a snapshot taken after the id was drawn, so
+    # every transaction that drew a lower id has a smaller xid. The entry is
+    # served once no transaction below this xid is still running.
+    horizon = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # A user's feed after a cursor.
+            models.Index(fields=['user', 'id'], name='change_user_cursor_idx'),
+        ]
+
+
+class ChangeLogPrune(models.Model):
+    """
+    How far ``manage.py prune_change_log`` has pruned the change feed; a single
+    row. Cursors below ``pruned_through`` are expired, whatever ids are left.
+    """
+    pruned_through = models.BigIntegerField(default=0)
+
+
+class RateLimitCounter(models.Model):
+    """
+    Requests counted in one rate-limit window, shared by every worker; see
+    boards.ratelimit. ``key`` includes the window, so a row is never reused
+    once it expires.
+    """
+    key = models.CharField(max_length=200, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
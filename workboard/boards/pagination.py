@@ -0,0 +1,23 @@
+# boards/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(-created_at, id)``.
+
+    Each page seeks from the last ``created_at`` seen instead of using an
+    OFFSET, so deep pages cost the same as the first one. Pagination is
+    opt-in: clients that send neither ``cursor`` nor ``page_size`` keep
+    getting the plain list the API has always returned.
+    """
+    ordering = ('-created_at', 'id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
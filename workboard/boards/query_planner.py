@@ -0,0 +1,105 @@
+# boards/query_planner.py
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _readable_fields(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return [field for field in serializer.fields.values() if not field.write_only]
+
+
+def _nested_serializer(field):
+    """
+    Return (serializer, many) for nested serializer fields, or (None, False)
+    for plain fields that never touch another table.
+    """
+    if isinstance(field, serializers.ListSerializer):
+        return field.child, True
+    if isinstance(field, serializers.BaseSerializer):
+        return field, False
+    return None, False
+
+
+def _is_forward_relation(model, name):
+    try:
+        model_field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return model_field.is_relation and (model_field.many_to_one or model_field.one_to_one) and not model_field.auto_created
+
+
+def collect_lookups(serializer, model, prefix=''):
+    """
+    Walk the readable fields of ``serializer`` and work out which relations it
+    will touch while rendering ``model`` instances.
+
+    Returns a tuple ``(select_related, prefetch_related)``: forward FK/one-to-one
+    relations rendered by a nested serializer are joined, everything else
+    (reverse FKs, many-to-many, ``many=True`` nesting) becomes a ``Prefetch``
+    whose queryset is planned recursively from the child serializer.
+
+    Fields the walker cannot see through (e.g. ``SerializerMethodField``) can
+    declare what they read in ``Meta.field_prefetches``, a mapping of field
+    name to prefetch lookups that is applied only when the field is rendered.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    select_related = []
+    prefetch_related = []
+
+    field_prefetches = getattr(getattr(serializer, 'Meta', None), 'field_prefetches', {})
+
+    for field in _readable_fields(serializer):
+        for lookup in field_prefetches.get(field.field_name, ()):
+            prefetch_related.append(prefix + lookup)
+
+        nested, many = _nested_serializer(field)
+        if nested is None or field.source == '*' or '.' in field.source:
+            continue
+
+        related_model = getattr(getattr(nested, 'Meta', None), 'model', None)
+        if related_model is None:
+            continue
+
+        lookup = prefix + field.source
+        if not many and _is_forward_relation(model, field.source):
+            select_related.append(lookup)
+            child_select, child_prefetch = collect_lookups(nested, related_model, prefix=lookup + '__')
+            select_related.extend(child_select)
+            prefetch_related.extend(child_prefetch)
+        else:
+            child_queryset = plan_queryset(related_model._default_manager.all(), nested)
+            prefetch_related.append(Prefetch(lookup, queryset=child_queryset))
+
+    return select_related, prefetch_related
+
+
+def plan_queryset(queryset, serializer):
+    """
+    Apply the joins and prefetches that ``serializer`` needs to ``queryset`` so
+    that rendering the result costs a fixed number of queries, independent of
+    how many rows (or nested rows) are returned.
+    """
+    select_related, prefetch_related = collect_lookups(serializer, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+class QueryPlanMixin:
+    """
+    Viewset mixin that plans the queryset from the view's serializer.
+
+    Hooked into ``filter_queryset`` so it covers both ``list`` and
+    ``get_object`` without every viewset having to repeat it in its own
+    ``get_queryset``.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return plan_queryset(queryset, self.get_serializer())
@@ -0,0 +1,149 @@
+# boards/ranking.py
+"""
+Manual ordering of tasks within a column.
+
+Every task carries a ``rank``: a string over ``0-9a-z`` that never ends in
+``0``. Tasks in a column are shown in ``(rank, id)`` order, and because ranks
+compare as strings there is always one that sorts strictly between two
+others: ``between('a', 'b')`` is ``'ai'``, ``between('a', 'a1')`` is
+``'a0i'``. Moving a card therefore rewrites only that card's row, whatever
+the size of the column.
+
+Each insertion between two close neighbours can make the new rank one
+character longer. Once a column has a rank of ``REBALANCE_LENGTH`` characters
+or more, it is rewritten with short, evenly spaced ranks: in a background
+thread after the move that crossed the threshold (``BACKGROUND_REBALANCE``),
+and by ``manage.py rebalance_task_ranks`` for anything that was missed.
+
+Configured with ``settings.TASK_RANKING``.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Length
+
+from .models import Board, Task
+
+logger = logging.getLogger(__name__)
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+# Must match Task.rank's max_length.
+MAX_LENGTH = 64
+
+DEFAULTS = {
+    'REBALANCE_LENGTH': 12,
+    'BACKGROUND_REBALANCE': True,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'TASK_RANKING', {})}
+
+
+def _midpoint(lower, upper):
+    # lower < upper, where '' is the smallest rank and None the largest.
+    if upper is not None:
+        shared = 0
+        while shared < len(upper) and (lower[shared] if shared < len(lower) else '0') == upper[shared]:
+            shared += 1
+        if shared:
+            return upper[:shared] + _midpoint(lower[shared:], upper[shared:])
+    low = DIGITS.index(lower[0]) if lower else 0
+    high = DIGITS.index(upper[0]) if upper is not None else BASE
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[low] + _midpoint(lower[1:], None)
+
+
+def between(lower=None, upper=None):
+    """A rank strictly between ``lower`` and ``upper``; either end may be None (open)."""
+    lower = lower or ''
+    if upper is not None and lower >= upper:
+        raise ValueError(f'{lower!r} does not sort before {upper!r}')
+    return _midpoint(lower, upper)
+
+
+def spread(count):
+    """``count`` ascending ranks, as short and evenly spaced as possible."""
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value, digits = position * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def rebalance(board_id, status):
+    """Rewrite one column with evenly spaced ranks, keeping its order. Returns the number of tasks changed."""
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(board_id=board_id, status=status)
+            .order_by('rank', 'id')
+            .only('pk', 'rank')
+        )
+        changed = []
+        for task, rank in zip(tasks, spread(len(tasks))):
+            if task.rank != rank:
+                task.rank = rank
+                changed.append(task)
+        if changed:
+            Task.objects.bulk_update(changed, ['rank'], batch_size=500)
+            # Ranks are part of the board payload.
+            Board.objects.touch([board_id])
+    return len(changed)
+
+
+def crowded_columns(min_length=None):
+    """(board_id, status) of columns with a rank of ``min_length`` characters or more, or with duplicate ranks."""
+    if min_length is None:
+        min_length = get_config()['REBALANCE_LENGTH']
+    return list(
+        Task.objects.order_by()
+        .values('board_id', 'status')
+        .annotate(longest=Max(Length('rank')), tasks=Count('id'), ranks=Count('rank', distinct=True))
+        .filter(Q(longest__gte=min_length) | Q(tasks__gt=F('ranks')))
+        .values_list('board_id', 'status')
+    )
+
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _rebalance_in_background(board_id, status):
+    try:
+        rebalance(board_id, status)
+    except Exception:
+        logger.exception(f"Error rebalancing ranks of board {board_id} / {status}")
+    finally:
+        with _pending_lock:
+            _pending.discard((board_id, status))
+        connection.close()
+
+
+def _start(board_id, status):
+    with _pending_lock:
+        if (board_id, status) in _pending:
+            return
+        _pending.add((board_id, status))
+    threading.Thread(target=_rebalance_in_background, args=(board_id, status), daemon=True).start()
+
+
+def rebalance_if_crowded(board_id, status, rank):
+    """Once the surrounding transaction commits, rebalance the column if ``rank`` got too long."""
+    config = get_config()
+    if config['BACKGROUND_REBALANCE'] and len(rank) >= config['REBALANCE_LENGTH']:
+        transaction.on_commit(lambda: _start(board_id, status))
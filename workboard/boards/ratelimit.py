@@ -0,0 +1,324 @@
+# boards/ratelimit.py
+"""
+Sliding-window rate limits, shared by every worker, exposed as DRF throttles.
+
+Each limit (``RATES``, e.g. ``'5/5m'``) counts hits in fixed windows of its
+period and estimates the sliding window from the current and previous one:
+``previous * (share of the previous window still covered) + current``. A hit is
+one atomic increment of the current window's counter followed by a read of the
+previous one, so concurrent requests can never all squeeze under the limit the
+way a read-then-write counter lets them.
+
+Counters live in ``STORE``, or ``STORES[scope]`` for a given throttle scope:
+
+* ``'database'`` (default): ``RateLimitCounter`` rows incremented with an
+  ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` upsert, so every worker
+  shares one budget without extra infrastructure;
+* ``'cache'``: the ``CACHE_ALIAS`` Django cache, through ``add``/``incr``;
+  these are atomic on Redis and Memcached (and within one process on
+  ``LocMemCache``, which is not shared between workers);
+* ``'local'``: process-local counters.
+
+Writes default to the cache store: a database counter costs each write a
+second trip through the SQLite write lock, which doubled the median latency
+of ``PATCH /api/tasks/<id>/status/`` in ``benchmark_db_writes`` (42 to 82 ms).
+Point ``CACHE_ALIAS`` at Redis or Memcached to share that budget too.
+
+When the store fails (database or cache unreachable), the limiter logs a
+warning and falls back to the process-local counters, so limits keep holding
+per worker instead of failing open or taking the endpoint down.
+
+Configured with ``settings.RATE_LIMITS``.
+"""
+import logging
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.throttling import BaseThrottle
+
+from .models import RateLimitCounter
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'STORE': 'database',
+    'CACHE_ALIAS': 'default',
+    'DATABASE_ALIAS': 'default',
+    'KEY_PREFIX': 'ratelimit',
+    # Share of database hits that also delete expired counters.
+    'PRUNE_PROBABILITY': 0.01,
+    # scope -> store, for scopes that should not use STORE.
+    'STORES': {
+        'writes': 'cache',
+    },
+    # scope -> "<requests>/<period>", periods like s, m, 5m, h, 12h, d; None disables.
+    'RATES': {
+        'login': '5/5m',
+        'signup': '10/h',
+        'writes': '600/m',
+    },
+}
+
+RATE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+# Counters kept by each process' local store.
+LOCAL_MAX_ENTRIES = 10000
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, 'RATE_LIMITS', {})}
+    config['RATES'] = {**DEFAULTS['RATES'], **config['RATES']}
+    config['STORES'] = {**DEFAULTS['STORES'], **config['STORES']}
+    return config
+
+
+def parse_rate(rate):
+    """``'5/5m'`` -> ``(5, 300)``: requests allowed per period in seconds."""
+    match = RATE.match(rate.replace(' ', ''))
+    if match is None:
+        raise ValueError(f'Invalid rate {rate!r}; expected e.g. "5/5m", "100/h".')
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * PERIODS[unit]
+
+
+class LocalStore:
+    """Bounded, thread-safe window counters of this process."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counts = OrderedDict()
+
+    def incr(self, key, ttl):
+        now = time.time()
+        with self._lock:
+            count, expires_at = self._counts.get(key, (0, 0))
+            if expires_at < now:
+                count = 0
+            self._counts[key] = (count + 1, now + ttl)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+            return count + 1
+
+    def get(self, key):
+        with self._lock:
+            count, expires_at = self._counts.get(key, (0, 0))
+        return count if expires_at >= time.time() else 0
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._counts.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+class CacheStore:
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def incr(self, key, ttl):
+        self.cache.add(key, 0, timeout=ttl)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr().
+            self.cache.add(key, 1, timeout=ttl)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def delete(self, keys):
+        self.cache.delete_many(keys)
+
+
+class DatabaseStore:
+    def __init__(self, alias, prune_probability):
+        self.alias = alias
+        self.prune_probability = prune_probability
+
+    def _names(self, connection):
+        quote = connection.ops.quote_name
+        return quote(RateLimitCounter._meta.db_table), quote('key'), quote('count'), quote('expires_at')
+
+    def incr(self, key, ttl):
+        connection = connections[self.alias]
+        table, key_column, count_column, expires_column = self._names(connection)
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            if random.random() < self.prune_probability:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE {expires_column} < %s",
+                    [connection.ops.adapt_datetimefield_value(now)],
+                )
+            cursor.execute(
+                f"INSERT INTO {table} ({key_column}, {count_column}, {expires_column}) VALUES (%s, 1, %s) "
+                f"ON CONFLICT ({key_column}) DO UPDATE SET {count_column} = {table}.{count_column} + 1 "
+                f"RETURNING {count_column}",
+                [key, connection.ops.adapt_datetimefield_value(now + timedelta(seconds=ttl))],
+            )
+            return cursor.fetchone()[0]
+
+    def get(self, key):
+        connection = connections[self.alias]
+        table, key_column, count_column, _ = self._names(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {count_column} FROM {table} WHERE {key_column} = %s", [key])
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def delete(self, keys):
+        connection = connections[self.alias]
+        table, key_column, _, _ = self._names(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {key_column} IN ({', '.join(['%s'] * len(keys))})", list(keys))
+
+
+local_store = LocalStore(LOCAL_MAX_ENTRIES)
+
+
+def get_store(config=None, name=None):
+    config = config or get_config()
+    name = name or config['STORE']
+    if name == 'database':
+        return DatabaseStore(config['DATABASE_ALIAS'], config['PRUNE_PROBABILITY'])
+    if name == 'cache':
+        return CacheStore(config['CACHE_ALIAS'])
+    return local_store
+
+
+def _call(store, method, *args):
+    try:
+        return getattr(store, method)(*args)
+    except Exception as e:
+        if store is local_store:
+            raise
+        logger.warning(f"Rate limit store {type(store).__name__} failed, using process-local counters: {str(e)}")
+        return getattr(local_store, method)(*args)
+
+
+def _window_keys(config, key, period, now):
+    index = int(now // period)
+    prefix = f"{config['KEY_PREFIX']}:{key}:{period}"
+    return f'{prefix}:{index}', f'{prefix}:{index - 1}', now - index * period
+
+
+def hit(key, rate, now=None, store=None):
+    """
+    Count one request for ``key`` against ``rate`` and return
+    ``(allowed, wait)``, where ``wait`` is the number of seconds until the
+    sliding-window estimate falls back under the limit (0 when allowed).
+    ``store`` names the store to count in (default: ``STORE``).
+    """
+    config = get_config()
+    limit, period = parse_rate(rate)
+    now = time.time() if now is None else now
+    current_key, previous_key, elapsed = _window_keys(config, key, period, now)
+    store = get_store(config, store)
+    # Counters live for two periods: as the current window, then the previous one.
+    current = _call(store, 'incr', current_key, 2 * period)
+    previous = _call(store, 'get', previous_key)
+    if previous * (period - elapsed) / period + current <= limit:
+        return True, 0
+    if current >= limit:
+        # Wait for the next window, then for this window's share of the
+        # estimate to shrink enough to admit one more request.
+        return False, period - elapsed + period * max(0.0, 1 - (limit - 1) / current)
+    # Wait for the previous window's share to shrink enough.
+    return False, max(0.0, period * (1 - (limit - current - 1) / previous) - elapsed)
+
+
+def reset(key, rate, store=None):
+    """Forget the requests counted for ``key`` (e.g. after a successful login)."""
+    config = get_config()
+    _, period = parse_rate(rate)
+    current_key, previous_key, _ = _window_keys(config, key, period, time.time())
+    _call(get_store(config, store), 'delete', [current_key, previous_key])
+
+
+class RateLimited(exceptions.Throttled):
+    """429 with the ``{'error': ...}`` body the frontend displays, plus ``Retry-After``."""
+
+    def __init__(self, wait=None, message='Too many requests. Please try again later.'):
+        super().__init__(wait)
+        self.detail = {'error': message, 'retry_after': math.ceil(wait) if wait is not None else None}
+
+
+class RateLimitedViewMixin:
+    """Raises ``RateLimited`` (with ``throttle_message``) when a throttle refuses the request."""
+    throttle_message = 'Too many requests. Please try again later.'
+
+    def throttled(self, request, wait):
+        raise RateLimited(wait, self.throttle_message)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    DRF throttle counting requests of one client per ``scope`` with the rate in
+    ``RATE_LIMITS['RATES'][scope]`` (and the store in ``STORES[scope]``). Clients are authenticated users, or the
+    address from ``get_ident`` (``NUM_PROXIES``-aware ``X-Forwarded-For``).
+    """
+    scope = None
+    methods = None
+
+    def get_rate(self):
+        return get_config()['RATES'].get(self.scope)
+
+    def get_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'{self.scope}:user:{request.user.pk}'
+        return f'{self.scope}:ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        rate = self.get_rate()
+        if not rate or not get_config()['ENABLED']:
+            return True
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        allowed, self.wait_seconds = hit(self.get_key(request), rate, store=get_config()['STORES'].get(self.scope))
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+    def reset(self, request):
+        rate = self.get_rate()
+        if rate and get_config()['ENABLED']:
+            reset(self.get_key(request), rate, store=get_config()['STORES'].get(self.scope))
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Login attempts per address; ``LoginView`` resets the count after a successful login."""
+    scope = 'login'
+
+    def get_key(self, request):
+        return f'{self.scope}:ip:{self.get_ident(request)}'
+
+
+class SignUpRateThrottle(SlidingWindowThrottle):
+    scope = 'signup'
+
+    def get_key(self, request):
+        return f'{self.scope}:ip:{self.get_ident(request)}'
+
+
+class WriteRateThrottle(SlidingWindowThrottle):
+    """Writes (POST/PUT/PATCH/DELETE) per user; reads are not counted."""
+    scope = 'writes'
+    methods = ('POST', 'PUT', 'PATCH', 'DELETE')
@@ -0,0 +1,315 @@
+# boards/realtime.py
+"""
+Per-board push channel for task changes.
+
+Views publish small task deltas with ``publish_task_event``; websocket clients
+connected to ``/ws/boards/<id>/`` receive them as JSON frames. A client
+authenticates with its first frame, ``{"token": "<key>"}``, within
+``AUTH_TIMEOUT`` seconds, so the key never appears in a URL or an access log.
+The token is checked again (through the token cache of
+``boards.authentication``) before each event is sent, the user's access to
+the board at most every ``ACCESS_RECHECK`` seconds; a socket that lost either
+is closed (4401/4403).
+
+Delivery goes through a broker chosen by ``settings.BOARD_EVENTS_BROKER``.
+``InProcessBroker`` fans events out to subscribers living in the same process,
+which is enough for a single ASGI worker. ``PostgresBroker`` (the default on
+PostgreSQL) relays ``publish`` through LISTEN/NOTIFY and hands incoming
+messages to a local ``InProcessBroker`` in every worker, so several workers
+can serve the sockets of one board.
+"""
+import asyncio
+import json
+import logging
+import re
+import select
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import CachedTokenAuthentication
+from .models import Board
+from .serializers import TaskSerializer
+
+logger = logging.getLogger(__name__)
+
+TASK_CREATED = 'task.created'
+TASK_UPDATED = 'task.updated'
+TASK_STATUS_CHANGED = 'task.status_changed'
+TASK_DELETED = 'task.deleted'
+
+BOARD_EVENTS_PATH = re.compile(r'^/ws/boards/(?P<board_id>\d+)/$')
+
+# Seconds a new socket has to send its token.
+AUTH_TIMEOUT = 10
+# Seconds between checks that a connected user can still see the board.
+ACCESS_RECHECK = 5
+
+
+class Subscription:
+    """A single websocket's queue of pending events."""
+
+    def __init__(self, broker, board_id, maxsize=100):
+        self.broker = broker
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        # Runs on the subscriber's loop. A client that cannot keep up loses its
+        # backlog and is told to refetch the board instead.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'type': 'board.resync', 'board': self.board_id})
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    """Interface every board event broker implements."""
+
+    def publish(self, board_id, event):
+        raise NotImplementedError
+
+    def subscribe(self, board_id):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    """Fan events out to the subscribers of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def publish(self, board_id, event):
+        # Safe to call from sync views running in worker threads: delivery is
+        # scheduled on each subscriber's own event loop.
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(board_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has already shut down.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, board_id):
+        subscription = Subscription(self, board_id)
+        with self._lock:
+            self._subscriptions.setdefault(board_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.board_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.board_id]
+
+
+class PostgresBroker(BaseBroker):
+    """
+    Relay events between worker processes with PostgreSQL LISTEN/NOTIFY on the
+    default database. Each process listens on a connection of its own, opened
+    by a background thread on the first subscription.
+    """
+    channel = 'board_events'
+    # NOTIFY payloads must stay under 8000 bytes; bigger events become a resync.
+    max_payload = 7900
+
+    def __init__(self):
+        self.local = InProcessBroker()
+        self.listening = threading.Event()
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def publish(self, board_id, event):
+        payload = json.dumps({'board': board_id, 'event': event})
+        if len(payload.encode()) > self.max_payload:
+            payload = json.dumps({'board': board_id, 'event': {'type': 'board.resync', 'board': board_id}})
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def subscribe(self, board_id):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='board-events', daemon=True)
+                self._listener.start()
+        return self.local.subscribe(board_id)
+
+    def unsubscribe(self, subscription):
+        self.local.unsubscribe(subscription)
+
+    def _relay(self, payload):
+        message = json.loads(payload)
+        self.local.publish(message['board'], message['event'])
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception as e:
+                logger.error(f"Board events listener failed, reconnecting: {str(e)}")
+            self.listening.clear()
+            time.sleep(1)
+
+    def _listen_once(self):
+        # A connection outside Django's (and outside DB_POOL): it is held for good.
+        wrapper = connections.create_connection(DEFAULT_DB_ALIAS)
+        raw = wrapper.Database.connect(**wrapper.get_connection_params())
+        try:
+            raw.autocommit = True
+            raw.cursor().execute(f'LISTEN {self.channel}')
+            self.listening.set()
+            if callable(raw.notifies):
+                # psycopg 3
+                for notify in raw.notifies():
+                    self._relay(notify.payload)
+            else:
+                # psycopg2
+                while True:
+                    if select.select([raw], [], [], 60)[0]:
+                        raw.poll()
+                        while raw.notifies:
+                            self._relay(raw.notifies.pop(0).payload)
+        finally:
+            raw.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_path = getattr(settings, 'BOARD_EVENTS_BROKER', 'boards.realtime.InProcessBroker')
+                _broker = import_string(broker_path)()
+    return _broker
+
+
+def publish_task_event(event_type, task, data=None):
+    """
+    Broadcast ``event_type`` for ``task`` to everyone watching its board once
+    the current transaction commits.
+
+    The payload is captured immediately, so deletes must be published before
+    the row is deleted. Callers that already serialized the task can pass
+    ``data`` to skip doing it again.
+    """
+    board_id = task.board_id
+    if event_type == TASK_DELETED:
+        data = {'id': task.pk}
+    elif data is None:
+        data = TaskSerializer(task).data
+    event = json.loads(json.dumps({'type': event_type, 'board': board_id, 'task': data}, cls=DjangoJSONEncoder))
+
+    def send():
+        try:
+            get_broker().publish(board_id, event)
+        except Exception as e:
+            logger.error(f"Error publishing {event_type} for board {board_id}: {str(e)}")
+
+    transaction.on_commit(send)
+
+
+def _token_key(message):
+    # The key from an authentication frame, ``{"token": "<key>"}``.
+    try:
+        data = json.loads(message.get('text') or '')
+    except ValueError:
+        return None
+    token_key = data.get('token') if isinstance(data, dict) else None
+    return token_key if isinstance(token_key, str) else None
+
+
+def _can_view_board(user, board_id):
+    return Board.objects.visible_to(user).filter(id=board_id).exists()
+
+
+async def _refusal(token_key, board_id, check_access=True):
+    """The close code for a socket ``token_key`` may not hold on ``board_id``, else None."""
+    try:
+        # Unknown, deleted and inactive users' tokens all fail here.
+        user, _ = await CachedTokenAuthentication().aauthenticate_credentials(token_key)
+    except AuthenticationFailed:
+        return 4401
+    if check_access and not await sync_to_async(_can_view_board)(user, board_id):
+        return 4403
+    return None
+
+
+async def board_events(scope, receive, send):
+    """ASGI websocket application streaming one board's task events."""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    match = BOARD_EVENTS_PATH.match(scope['path'])
+    if match is None:
+        await send({'type': 'websocket.close', 'code': 4404})
+        return
+    board_id = int(match.group('board_id'))
+
+    # Frames can only be read once the socket is accepted.
+    await send({'type': 'websocket.accept'})
+    try:
+        message = await asyncio.wait_for(receive(), AUTH_TIMEOUT)
+    except asyncio.TimeoutError:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    if message['type'] == 'websocket.disconnect':
+        return
+    token_key = _token_key(message)
+    refusal = await _refusal(token_key, board_id) if token_key else 4401
+    if refusal is not None:
+        await send({'type': 'websocket.close', 'code': refusal})
+        return
+
+    subscription = get_broker().subscribe(board_id)
+    recheck_at = time.monotonic() + ACCESS_RECHECK
+    next_message = asyncio.ensure_future(receive())
+    next_event = asyncio.ensure_future(subscription.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_message, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event in done:
+                # Logged out, deactivated or taken off the board since connecting?
+                check_access = time.monotonic() >= recheck_at
+                refusal = await _refusal(token_key, board_id, check_access)
+                if check_access:
+                    recheck_at = time.monotonic() + ACCESS_RECHECK
+                if refusal is not None:
+                    await send({'type': 'websocket.close', 'code': refusal})
+                    break
+                await send({'type': 'websocket.send', 'text': json.dumps(next_event.result())})
+                next_event = asyncio.ensure_future(subscription.get())
+            if next_message in done:
+                if next_message.result()['type'] == 'websocket.disconnect':
+                    break
+                # Clients only listen; anything they send is ignored.
+                next_message = asyncio.ensure_future(receive())
+    finally:
+        next_message.cancel()
+        next_event.cancel()
+        subscription.close()
@@ -0,0 +1,197 @@
+# boards/renderers.py
+"""
+API renderers, and streaming for long lists.
+
+* ``JSONRenderer`` writes the same bytes as DRF's, through orjson when it is
+  installed (``JSON_ENCODER``): compact UTF-8, dates and other non-JSON types
+  through DRF's encoder, U+2028/U+2029 escaped. Requests asking for an
+  ``indent`` get DRF's renderer.
+* ``MessagePackRenderer`` answers ``Accept: application/msgpack`` when the
+  msgpack package is installed. A streamed list is a sequence of packed rows
+  (read it with ``msgpack.Unpacker``), not one array: an array header would
+  need the row count before the first row, from a query that cannot see the
+  same rows as the one being streamed.
+* ``NDJSONRenderer`` answers ``Accept: application/x-ndjson`` on the board
+  export endpoints.
+
+``stream_list`` renders the unpaginated task list and a user's assignments:
+lists shorter than ``STREAM_MIN_ROWS`` get a plain ``Response`` as before;
+longer ones a ``StreamingHttpResponse`` that reads the queryset with
+``.iterator()`` and renders ``STREAM_CHUNK_SIZE`` rows at a time, so a worker
+holds at most ``STREAM_MIN_ROWS`` rendered rows and one chunk of bytes instead
+of the whole payload. Streamed lists keep their ``ETag`` but skip the response cache.
+
+Configured with ``settings.API_RENDERING``.
+"""
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import renderers
+from rest_framework.response import Response
+from rest_framework.utils import encoders
+
+from . import fast_serializers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+DEFAULTS = {
+    # 'orjson' (used when installed) or 'json'.
+    'JSON_ENCODER': 'orjson',
+    # Lists with at least this many rows are streamed; None never streams.
+    'STREAM_MIN_ROWS': 1000,
+    'STREAM_CHUNK_SIZE': 500,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'API_RENDERING', {})}
+
+
+_encode_default = encoders.JSONEncoder().default
+
+
+def _escape_line_separators(content):
+    # As DRF does: these are valid JSON but end JavaScript string literals.
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+def dumps(data):
+    """Compact UTF-8 JSON of ``data``, byte for byte as DRF's ``JSONRenderer`` writes it."""
+    if orjson is not None and get_config()['JSON_ENCODER'] == 'orjson':
+        content = orjson.dumps(
+            data, default=_encode_default,
+            # Datetimes through DRF's encoder, for its 'Z' suffix.
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    else:
+        content = json.dumps(
+            data, cls=encoders.JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+        ).encode()
+    return _escape_line_separators(content)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+    def render_stream(self, chunks):
+        """A JSON array from ``chunks`` (lists of rows), one piece of bytes per chunk."""
+        yield b'['
+        separator = b''
+        for rows in chunks:
+            yield separator + dumps(rows)[1:-1]
+            separator = b','
+        yield b']'
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encode_default)
+
+    def render_stream(self, chunks):
+        """One packed object per row, one piece of bytes per chunk."""
+        packer = msgpack.Packer(default=_encode_default)
+        for rows in chunks:
+            yield b''.join(packer.pack(row) for row in rows)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """``Accept: application/x-ndjson`` for board archives (``boards.archive``); errors are one line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data) + b'\n'
+
+
+async def _aiter(iterator):
+    # Under ASGI a sync iterator would be read to the end before the first
+    # byte is sent; pull one piece at a time on the request's sync thread,
+    # where its database cursor lives.
+    next_piece = sync_to_async(next)
+    while (piece := await next_piece(iterator, None)) is not None:
+        yield piece
+
+
+def stream_list(request, queryset, serializer_class, context=None):
+    """
+    ``Response`` or ``StreamingHttpResponse`` with ``serializer_class``'s
+    representation of every row of ``queryset``, rendered by its fast
+    serializer (``boards.fast_serializers``) when it has one.
+    """
+    config = get_config()
+    context = {} if context is None else context
+    renderer = getattr(request, 'accepted_renderer', None)
+    fast = fast_serializers.for_serializer(serializer_class, context)
+    min_rows = config['STREAM_MIN_ROWS']
+    if min_rows is None or not hasattr(renderer, 'render_stream'):
+        if fast is not None:
+            return Response(list(fast.iterate(queryset)))
+        return Response(serializer_class(queryset, many=True, context=context).data)
+
+    chunk_size = config['STREAM_CHUNK_SIZE']
+    # Pin the database now: the rows are read after the view returned, once
+    # its replica routing (boards.replicas) is over.
+    queryset = queryset.using(queryset.db)
+    if fast is not None:
+        representations = fast.iterate(queryset, chunk_size)
+    else:
+        serializer = serializer_class(context=context)
+        representations = (serializer.to_representation(row) for row in queryset.iterator(chunk_size=chunk_size))
+    head = list(islice(representations, min_rows))
+    if len(head) < min_rows:
+        return Response(head)
+
+    def chunks():
+        for start in range(0, len(head), chunk_size):
+            yield head[start:start + chunk_size]
+        head.clear()
+        while batch := list(islice(representations, chunk_size)):
+            yield batch
+
+    content = renderer.render_stream(chunks())
+    if isinstance(request._request, ASGIRequest):
+        content = _aiter(content)
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f'{content_type}; charset={renderer.charset}'
+    return StreamingHttpResponse(content, content_type=content_type)
+
+
+class StreamingListMixin:
+    """Viewset mixin sending unpaginated lists through ``stream_list``."""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return stream_list(request, queryset, self.get_serializer_class(), self.get_serializer_context())
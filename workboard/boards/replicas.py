@@ -0,0 +1,188 @@
+# boards/replicas.py
+"""
+Read-replica routing for the read-only API traffic.
+
+With replicas configured (``DATABASE_REPLICA_URLS``, see
+``workboard/database.py``), ``GET``/``HEAD``/``OPTIONS`` requests to the
+board, task and user endpoints (views using ``ReplicaReadMixin``, and the
+async views) run their queries on a randomly picked replica. Every other
+request, and every write, uses ``default``. Authentication and permission
+checks run before the switch, on the primary, so a token issued a moment ago
+is always found.
+
+Replicas lag behind the primary. So that users see their own changes,
+``ReplicaPinMiddleware`` pins the user behind any successful unsafe request to
+the primary for ``PIN_SECONDS``, which should exceed the replication lag.
+The pin travels with the client as a signed cookie (``COOKIE_NAME``), so any
+worker can read it. For clients that drop cookies, ``CACHE_ALIAS`` can name
+a cache every worker shares (e.g. Redis) to hold the pins as well.
+
+Configured with ``settings.DATABASE_REPLICAS``.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULTS = {
+    # Database aliases safe reads are spread over; none means no routing.
+    'ALIASES': [],
+    'PIN_SECONDS': 5,
+    'COOKIE_NAME': 'replica_pin',
+    # Optional cache alias shared by all workers; a per-process cache would
+    # only pin the user in the worker that saw the write.
+    'CACHE_ALIAS': None,
+    'KEY_PREFIX': 'replica_pin',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'DATABASE_REPLICAS', {})}
+
+
+_reading = ContextVar('replica_reading', default=None)
+
+
+def reading_alias():
+    """The replica the current context reads from, or None for the primary."""
+    return _reading.get()
+
+
+@contextmanager
+def reading_from(alias):
+    token = _reading.set(alias)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def _pin_key(config, user_id):
+    return f"{config['KEY_PREFIX']}:{user_id}"
+
+
+def pin(user_id, response=None):
+    """
+    Send ``user_id``'s reads to the primary for the next ``PIN_SECONDS``,
+    through a cookie on ``response`` and, if configured, the shared cache.
+    """
+    config = get_config()
+    if not config['ALIASES'] or config['PIN_SECONDS'] <= 0:
+        return
+    if response is not None:
+        response.set_signed_cookie(
+            config['COOKIE_NAME'], str(user_id), salt=config['KEY_PREFIX'],
+            max_age=config['PIN_SECONDS'], httponly=True, samesite='Lax',
+        )
+    if config['CACHE_ALIAS']:
+        caches[config['CACHE_ALIAS']].set(_pin_key(config, user_id), True, timeout=config['PIN_SECONDS'])
+
+
+def _pinned_by_cookie(config, request, user):
+    # The signature's timestamp bounds the pin even if the client keeps the
+    # cookie longer; a cookie of another user does not pin this one.
+    pinned = request.get_signed_cookie(
+        config['COOKIE_NAME'], default=None, salt=config['KEY_PREFIX'], max_age=config['PIN_SECONDS'],
+    )
+    return pinned == str(user.pk)
+
+
+def replica_for(request):
+    """The alias the queries of ``request`` may read from, or None for the primary."""
+    config = get_config()
+    if not config['ALIASES'] or request.method not in SAFE_METHODS:
+        return None
+    user = request.user
+    if user.is_authenticated:
+        if _pinned_by_cookie(config, request, user):
+            return None
+        if config['CACHE_ALIAS'] and caches[config['CACHE_ALIAS']].get(_pin_key(config, user.pk)):
+            return None
+    return random.choice(config['ALIASES'])
+
+
+async def areplica_for(request):
+    config = get_config()
+    if not config['ALIASES'] or request.method not in SAFE_METHODS:
+        return None
+    user = request.user
+    if user.is_authenticated:
+        if _pinned_by_cookie(config, request, user):
+            return None
+        if config['CACHE_ALIAS'] and await caches[config['CACHE_ALIAS']].aget(_pin_key(config, user.pk)):
+            return None
+    return random.choice(config['ALIASES'])
+
+
+class ReplicaRouter:
+    """Reads go where ``reading_from`` says (the primary by default), writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _reading.get()
+
+    def db_for_write(self, model, **hints):
+        # Objects read from a replica are saved to the primary.
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary.
+        return False if db in get_config()['ALIASES'] else None
+
+
+class ReplicaReadMixin:
+    """Runs a view's queries on a replica for safe requests of users not pinned to the primary."""
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        alias = replica_for(request)
+        if alias is not None:
+            self._replica_token = _reading.set(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            _reading.reset(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaPinMiddleware:
+    """Pins the user behind a successful unsafe request to the primary."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _pin_writer(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400 or not get_config()['ALIASES']:
+            return
+        # DRF copies the user it authenticated onto the underlying request.
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            pin(user.pk, response)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            await sync_to_async(self._pin_writer)(request, response)
+        return response
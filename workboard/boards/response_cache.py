@@ -0,0 +1,91 @@
+# boards/response_cache.py
+"""
+Cache of serialized board and task payloads.
+
+Entries are keyed by the validators ``ConditionalRequestMixin`` already
+computes for every read: the object's ``updated_at`` and board ``version``
+for single objects, and the viewer plus ``COUNT``/``MAX(updated_at)``/
+``SUM(version)`` over the visible set for lists. Any change to a board, one of
+its tasks or a user it references (see ``boards.signals``) moves those
+validators, so a stale payload is never looked up again and simply ages out
+after ``TIMEOUT`` seconds. Nothing has to be deleted explicitly.
+
+Configured with ``settings.BOARD_RESPONSE_CACHE``.
+"""
+import hashlib
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULTS = {
+    'ENABLED': True,
+    # Django cache alias the payloads are stored in.
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'KEY_PREFIX': 'board_payload',
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'BOARD_RESPONSE_CACHE', {})}
+
+
+class CacheStats:
+    """Per-process hit/miss counters, broken down by payload kind."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def record(self, kind, hit):
+        with self._lock:
+            self._counts[(kind, 'hits' if hit else 'misses')] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        stats = {}
+        for (kind, outcome), value in counts.items():
+            stats.setdefault(kind, {'hits': 0, 'misses': 0})[outcome] = value
+        for kind_stats in stats.values():
+            total = kind_stats['hits'] + kind_stats['misses']
+            kind_stats['hit_ratio'] = round(kind_stats['hits'] / total, 4) if total else 0.0
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = CacheStats()
+
+
+def make_key(kind, *parts):
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"{get_config()['KEY_PREFIX']}:{kind}:{digest}"
+
+
+def get_or_build(kind, key_parts, build):
+    """
+    Return ``(payload, hit)`` for ``key_parts``, calling ``build()`` and storing
+    its result on a miss. ``build`` returns ``None`` for payloads that must not
+    be cached (e.g. error responses).
+    """
+    config = get_config()
+    if not config['ENABLED']:
+        return build(), False
+
+    cache = caches[config['ALIAS']]
+    key = make_key(kind, *key_parts)
+    payload = cache.get(key)
+    if payload is not None:
+        stats.record(kind, hit=True)
+        return payload, True
+
+    stats.record(kind, hit=False)
+    payload = build()
+    if payload is not None:
+        cache.set(key, payload, timeout=config['TIMEOUT'])
+    return payload, False
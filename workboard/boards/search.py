@@ -0,0 +1,257 @@
+# boards/search.py
+"""
+Full-text search over board names/descriptions and task titles/descriptions,
+behind ``GET /api/search/?q=``.
+
+The index lives in the database and is maintained by the database itself, so
+every write path (serializer saves, ``bulk_create``, ``update()``, cascades)
+keeps it current without application code:
+
+* SQLite: one FTS5 table per model (``boards_board_fts``, ``boards_task_fts``)
+  using the model table as external content, kept in step by ``AFTER
+  INSERT/UPDATE OF/DELETE`` triggers. Results are ranked with ``bm25``.
+* PostgreSQL: a GIN index on the weighted ``tsvector`` expression of each
+  table; queries use the same expression, so the planner answers ``@@`` from
+  the index. Results are ranked with ``ts_rank``.
+
+Titles/names weigh more than descriptions. Every word of the query must match,
+and words of ``MIN_PREFIX`` characters or more match as prefixes (``"des"``
+finds "design"); shorter ones only match whole words, since ranking a prefix
+like ``"de"`` means scoring a large part of the table.
+
+On other databases, or a SQLite build without FTS5, search falls back to
+``icontains`` filters ordered by recency.
+
+SQLite drops triggers when Django rebuilds a table during a migration, so
+``ensure_index`` runs after every ``migrate`` and rebuilds the index if it had
+to recreate anything.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Board, Task
+
+TOKEN = re.compile(r'\w+')
+MAX_TERMS = 8
+MIN_PREFIX = 3
+
+# Relative weight of the title/name column over the description in bm25.
+SQLITE_WEIGHTS = (4.0, 1.0)
+
+SQLITE_TABLES = {
+    # fts table: (content table, title column)
+    'boards_board_fts': ('boards_board', 'name'),
+    'boards_task_fts': ('boards_task', 'title'),
+}
+
+POSTGRES_VECTORS = {
+    'boards_board': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+    'boards_task': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+}
+
+
+def _sqlite_statements(fts, table, title):
+    insert = f"INSERT INTO {fts}(rowid, {title}, description) VALUES (new.id, new.{title}, new.description);"
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {title}, description) "
+        f"VALUES ('delete', old.id, old.{title}, old.description);"
+    )
+    return {
+        'table': (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{title}, description, content='{table}', content_rowid='id', "
+            f"tokenize='porter unicode61', prefix='3')"
+        ),
+        f'{fts}_ai': f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f'{fts}_ad': f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f'{fts}_au': (
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {title}, description ON {table} "
+            f"BEGIN {delete} {insert} END"
+        ),
+    }
+
+
+def _sqlite_has_fts5(cursor):
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    if cursor.fetchone()[0]:
+        return True
+    # Builds can also load FTS5 without advertising the compile option.
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        cursor.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except Exception:
+        return False
+
+
+def ensure_index(using='default'):
+    """
+    Create whatever part of the search index is missing on ``using``.
+    Returns True when something was (re)created, after rebuilding its content.
+    """
+    connection = connections[using]
+    created = False
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            if not _sqlite_has_fts5(cursor):
+                return False
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            existing = {row[0] for row in cursor.fetchall()}
+            for fts, (table, title) in SQLITE_TABLES.items():
+                missing = {
+                    name: sql for name, sql in _sqlite_statements(fts, table, title).items()
+                    if (fts if name == 'table' else name) not in existing
+                }
+                for sql in missing.values():
+                    cursor.execute(sql)
+                if missing:
+                    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                    created = True
+        elif connection.vendor == 'postgresql':
+            for table, vector in POSTGRES_VECTORS.items():
+                cursor.execute(f"SELECT to_regclass('{table}_search_idx')")
+                if cursor.fetchone()[0] is None:
+                    cursor.execute(f"CREATE INDEX {table}_search_idx ON {table} USING GIN (({vector}))")
+                    created = True
+    return created
+
+
+def drop_index(using='default'):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for fts in SQLITE_TABLES:
+                for suffix in ('ai', 'ad', 'au'):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+        elif connection.vendor == 'postgresql':
+            for table in POSTGRES_VECTORS:
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_search_idx")
+
+
+def rebuild_index(using='default'):
+    """Recompute the SQLite FTS tables from their content tables (PostgreSQL indexes need no rebuild)."""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for fts in SQLITE_TABLES:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+_indexed = set()
+
+
+def _has_index(connection):
+    if connection.alias in _indexed:
+        return True
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE name IN (%s, %s)", list(SQLITE_TABLES)
+            )
+            found = cursor.fetchone()[0] == len(SQLITE_TABLES)
+        elif connection.vendor == 'postgresql':
+            found = True
+        else:
+            found = False
+    if found:
+        _indexed.add(connection.alias)
+    return found
+
+
+def terms(query):
+    """The words of a user query, lower-cased; at most ``MAX_TERMS``."""
+    return TOKEN.findall((query or '').lower())[:MAX_TERMS]
+
+
+def _visible(queryset, outer_id):
+    # Correlated EXISTS check of the matching row against the visibility
+    # rules: one primary-key probe per hit instead of materializing every
+    # visible row first.
+    return queryset.order_by().filter(pk=RawSQL(outer_id, ())).values('pk').query.sql_with_params()
+
+
+def _sqlite_search(cursor, words, boards, tasks, limit, offset):
+    match = ' '.join(f'"{word}"*' if len(word) >= MIN_PREFIX else f'"{word}"' for word in words)
+    weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+    board_sql, board_params = _visible(boards, 'boards_board_fts.rowid')
+    task_sql, task_params = _visible(tasks, 'boards_task_fts.rowid')
+    cursor.execute(
+        f"SELECT 'board', rowid, -bm25(boards_board_fts, {weights}) AS score FROM boards_board_fts "
+        f"WHERE boards_board_fts MATCH %s AND EXISTS ({board_sql}) "
+        f"UNION ALL "
+        f"SELECT 'task', rowid, -bm25(boards_task_fts, {weights}) AS score FROM boards_task_fts "
+        f"WHERE boards_task_fts MATCH %s AND EXISTS ({task_sql}) "
+        f"ORDER BY score DESC, 1, 2 LIMIT %s OFFSET %s",
+        [match, *board_params, match, *task_params, limit, offset],
+    )
+    return cursor.fetchall()
+
+
+def _postgres_search(cursor, words, boards, tasks, limit, offset):
+    query = ' & '.join(f'{word}:*' if len(word) >= MIN_PREFIX else word for word in words)
+    board_sql, board_params = _visible(boards, 'hit.id')
+    task_sql, task_params = _visible(tasks, 'hit.id')
+    board_vector, task_vector = POSTGRES_VECTORS['boards_board'], POSTGRES_VECTORS['boards_task']
+    cursor.execute(
+        f"SELECT 'board', hit.id, ts_rank({board_vector}, q) AS score "
+        f"FROM boards_board hit, to_tsquery('english', %s) q "
+        f"WHERE {board_vector} @@ q AND EXISTS ({board_sql}) "
+        f"UNION ALL "
+        f"SELECT 'task', hit.id, ts_rank({task_vector}, q) AS score "
+        f"FROM boards_task hit, to_tsquery('english', %s) q "
+        f"WHERE {task_vector} @@ q AND EXISTS ({task_sql}) "
+        f"ORDER BY score DESC, 1, 2 LIMIT %s OFFSET %s",
+        [query, *board_params, query, *task_params, limit, offset],
+    )
+    return cursor.fetchall()
+
+
+def _fallback_search(words, boards, tasks, limit, offset):
+    board_filter, task_filter = Q(), Q()
+    for word in words:
+        board_filter &= Q(name__icontains=word) | Q(description__icontains=word)
+        task_filter &= Q(title__icontains=word) | Q(description__icontains=word)
+    end = offset + limit
+    rows = [
+        ('board', pk, created_at)
+        for pk, created_at in boards.filter(board_filter).order_by('-created_at', 'id')
+        .values_list('pk', 'created_at')[:end]
+    ] + [
+        ('task', pk, created_at)
+        for pk, created_at in tasks.filter(task_filter).order_by('-created_at', 'id')
+        .values_list('pk', 'created_at')[:end]
+    ]
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return [(kind, pk, 0.0) for kind, pk, _ in rows[offset:end]]
+
+
+def search(user, query, limit=20, offset=0, using='default'):
+    """
+    Boards and tasks visible to ``user`` that match every word of ``query``,
+    best first. Returns a list of ``(kind, id, score)`` with kind ``'board'``
+    or ``'task'``.
+    """
+    words = terms(query)
+    if not words:
+        return []
+    boards = Board.objects.using(using).visible_to(user)
+    tasks = Task.objects.using(using).visible_to(user)
+    connection = connections[using]
+    if not _has_index(connection):
+        return _fallback_search(words, boards, tasks, limit, offset)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            rows = _sqlite_search(cursor, words, boards, tasks, limit, offset)
+        else:
+            rows = _postgres_search(cursor, words, boards, tasks, limit, offset)
+    return [(kind, pk, float(score)) for kind, pk, score in rows]
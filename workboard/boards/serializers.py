@@ -1,12 +1,50 @@
 # boards/serializers.py
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth import get_user_model
+from .instrumentation import TimedSerializerMixin
 from .models import Board, Task
 
 # Use get_user_model() to get the custom user model
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+
+def _split_param(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Let read requests trim the payload with ``?fields=id,name``.
+
+    When ``fields`` is given only those fields are rendered, plus any listed in
+    ``?expand=`` (e.g. ``?fields=id,name&expand=tasks``). Without ``fields`` the
+    full representation is returned. Only the top-level serializer is trimmed;
+    nested serializers always render in full.
+    """
+
+    def _is_root_serializer(self):
+        return self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self._is_root_serializer():
+            return fields
+
+        requested = _split_param(request.query_params.get('fields'))
+        if not requested:
+            return fields
+
+        keep = set(requested) | set(_split_param(request.query_params.get('expand')))
+        for name in list(fields):
+            if name not in keep:
+                fields.pop(name)
+        return fields
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
@@ -24,7 +62,7 @@ class UserSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("A user with this email already exists.")
         return value
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     assignee = UserSerializer(read_only=True)
     assignee_email = serializers.EmailField(
         write_only=True, 
@@ -37,9 +75,9 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ['id', 'title', 'description', 'status', 'assignee', 'assignee_email', 
+        fields = ['id', 'title', 'description', 'status', 'rank', 'assignee', 'assignee_email', 
                   'created_by', 'board', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
+        read_only_fields = ['id', 'rank', 'created_at', 'updated_at', 'created_by']
 
     def validate_board(self, value):
         user = self.context['request'].user
@@ -96,14 +134,19 @@ class TaskSerializer(serializers.ModelSerializer):
         validated_data['assignee'] = assignee
         return super().update(instance, validated_data)
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     tasks = TaskSerializer(many=True, read_only=True)
     owner = UserSerializer(read_only=True)
+    task_counts = serializers.SerializerMethodField()
 
     class Meta:
         model = Board
-        fields = ['id', 'name', 'description', 'tasks', 'owner', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'description', 'tasks', 'task_counts', 'owner', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at', 'owner']
+        field_prefetches = {'task_counts': ['task_counts']}
+
+    def get_task_counts(self, obj):
+        return obj.task_counts_by_status
 
     def create(self, validated_data):
         user = self.context['request'].user
@@ -125,6 +168,12 @@ class BoardSerializer(serializers.ModelSerializer):
         instance.save()
         
         return instance
+class BoardSummarySerializer(BoardSerializer):
+    """A board without its tasks, for listings that point at boards (e.g. search results)."""
+
+    class Meta(BoardSerializer.Meta):
+        fields = ['id', 'name', 'description', 'task_counts', 'owner', 'created_at', 'updated_at']
+
 class TaskStatusUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
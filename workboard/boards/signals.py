@@ -0,0 +1,115 @@
+# boards/signals.py
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import changelog, counters, search
+from .authentication import invalidate_token, invalidate_user
+from .models import Board, Task
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_tokens_of_changed_user(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login; anything else (password, is_active, ...)
+    # may change what a cached token should resolve to.
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    invalidate_user(instance)
+    # Cached board and task payloads embed the user; moving the versions of
+    # every board that references them retires those entries.
+    Board.objects.touch(Board.objects.referencing(instance).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    changelog._deleting_users.add(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    changelog._deleting_users.discard(instance.pk)
+
+
+# Boards being deleted in this process; their tasks are taken out of the
+# counters in one go by forget_deleted_board instead of one by one.
+_deleting_boards = set()
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_before_save(sender, instance, raw=False, **kwargs):
+    if raw or counters.is_suspended():
+        return
+    instance._counter_snapshot = None if instance._state.adding else counters.stored_snapshot(instance)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    if raw or counters.is_suspended():
+        return
+    before = getattr(instance, '_counter_snapshot', None)
+    after = counters.snapshot(instance)
+    counters.record_change(before, after)
+    Board.objects.touch([instance.board_id] + ([before.board_id] if before else []))
+    changelog.record_tasks([(instance.pk, 'created' if created else 'updated', before, after)])
+
+
+@receiver(pre_delete, sender=Task)
+def remember_task_before_delete(sender, instance, **kwargs):
+    # Runs inside the deletion's transaction, like pre_save inside Task.save's.
+    if instance.board_id in _deleting_boards or counters.is_suspended():
+        return
+    instance._counter_snapshot = counters.stored_snapshot(instance)
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    if instance.board_id in _deleting_boards or counters.is_suspended():
+        return
+    before = instance._counter_snapshot
+    if before is None:
+        # Someone else deleted the row first and counted it.
+        return
+    counters.record_change(before, None)
+    Board.objects.touch([instance.board_id])
+    changelog.record_tasks([(instance.pk, 'deleted', before, None)])
+
+
+@receiver(post_save, sender=Board)
+def log_saved_board(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        changelog.record_board(instance, 'created' if created else 'updated')
+
+
+@receiver(pre_delete, sender=Board)
+def forget_deleted_board(sender, instance, **kwargs):
+    counters.forget_board(instance)
+    _deleting_boards.add(instance.pk)
+    # Taken before the cascade removes the tasks that make assignees see the board.
+    instance._changelog_audience = changelog.board_audience(instance)
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    _deleting_boards.discard(instance.pk)
+    changelog.record_board(instance, 'deleted', users=getattr(instance, '_changelog_audience', None))
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, app_config, using, **kwargs):
+    # SQLite loses the FTS triggers whenever a migration rebuilds the boards or
+    # tasks table; put them back (and re-sync the index) once the search
+    # migration is in place.
+    if app_config.name != 'boards':
+        return
+    if ('boards', '0007_search_index') in MigrationRecorder(connections[using]).applied_migrations():
+        search.ensure_index(using)
@@ -0,0 +1,166 @@
+# boards/task_status.py
+"""
+Fast path behind ``PATCH /api/tasks/<id>/status/``, the drag-and-drop call.
+
+Instead of loading the task, its board and users and re-saving every column,
+a status change is one ``SELECT ... FOR UPDATE`` of the counter-relevant
+columns (joined to the board for the owner) followed by one conditional
+``UPDATE`` in the same transaction::
+
+    UPDATE boards_task SET status = %s, updated_at = %s
+    WHERE id = %s AND status = <status just read>
+      AND (<user owns the board> OR assignee_id = <user> OR created_by_id = <user>)
+
+The lock keeps what was read (status, and the assignee the counters are
+charged to) current until the ``UPDATE``: a concurrent move or reassignment of
+the same task waits for this one and then reads its result. Callers can pass
+the status they expect the task to have and get a conflict when it moved.
+
+``move_task`` (``POST /api/tasks/<id>/move/``) works the same way but also
+places the card between two neighbours of its target column, computing a rank
+between theirs (see ``boards.ranking``); the rest of the column is untouched.
+A plain status change puts the task at the bottom of its new column.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import changelog, counters, ranking
+from .models import Board, Task
+from .realtime import publish_task_event, TASK_STATUS_CHANGED, TASK_UPDATED
+
+VALID_STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+StatusChange = namedtuple('StatusChange', ['id', 'board', 'status', 'previous_status', 'rank', 'updated_at'])
+
+
+class StatusUpdateError(Exception):
+    def __init__(self, message, status_code, current_status=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.current_status = current_status
+
+
+def _permitted(user):
+    return Q(board__owner=user) | Q(assignee=user) | Q(created_by=user)
+
+
+def _read(user, task_id, expected_status):
+    # The counter-relevant columns plus rank and updated_at, checked for
+    # access; locked until the caller's transaction ends.
+    if expected_status is not None and expected_status not in VALID_STATUSES:
+        raise StatusUpdateError('Invalid expected_status', 400)
+    row = (
+        Task.objects.select_for_update(of=('self',)).filter(pk=task_id)
+        .values_list('board_id', 'board__owner_id', 'assignee_id', 'created_by_id', 'status', 'rank', 'updated_at')
+        .first()
+    )
+    if row is None:
+        raise StatusUpdateError('Task not found', 404)
+    before = counters.TaskSnapshot(*row[:5])
+    if user.pk not in counters.audience(before):
+        raise StatusUpdateError('Permission denied', 403)
+    if expected_status is not None and expected_status != before.status:
+        raise StatusUpdateError('Task status has changed', 409, current_status=before.status)
+    return before, row[5], row[6]
+
+
+def _write(user, task_id, before, new_status, rank):
+    # One conditional UPDATE, then what the skipped model signals would have done.
+    now = timezone.now()
+    updated = (
+        Task.objects.filter(_permitted(user), pk=task_id, status=before.status)
+        .update(status=new_status, rank=rank, updated_at=now)
+    )
+    if not updated:
+        current = Task.objects.filter(pk=task_id).values_list('status', flat=True).first()
+        if current is None:
+            raise StatusUpdateError('Task not found', 404)
+        raise StatusUpdateError('Task status has changed', 409, current_status=current)
+
+    after = before._replace(status=new_status)
+    if new_status != before.status:
+        counters.record_changes([(before, after)])
+    Board.objects.touch([before.board_id])
+    changelog.record_tasks([(task_id, 'updated', before, after)])
+
+    change = StatusChange(task_id, before.board_id, new_status, before.status, rank, now)
+    publish_task_event(
+        TASK_STATUS_CHANGED if new_status != before.status else TASK_UPDATED,
+        Task(pk=task_id, board_id=before.board_id), data=change._asdict(),
+    )
+    return change
+
+
+def change_status(user, task_id, new_status, expected_status=None):
+    """Move a task to ``new_status``; returns a ``StatusChange``."""
+    if new_status not in VALID_STATUSES:
+        raise StatusUpdateError('Invalid status', 400)
+    with transaction.atomic():
+        before, rank, updated_at = _read(user, task_id, expected_status)
+        if new_status == before.status:
+            return StatusChange(task_id, before.board_id, new_status, before.status, rank, updated_at)
+        # The old rank only orders the task within the column it leaves.
+        rank = Task.objects.next_rank(before.board_id, new_status)
+        change = _write(user, task_id, before, new_status, rank)
+        ranking.rebalance_if_crowded(before.board_id, new_status, rank)
+    return change
+
+
+def _neighbour_ranks(task_id, board_id, status, after, before):
+    """Ranks the moved task must sort between; ``None`` is an open end."""
+    column = Task.objects.filter(board_id=board_id, status=status).exclude(pk=task_id)
+    named = {pk for pk in (after, before) if pk is not None}
+    ranks = dict(column.filter(pk__in=named).values_list('pk', 'rank'))
+    if len(ranks) != len(named):
+        raise StatusUpdateError('after and before must be other tasks in the target column', 400)
+    lower = ranks.get(after)
+    upper = ranks.get(before)
+    if after is not None and before is None:
+        upper = column.filter(rank__gt=lower).order_by('rank').values_list('rank', flat=True).first()
+    elif before is not None and after is None:
+        lower = column.filter(rank__lt=upper).order_by('-rank').values_list('rank', flat=True).first()
+    elif after is None:
+        lower = column.order_by('-rank').values_list('rank', flat=True).first()
+    return lower, upper
+
+
+def _task_ref(value, name):
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise StatusUpdateError(f'{name} must be a task id', 400)
+
+
+def move_task(user, task_id, status=None, after=None, before=None, expected_status=None):
+    """
+    Place a task right after task ``after`` and/or right before task
+    ``before`` in column ``status`` (its current one by default), or at the
+    bottom of the column when neither is given. Returns a ``StatusChange``.
+    """
+    after, before_id = _task_ref(after, 'after'), _task_ref(before, 'before')
+    if status is not None and status not in VALID_STATUSES:
+        raise StatusUpdateError('Invalid status', 400)
+    with transaction.atomic():
+        snapshot, _, _ = _read(user, task_id, expected_status)
+        new_status = status or snapshot.status
+        lower, upper = _neighbour_ranks(task_id, snapshot.board_id, new_status, after, before_id)
+        if upper is not None and (lower or '') >= upper:
+            # Tied or misordered neighbours (e.g. two concurrent inserts at
+            # the same spot): respace the column and look again.
+            ranking.rebalance(snapshot.board_id, new_status)
+            lower, upper = _neighbour_ranks(task_id, snapshot.board_id, new_status, after, before_id)
+            if upper is not None and (lower or '') >= upper:
+                raise StatusUpdateError('after must come before before in the column', 400)
+        rank = ranking.between(lower, upper)
+        if len(rank) > ranking.MAX_LENGTH:
+            ranking.rebalance(snapshot.board_id, new_status)
+            rank = ranking.between(*_neighbour_ranks(task_id, snapshot.board_id, new_status, after, before_id))
+
+        change = _write(user, task_id, snapshot, new_status, rank)
+        ranking.rebalance_if_crowded(snapshot.board_id, new_status, rank)
+    return change
@@ -1,23 +1,41 @@
 # boards/views.py
-from django.contrib.auth import authenticate
-from django.db.models import Q
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework.views import APIView
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
 from rest_framework import status, viewsets
 from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.exceptions import ParseError, PermissionDenied, ValidationError
 from rest_framework.decorators import action
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.http import Http404
 from django.middleware.csrf import get_token
 from .models import Board, Task
-from .serializers import BoardSerializer, TaskSerializer, UserSerializer, TaskStatusUpdateSerializer
+from .serializers import BoardSerializer, BoardSummarySerializer, TaskSerializer, UserSerializer, TaskStatusUpdateSerializer
+from .authentication import CachedTokenAuthentication
+from .bulk import apply_operations, BulkOperationError
+from .task_status import change_status, move_task, StatusUpdateError
+from .query_planner import QueryPlanMixin, plan_queryset
+from .pagination import CreatedAtCursorPagination
+from .filters import TaskFilterBackend
+from .conditional import ConditionalRequestMixin
+from .replicas import ReplicaReadMixin
+from .renderers import JSONRenderer, NDJSONRenderer, StreamingListMixin, _aiter, stream_list
+from .archive import ArchiveError, archive_lines, export_archive, import_archive
+from .login import LoginBusy, alogin
+from .ratelimit import LoginRateThrottle, RateLimited, RateLimitedViewMixin, SignUpRateThrottle, WriteRateThrottle
+from . import changelog, response_cache, search
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .instrumentation import endpoint_stats
+from .realtime import publish_task_event, TASK_CREATED, TASK_UPDATED, TASK_STATUS_CHANGED, TASK_DELETED
 from django.contrib.auth import get_user_model
 import logging
-from django.core.cache import cache
 from django.utils import timezone
 
 # Use get_user_model() to get the custom user model
@@ -27,93 +45,72 @@ logger = logging.getLogger(__name__)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
-class LoginView(APIView):
-    authentication_classes = []
-    permission_classes = [AllowAny]
-    
-    def post(self, request):
-        username = request.data.get('username')
-        password = request.data.get('password')
-        
+class LoginView(View):
+    """
+    Token login. An async view: the password hash runs on the login hashing
+    pool (``boards.login``) while the worker keeps serving other requests.
+    """
+    throttle_message = 'Too many login attempts. Please try again later.'
+
+    async def post(self, request):
+        throttle = LoginRateThrottle()
+        if not await sync_to_async(throttle.allow_request)(request, self):
+            error = RateLimited(throttle.wait(), self.throttle_message)
+            return JsonResponse(
+                error.detail, status=error.status_code, headers={'Retry-After': str(error.detail['retry_after'])}
+            )
+
+        try:
+            data = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]).data
+        except ParseError as e:
+            return JsonResponse({'detail': str(e.detail)}, status=status.HTTP_400_BAD_REQUEST)
+        username = data.get('username')
+        password = data.get('password')
+
         # Input validation
-        if not username or not password:
-            return Response(
-                {'error': 'Please provide both username and password'}, 
+        if not username or not password or not isinstance(username, str) or not isinstance(password, str):
+            return JsonResponse(
+                {'error': 'Please provide both username and password'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
+
         # Check for empty strings
         if not username.strip() or not password.strip():
-            return Response(
-                {'error': 'Username and password cannot be empty'}, 
+            return JsonResponse(
+                {'error': 'Username and password cannot be empty'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Simple rate limiting (optional)
-        ip_address = self.get_client_ip(request)
-        cache_key = f'login_attempts_{ip_address}'
-        attempts = cache.get(cache_key, 0)
-        
-        if attempts >= 5:  # Allow 5 attempts per IP
-            return Response(
-                {'error': 'Too many login attempts. Please try again later.'}, 
-                status=status.HTTP_429_TOO_MANY_REQUESTS
-            )
-        
-        # Check if user exists
+
         try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            # Increment attempt counter
-            cache.set(cache_key, attempts + 1, timeout=300)  # 5 minutes
-            return Response(
-                {'error': 'Invalid username or password'}, 
-                status=status.HTTP_401_UNAUTHORIZED
+            result = await alogin(request, username, password)
+        except LoginBusy:
+            return JsonResponse(
+                {'error': 'Too many logins in progress. Please try again shortly.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'}
             )
-        
-        # Authenticate the user
-        user = authenticate(username=username, password=password)
-        
-        if user is not None:
-            if user.is_active:
-                # Reset attempt counter on successful login
-                cache.delete(cache_key)
-                
-                token, _ = Token.objects.get_or_create(user=user)
-                return Response({
-                    'token': token.key,
-                    'user_id': user.pk,
-                    'username': user.username,
-                    'email': user.email,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name
-                })
-            else:
-                return Response(
-                    {'error': 'Account is disabled'}, 
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
-        else:
-            # Increment attempt counter for failed password
-            cache.set(cache_key, attempts + 1, timeout=300)  # 5 minutes
-            return Response(
-                {'error': 'Invalid username or password'}, 
+        if result is None:
+            return JsonResponse(
+                {'error': 'Invalid username or password'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
-    
-    def get_client_ip(self, request):
-        """Get the client's IP address for rate limiting"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+
+        # Reset attempt counter on successful login
+        await sync_to_async(throttle.reset)(request)
+        user, token = result
+        return JsonResponse({
+            'token': token.key,
+            'user_id': user.pk,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name
+        })
 
 @method_decorator(csrf_exempt, name='dispatch')
-class SignUpView(APIView):
+class SignUpView(RateLimitedViewMixin, APIView):
     authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [SignUpRateThrottle]
     
     def post(self, request):
         username = request.data.get('username')
@@ -146,7 +143,7 @@ class SignUpView(APIView):
             return Response({'error': 'Failed to create user'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 class LogoutView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
@@ -158,7 +155,7 @@ class LogoutView(APIView):
             return Response({'error': 'An error occurred during logout.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 class CurrentUserView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -188,18 +185,28 @@ class APIRootView(APIView):
                 'logout': '/api/logout/',
                 'signup': '/api/signup/',
                 'current-user': '/api/users/me/',
+                'search': '/api/search/?q=',
+                'changes': '/api/changes/?since=',
+                'board-export': '/api/boards/export/',
+                'board-import': '/api/boards/import/',
             },
             'frontend': 'http://localhost:5173'
         })
 
-class BoardViewSet(viewsets.ModelViewSet):
-    authentication_classes = [TokenAuthentication]
+class BoardViewSet(
+    RateLimitedViewMixin, ReplicaReadMixin, ConditionalRequestMixin, StreamingListMixin, QueryPlanMixin,
+    viewsets.ModelViewSet,
+):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [WriteRateThrottle]
     serializer_class = BoardSerializer
+    pagination_class = CreatedAtCursorPagination
+    etag_fields = ('updated_at', 'version')
     queryset = Board.objects.all()
     
     def get_queryset(self):
-        return Board.objects.filter(Q(owner=self.request.user) | Q(tasks__assignee=self.request.user)).distinct()
+        return Board.objects.visible_to(self.request.user)
     
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -258,18 +265,79 @@ class BoardViewSet(viewsets.ModelViewSet):
         except Exception as e:
             logger.error(f"Error deleting board: {str(e)}")
             return Response({'error': f'An error occurred while deleting the board: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-class TaskViewSet(viewsets.ModelViewSet):
-    authentication_classes = [TokenAuthentication]
+
+    def _archive_response(self, request, boards, filename):
+        compress = request.query_params.get('gzip') in ('1', 'true')
+        content = export_archive(boards, compress=compress)
+        if isinstance(request._request, ASGIRequest):
+            content = _aiter(content)
+        response = StreamingHttpResponse(
+            content, content_type='application/gzip' if compress else NDJSONRenderer.media_type
+        )
+        extension = '.ndjson.gz' if compress else '.ndjson'
+        response['Content-Disposition'] = f'attachment; filename="{filename}{extension}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[JSONRenderer, NDJSONRenderer])
+    def export_all(self, request):
+        """Every board visible to the user, with its tasks, as an NDJSON archive (``?gzip=1`` compresses it)."""
+        return self._archive_response(request, self.get_queryset(), 'boards')
+
+    @action(detail=True, methods=['get'], renderer_classes=[JSONRenderer, NDJSONRenderer])
+    def export(self, request, pk=None):
+        """One board with its tasks as an NDJSON archive (``?gzip=1`` compresses it)."""
+        board = self.get_object()
+        return self._archive_response(request, Board.objects.filter(pk=board.pk), f'board-{board.pk}')
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_boards(self, request):
+        """Create the boards and tasks of an archive in the request body (NDJSON, or gzip of it) for the user."""
+        # Read from the stream as it arrives rather than through request.data.
+        stream = request.stream
+        try:
+            imported = import_archive(archive_lines(stream) if stream is not None else [], owner=request.user)
+        except ArchiveError as e:
+            return Response({'error': str(e), 'imported': e.imported}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(imported, status=status.HTTP_201_CREATED)
+class TaskViewSet(
+    RateLimitedViewMixin, ReplicaReadMixin, ConditionalRequestMixin, StreamingListMixin, QueryPlanMixin,
+    viewsets.ModelViewSet,
+):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [WriteRateThrottle]
     serializer_class = TaskSerializer
+    pagination_class = CreatedAtCursorPagination
+    cache_fields = ('board__version',)
+    filter_backends = [TaskFilterBackend]
     queryset = Task.objects.all()
     
     def get_queryset(self):
         user = self.request.user
-        return Task.objects.filter(Q(board__owner=user) | Q(assignee=user) | Q(created_by=user))
+        return Task.objects.visible_to(user)
     
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        task = serializer.save(created_by=self.request.user)
+        publish_task_event(TASK_CREATED, task)
+    
+    def perform_update(self, serializer):
+        previous_status = serializer.instance.status
+        task = serializer.save()
+        publish_task_event(TASK_STATUS_CHANGED if task.status != previous_status else TASK_UPDATED, task)
+    
+    def perform_destroy(self, instance):
+        publish_task_event(TASK_DELETED, instance)
+        instance.delete()
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Apply a batch of create/move/reassign/delete operations in one transaction."""
+        operations = request.data.get('operations') if isinstance(request.data, dict) else request.data
+        try:
+            results = apply_operations(request.user, operations)
+        except BulkOperationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': results})
     
     # boards/views.py - TaskViewSet update method
 def update(self, request, *args, **kwargs):
@@ -307,40 +375,61 @@ def update(self, request, *args, **kwargs):
             logger.error(f"Error deleting task: {str(e)}")
             return Response({'error': f'An error occurred while deleting the task: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class TaskStatusUpdateView(APIView):
-    authentication_classes = [TokenAuthentication]
+class TaskStatusUpdateView(RateLimitedViewMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [WriteRateThrottle]
     
     def patch(self, request, task_id):
+        """
+        Move a task to ``status``. Send ``expected_status`` to get a 409 instead
+        of overwriting a move someone else made since you loaded the task.
+        """
         try:
-            task = Task.objects.get(id=task_id)
-            
-            # Check permissions - allow board owner or task assignee to update
-            if request.user != task.board.owner and request.user != task.assignee and request.user != task.created_by:
-                return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate status
-            valid_statuses = ['To-Do', 'In Progress', 'Completed']
-            new_status = request.data.get('status')
-            if new_status not in valid_statuses:
-                return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Update task status
-            task.status = new_status
-            task.save()
-            
-            # Return updated task data
-            serializer = TaskSerializer(task)
-            return Response(serializer.data)
-            
-        except Task.DoesNotExist:
-            return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+            change = change_status(
+                request.user, task_id, request.data.get('status'), request.data.get('expected_status')
+            )
+            return Response(change._asdict())
+        except StatusUpdateError as e:
+            body = {'error': str(e)}
+            if e.current_status is not None:
+                body['current_status'] = e.current_status
+            return Response(body, status=e.status_code)
         except Exception as e:
             logger.error(f"Error updating task status: {str(e)}")
             return Response({'error': f'An error occurred while updating the task: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
-    authentication_classes = [TokenAuthentication]
+class TaskMoveView(RateLimitedViewMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [WriteRateThrottle]
+    
+    def post(self, request, task_id):
+        """
+        Place a task between two cards: ``{"status", "after", "before"}``, where
+        ``after``/``before`` are ids of its new neighbours (either may be omitted)
+        and ``status`` defaults to its current column.
+        """
+        try:
+            change = move_task(
+                request.user, task_id,
+                status=request.data.get('status'),
+                after=request.data.get('after'),
+                before=request.data.get('before'),
+                expected_status=request.data.get('expected_status'),
+            )
+            return Response(change._asdict())
+        except StatusUpdateError as e:
+            body = {'error': str(e)}
+            if e.current_status is not None:
+                body['current_status'] = e.current_status
+            return Response(body, status=e.status_code)
+        except Exception as e:
+            logger.error(f"Error moving task: {str(e)}")
+            return Response({'error': f'An error occurred while moving the task: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class UserViewSet(ReplicaReadMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -351,8 +440,8 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
-class UserAssignmentsView(APIView):
-    authentication_classes = [TokenAuthentication]
+class UserAssignmentsView(ReplicaReadMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get(self, request, user_id):
@@ -361,9 +450,8 @@ class UserAssignmentsView(APIView):
             if user != request.user:
                 raise PermissionDenied("You don't have permission to view this user's assignments")
             
-            assignments = Task.objects.filter(assignee=user)
-            serializer = TaskSerializer(assignments, many=True)
-            return Response(serializer.data)
+            assignments = plan_queryset(Task.objects.filter(assignee=user), TaskSerializer())
+            return stream_list(request, assignments, TaskSerializer)
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         except PermissionDenied as e:
@@ -372,8 +460,8 @@ class UserAssignmentsView(APIView):
             logger.error(f"Error fetching user assignments: {str(e)}")
             return Response({'error': f'An error occurred while fetching user assignments: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class UserAssignedBoardsView(APIView):
-    authentication_classes = [TokenAuthentication]
+class UserAssignedBoardsView(ReplicaReadMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get(self, request, user_id):
@@ -382,13 +470,141 @@ class UserAssignedBoardsView(APIView):
             if user != request.user:
                 raise PermissionDenied("You don't have permission to view this user's assigned boards")
             
-            assigned_boards = Board.objects.filter(tasks__assignee=user).distinct()
-            serializer = BoardSerializer(assigned_boards, many=True)
-            return Response(serializer.data)
+            assigned_boards = plan_queryset(Board.objects.assigned_to(user), BoardSerializer())
+            return stream_list(request, assigned_boards, BoardSerializer)
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         except PermissionDenied as e:
             return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
         except Exception as e:
             logger.error(f"Error fetching user assigned boards: {str(e)}")
-            return Response({'error': f'An error occurred while fetching user assigned boards: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({'error': f'An error occurred while fetching user assigned boards: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+class SearchView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    page_size = 20
+    max_page_size = 100
+    
+    def get(self, request):
+        """
+        Boards and tasks visible to the user that match ``q``, best match
+        first, ``page_size`` per page (``?page=2``, ...).
+        """
+        query = request.query_params.get('q', '').strip()
+        if not search.terms(query):
+            return Response({'error': 'Provide a search query with ?q='}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(self.max_page_size, max(1, int(request.query_params.get('page_size', self.page_size))))
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            # One row past the page tells whether there is a next one.
+            hits = search.search(request.user, query, limit=page_size + 1, offset=(page - 1) * page_size)
+            has_next = len(hits) > page_size
+            hits = hits[:page_size]
+            
+            context = {'request': request}
+            rendered = {}
+            for kind, model, serializer_class in (
+                ('board', Board, BoardSummarySerializer), ('task', Task, TaskSerializer)
+            ):
+                ids = [pk for hit_kind, pk, _ in hits if hit_kind == kind]
+                if not ids:
+                    continue
+                objects = plan_queryset(model.objects.filter(pk__in=ids), serializer_class(context=context))
+                for obj in objects:
+                    rendered[(kind, obj.pk)] = serializer_class(obj, context=context).data
+            
+            url = request.build_absolute_uri()
+            return Response({
+                'next': replace_query_param(url, 'page', page + 1) if has_next else None,
+                'previous': (
+                    None if page == 1 else
+                    remove_query_param(url, 'page') if page == 2 else replace_query_param(url, 'page', page - 1)
+                ),
+                'results': [
+                    {'type': kind, 'id': pk, 'score': round(score, 4), 'object': rendered[(kind, pk)]}
+                    for kind, pk, score in hits if (kind, pk) in rendered
+                ],
+            })
+        except Exception as e:
+            logger.error(f"Error searching: {str(e)}")
+            return Response({'error': f'An error occurred while searching: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class ChangeFeedView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Boards and tasks created, updated or deleted since ``since`` (a cursor
+        from a previous response), as seen by the requesting user. Without
+        ``since``, only returns the current cursor to start syncing from.
+        """
+        try:
+            since = request.query_params.get('since')
+            limit = min(changelog.MAX_LIMIT, max(1, int(request.query_params.get('limit', changelog.DEFAULT_LIMIT))))
+            if since is None:
+                return Response({'cursor': changelog.latest_cursor(request.user), 'has_more': False, 'changes': []})
+            since = int(since)
+            if since < 0:
+                raise ValueError(since)
+        except ValueError:
+            return Response({'error': 'since and limit must be non-negative integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            entries, cursor, has_more = changelog.read(request.user, since, limit)
+        except changelog.CursorExpired:
+            return Response(
+                {'error': 'This cursor is too old; reload and start again from a fresh cursor.'},
+                status=status.HTTP_410_GONE,
+            )
+        
+        try:
+            context = {'request': request}
+            rendered = {}
+            for kind, queryset, serializer_class in (
+                ('board', Board.objects.visible_to(request.user), BoardSummarySerializer),
+                ('task', Task.objects.visible_to(request.user), TaskSerializer),
+            ):
+                ids = [object_id for _, entry_kind, object_id, _, entry_action in entries
+                       if entry_kind == kind and entry_action != 'deleted']
+                if not ids:
+                    continue
+                objects = plan_queryset(queryset.filter(pk__in=ids), serializer_class(context=context))
+                for obj in objects:
+                    rendered[(kind, obj.pk)] = serializer_class(obj, context=context).data
+            
+            changes = []
+            for entry_cursor, kind, object_id, board_id, entry_action in entries:
+                data = rendered.get((kind, object_id))
+                change = {
+                    'cursor': entry_cursor, 'type': kind, 'id': object_id, 'board': board_id,
+                    # Gone, or no longer visible to this user.
+                    'action': entry_action if data is not None else 'deleted',
+                }
+                if data is not None:
+                    change['object'] = data
+                changes.append(change)
+            return Response({'cursor': cursor, 'has_more': has_more, 'changes': changes})
+        except Exception as e:
+            logger.error(f"Error reading change feed: {str(e)}")
+            return Response({'error': f'An error occurred while reading changes: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class ResponseCacheStatsView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        """Hit/miss counters of this process' board/task payload cache."""
+        return Response(response_cache.stats.snapshot())
+
+class RequestMetricsView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        """Rolling per-endpoint timings and query counts of this process' sampled requests."""
+        return Response(endpoint_stats.snapshot())
@@ -0,0 +1,122 @@
+# boards/views_async.py
+"""
+Async versions of the read-heavy API endpoints, mounted under ``/api/async/``.
+
+They return the same payloads as their ``/api/`` counterparts (including
+``?fields=``/``?expand=`` and the task filters) but run natively under ASGI:
+token lookups are answered from the process-local cache without leaving the
+event loop, queries go through Django's async ORM with the usual query plan
+(on a read replica when configured, see ``boards.replicas``), and serializers
+only ever see fully loaded objects. Cursor pagination, ETags and the response
+cache stay on the sync endpoints.
+"""
+import logging
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.request import Request
+
+from .authentication import CachedTokenAuthentication
+from .filters import TaskFilterBackend
+from .models import Board, Task
+from .query_planner import plan_queryset
+from .replicas import areplica_for, reading_from
+from .serializers import BoardSerializer, TaskSerializer, UserSerializer
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+async def _authenticate(request):
+    auth = request.headers.get('Authorization', '').split()
+    if len(auth) != 2 or auth[0] != 'Token':
+        return None
+    try:
+        user, _token = await CachedTokenAuthentication().aauthenticate_credentials(auth[1])
+    except AuthenticationFailed:
+        return None
+    return user
+
+
+def async_api_view(view):
+    """GET-only, token-authenticated async JSON view."""
+    @require_GET
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await _authenticate(request)
+        if user is None:
+            return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+        request.user = user
+        try:
+            with reading_from(await areplica_for(request)):
+                return await view(request, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error in async view {view.__name__}: {str(e)}")
+            return JsonResponse({'error': 'An unexpected error occurred.'}, status=500)
+    return wrapper
+
+
+async def _render_many(request, queryset, serializer_class):
+    context = {'request': Request(request)}
+    queryset = plan_queryset(queryset, serializer_class(context=context))
+    instances = [instance async for instance in queryset]
+    return JsonResponse(serializer_class(instances, many=True, context=context).data, safe=False)
+
+
+@async_api_view
+async def board_list(request):
+    return await _render_many(request, Board.objects.visible_to(request.user), BoardSerializer)
+
+
+@async_api_view
+async def board_detail(request, pk):
+    context = {'request': Request(request)}
+    queryset = plan_queryset(Board.objects.visible_to(request.user), BoardSerializer(context=context))
+    board = await queryset.filter(pk=pk).afirst()
+    if board is None:
+        return JsonResponse({'detail': 'No Board matches the given query.'}, status=404)
+    return JsonResponse(BoardSerializer(board, context=context).data)
+
+
+@async_api_view
+async def task_list(request):
+    drf_request = Request(request)
+    drf_request.user = request.user
+    try:
+        queryset = TaskFilterBackend().filter_queryset(drf_request, Task.objects.visible_to(request.user), None)
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    return await _render_many(request, queryset, TaskSerializer)
+
+
+async def _own_user_id(request, user_id, message):
+    if not await User.objects.filter(pk=user_id).aexists():
+        return JsonResponse({'error': 'User not found'}, status=404)
+    if user_id != request.user.pk:
+        return JsonResponse({'error': message}, status=403)
+    return None
+
+
+@async_api_view
+async def user_assignments(request, user_id):
+    denied = await _own_user_id(request, user_id, "You don't have permission to view this user's assignments")
+    if denied is not None:
+        return denied
+    return await _render_many(request, Task.objects.filter(assignee_id=user_id), TaskSerializer)
+
+
+@async_api_view
+async def user_assigned_boards(request, user_id):
+    denied = await _own_user_id(request, user_id, "You don't have permission to view this user's assigned boards")
+    if denied is not None:
+        return denied
+    return await _render_many(request, Board.objects.assigned_to(request.user), BoardSerializer)
+
+
+@async_api_view
+async def current_user(request):
+    return JsonResponse(UserSerializer(request.user).data)
@@ -3,11 +3,12 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.db.models import Q
 from django.contrib.auth import get_user_model
+from django.db.models import Q, Sum
 
-from .models import Board, Task
+from .models import Board, Task, UserTaskCount
 from .forms import BoardForm, TaskForm
+from .realtime import publish_task_event, TASK_CREATED, TASK_UPDATED, TASK_STATUS_CHANGED
 
 User = get_user_model()
 
@@ -24,18 +25,18 @@ def dashboard(request):
     
     # Get counts
     boards_count = Board.objects.filter(owner=user).count()
-    tasks_count = Task.objects.filter(
-        Q(board__owner=user) | Q(assignee=user)
-    ).count()
+    # The counters cover every task visible to the user, including the ones
+    # they only created, which the dashboard does not list.
+    visible_count = UserTaskCount.objects.filter(user=user).aggregate(total=Sum('count'))['total'] or 0
+    only_created = Task.objects.filter(created_by=user).exclude(Q(board__owner=user) | Q(assignee=user)).count()
+    tasks_count = visible_count - only_created
     users_count = User.objects.count()
     
     # Get recent boards
-    recent_boards = Board.objects.filter(owner=user).order_by('-created_at')[:5]
+    recent_boards = Board.objects.filter(owner=user).prefetch_related('task_counts').order_by('-created_at')[:5]
     
     # Get recent tasks
-    recent_tasks = Task.objects.filter(
-        Q(board__owner=user) | Q(assignee=user)
-    ).order_by('-created_at')[:5]
+    recent_tasks = Task.objects.listed_for(user).order_by('-created_at')[:5]
     
     context = {
         'boards_count': boards_count,
@@ -51,9 +52,7 @@ def dashboard(request):
 def boards_list(request):
     """List all boards for the current user"""
     user = request.user
-    boards = Board.objects.filter(
-        Q(owner=user) | Q(tasks__assignee=user)
-    ).distinct().order_by('-created_at')
+    boards = Board.objects.visible_to(user).prefetch_related('task_counts').order_by('-created_at')
     
     context = {
         'boards': boards,
@@ -66,11 +65,11 @@ def board_detail(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if board.owner != request.user and not board.tasks.filter(assignee=request.user).exists():
+    if not Board.objects.visible_to(request.user).filter(id=board.id).exists():
         messages.error(request, "You don't have permission to view this board.")
         return redirect('boards_list')
     
-    tasks = board.tasks.all().order_by('status', 'created_at')
+    tasks = board.tasks.all().order_by('status', 'rank', 'id')
     
     context = {
         'board': board,
@@ -123,9 +122,7 @@ def board_edit(request, board_id):
 def tasks_list(request):
     """List all tasks for the current user"""
     user = request.user
-    tasks = Task.objects.filter(
-        Q(board__owner=user) | Q(assignee=user)
-    ).order_by('-created_at')
+    tasks = Task.objects.listed_for(user).order_by('-created_at')
     
     context = {
         'tasks': tasks,
@@ -141,6 +138,7 @@ def task_create(request):
             task = form.save(commit=False)
             task.created_by = request.user
             task.save()
+            publish_task_event(TASK_CREATED, task)
             messages.success(request, f'Task "{task.title}" created successfully!')
             return redirect('board_detail', board_id=task.board.id)
     else:
@@ -163,9 +161,11 @@ def task_edit(request, task_id):
         return redirect('tasks_list')
     
     if request.method == 'POST':
+        previous_status = task.status
         form = TaskForm(request.POST, instance=task, user=request.user)
         if form.is_valid():
             form.save()
+            publish_task_event(TASK_STATUS_CHANGED if task.status != previous_status else TASK_UPDATED, task)
             messages.success(request, f'Task "{task.title}" updated successfully!')
             return redirect('board_detail', board_id=task.board.id)
     else:
@@ -190,8 +190,11 @@ def task_status_update(request, task_id):
     
     new_status = request.POST.get('status')
     if new_status in ['To-Do', 'In Progress', 'Completed']:  # Fixed to match your STATUS_CHOICES
+        previous_status = task.status
         task.status = new_status
         task.save()
+        if new_status != previous_status:
+            publish_task_event(TASK_STATUS_CHANGED, task)
         return JsonResponse({'success': True, 'status': task.status})
     
     return JsonResponse({'error': 'Invalid status'}, status=400)
\ No newline at end of file
@@ -2,6 +2,8 @@
 ASGI config for workboard project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; websocket connections to ``/ws/boards/<id>/`` are
+served by the board events channel in ``boards.realtime``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -12,5 +14,16 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'workboard.settings')
+# Read by workboard.database: no persistent connections under ASGI.
+os.environ.setdefault('WORKBOARD_ASGI', 'True')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up so the app registry is ready.
+from boards.realtime import board_events  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        return await board_events(scope, receive, send)
+    return await django_application(scope, receive, send)
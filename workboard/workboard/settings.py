@@ -1,7 +1,10 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
 
+from .database import database_from_env, replicas_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -31,12 +34,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'boards.middleware.AsyncWhiteNoiseMiddleware',
+    'boards.instrumentation.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'boards.replicas.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,15 +65,43 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'workboard.wsgi.application'
+ASGI_APPLICATION = 'workboard.asgi.application'
 
-# Database
+# Database: DATABASE_URL (default: db.sqlite3 next to manage.py), with
+# persistent or pooled PostgreSQL connections and WAL-mode SQLite
+# (see workboard/database.py for the DB_* and SQLITE_* variables)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(BASE_DIR),
+    **replicas_from_env(BASE_DIR),
+}
+
+# Broker used to fan out real-time board events (see boards/realtime.py);
+# on PostgreSQL, LISTEN/NOTIFY reaches the sockets of every worker.
+BOARD_EVENTS_BROKER = os.environ.get('BOARD_EVENTS_BROKER', (
+    'boards.realtime.PostgresBroker' if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    else 'boards.realtime.InProcessBroker'
+))
+
+# Safe requests to the board/task/user endpoints read from the replicas in
+# DATABASE_REPLICA_URLS (boards.replicas). A user who writes is pinned to the
+# primary for REPLICA_PIN_SECONDS by a signed cookie that every worker can
+# read. REPLICA_PIN_CACHE optionally names a cache alias shared by the
+# workers to also pin clients that do not keep cookies.
+DATABASE_ROUTERS = ['boards.replicas.ReplicaRouter']
+DATABASE_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'PIN_SECONDS': int(os.environ.get('REPLICA_PIN_SECONDS', 5)),
+    'CACHE_ALIAS': os.environ.get('REPLICA_PIN_CACHE') or None,
 }
 
+PASSWORD_HASHERS = [
+    'boards.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -144,13 +177,121 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'boards.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'boards.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        # Accept: application/msgpack, with the msgpack package installed.
+        *(['boards.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+    ],
+}
+
+# Response rendering (boards.renderers): orjson for JSON when installed
+# (API_JSON_ENCODER=json for the stdlib), and unpaginated task lists of
+# API_STREAM_MIN_ROWS rows or more streamed API_STREAM_CHUNK_SIZE rows at a time.
+API_RENDERING = {
+    'JSON_ENCODER': os.environ.get('API_JSON_ENCODER', 'orjson'),
+    'STREAM_MIN_ROWS': int(os.environ.get('API_STREAM_MIN_ROWS', 1000)),
+    'STREAM_CHUNK_SIZE': int(os.environ.get('API_STREAM_CHUNK_SIZE', 500)),
+}
+
+# Hand-written read-only serializers (boards.fast_serializers) for task, board
+# and user lists; FAST_SERIALIZERS_ENABLED=False renders them through DRF.
+FAST_SERIALIZERS = {
+    'ENABLED': os.environ.get('FAST_SERIALIZERS_ENABLED', 'True') == 'True',
+}
+
+# Board archives (boards.archive): boards read per query on export, and tasks
+# created per transaction on import.
+BOARD_ARCHIVES = {
+    'EXPORT_CHUNK_SIZE': int(os.environ.get('ARCHIVE_EXPORT_CHUNK_SIZE', 500)),
+    'IMPORT_BATCH_SIZE': int(os.environ.get('ARCHIVE_IMPORT_BATCH_SIZE', 1000)),
+}
+
+# Token lookup cache used by boards.authentication.CachedTokenAuthentication.
+# Set TOKEN_AUTH_SHARED_CACHE to a cache alias (e.g. a Redis-backed one) to
+# share entries, and revocations, between workers. Without it a worker never
+# hears about tokens revoked in another one, so the per-process tier is only
+# on by default when a single worker runs (gunicorn reads WEB_CONCURRENCY).
+TOKEN_AUTH_CACHE = {
+    'MAX_ENTRIES': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_ENTRIES', 4096)),
+    'TTL': int(os.environ.get(
+        'TOKEN_AUTH_CACHE_TTL',
+        30 if os.environ.get('TOKEN_AUTH_SHARED_CACHE') or int(os.environ.get('WEB_CONCURRENCY', 1)) == 1 else 0,
+    )),
+    'SHARED_CACHE': os.environ.get('TOKEN_AUTH_SHARED_CACHE') or None,
+}
+
+# Cache of serialized board/task payloads (boards.response_cache). Entries are
+# keyed by board versions, so they never need explicit invalidation.
+BOARD_RESPONSE_CACHE = {
+    'ENABLED': os.environ.get('BOARD_RESPONSE_CACHE_ENABLED', 'True') == 'True',
+    'ALIAS': os.environ.get('BOARD_RESPONSE_CACHE_ALIAS', 'default'),
+    'TIMEOUT': int(os.environ.get('BOARD_RESPONSE_CACHE_TIMEOUT', 300)),
+}
+
+# Per-request query/timing instrumentation (boards.instrumentation). Sampled
+# requests get a Server-Timing header and a JSON line on the boards.requests
+# logger; set REQUEST_LOG_LEVEL=INFO to log every sample, not only the ones
+# flagged for repeated queries.
+REQUEST_METRICS = {
+    'ENABLED': os.environ.get('REQUEST_METRICS_ENABLED', 'True') == 'True',
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', 1.0 if DEBUG else 0.1)),
+}
+
+# Manual task ordering (boards.ranking). Columns whose ranks reach
+# REBALANCE_LENGTH characters are respaced in a background thread after the
+# move; run `manage.py rebalance_task_ranks` periodically when that is off.
+TASK_RANKING = {
+    'REBALANCE_LENGTH': int(os.environ.get('TASK_RANK_REBALANCE_LENGTH', 12)),
+    'BACKGROUND_REBALANCE': os.environ.get('TASK_RANK_BACKGROUND_REBALANCE', 'True') == 'True',
+}
+
+# Sliding-window rate limits (boards.ratelimit): login attempts and sign-ups
+# per address, writes per user. Login/sign-up counters are shared through the
+# database by default, write counters through RATE_LIMIT_CACHE; point that at
+# a cache the workers share (e.g. Redis) or each worker counts on its own.
+RATE_LIMITS = {
+    'ENABLED': os.environ.get('RATE_LIMITS_ENABLED', 'True') == 'True',
+    'STORE': os.environ.get('RATE_LIMIT_STORE', 'database'),
+    'STORES': {'writes': os.environ.get('RATE_LIMIT_WRITES_STORE', 'cache')},
+    'CACHE_ALIAS': os.environ.get('RATE_LIMIT_CACHE', 'default'),
+    'RATES': {
+        'login': os.environ.get('RATE_LIMIT_LOGIN', '5/5m'),
+        'signup': os.environ.get('RATE_LIMIT_SIGNUP', '10/h'),
+        'writes': os.environ.get('RATE_LIMIT_WRITES', '600/m'),
+    },
+}
+
+# Login pipeline (boards.login): password hashes run on LOGIN_HASH_WORKERS
+# threads per process with up to LOGIN_MAX_PENDING logins queued (503 beyond).
+# LOGIN_PASSWORD_ITERATIONS sets the PBKDF2 cost; stored hashes of another
+# cost are re-hashed at it on the next login.
+LOGIN = {
+    'HASH_WORKERS': int(os.environ.get('LOGIN_HASH_WORKERS', 2)),
+    'MAX_PENDING': int(os.environ.get('LOGIN_MAX_PENDING', 32)),
+    'PASSWORD_ITERATIONS': int(os.environ.get('LOGIN_PASSWORD_ITERATIONS') or 0) or None,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'boards.requests': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
 }
 
 SIMPLE_JWT = {
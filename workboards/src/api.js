@@ -184,10 +184,20 @@ export const getTasks = async (boardId) => {
   }
 };
 
-export const getAllTasks = async () => {
+// Change feed for incremental sync: call without `since` to get a starting
+// cursor, then pass the returned cursor back. A 410 means the cursor expired
+// and the client should reload everything.
+export const getChanges = async (since, limit) => {
+  const response = await api.get("/changes/", { params: { since, limit } });
+  return response.data;
+};
+
+// filters: any of status, board, assignee, created_by, created_after,
+// created_before, updated_after, updated_before, updated_since
+export const getAllTasks = async (filters = {}) => {
   try {
-    console.log("Fetching all tasks");
-    const response = await api.get("/tasks/");
+    console.log("Fetching all tasks", filters);
+    const response = await api.get("/tasks/", { params: filters });
     console.log("Tasks data received:", response.data);
     return response.data;
   } catch (error) {
@@ -0,0 +1,43 @@
+import { useEffect } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { API_URL } from "../api";
+
+const applyEvent = (board, event) => {
+  if (!board) return board;
+  if (event.type === "board.resync") return undefined;
+
+  const existing = (board.tasks || []).find((task) => task.id === event.task.id);
+  const tasks = (board.tasks || []).filter((task) => task.id !== event.task.id);
+  if (event.type !== "task.deleted") {
+    // Status changes carry only the changed fields; merge them into the cached task.
+    tasks.unshift({ ...existing, ...event.task });
+  }
+  return { ...board, tasks };
+};
+
+// Keep the cached board in sync with task deltas pushed by the server.
+export const useBoardEvents = (boardId) => {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    const token = localStorage.getItem("token");
+    if (!boardId || !token) return undefined;
+
+    const url = `${API_URL.replace(/^http/, "ws").replace(/\/api$/, "")}/ws/boards/${boardId}/`;
+    const socket = new WebSocket(url);
+    // The token goes in the first frame rather than the URL, which ends up in access logs.
+    socket.onopen = () => socket.send(JSON.stringify({ token }));
+
+    socket.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      const updated = applyEvent(queryClient.getQueryData(["board", boardId]), event);
+      if (updated === undefined) {
+        queryClient.invalidateQueries({ queryKey: ["board", boardId] });
+      } else {
+        queryClient.setQueryData(["board", boardId], updated);
+      }
+    };
+
+    return () => socket.close();
+  }, [boardId, queryClient]);
+};
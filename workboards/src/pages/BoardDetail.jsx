@@ -5,6 +5,7 @@ import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import axios from "axios";
 import { toast } from "react-hot-toast";
 import { API_URL } from "../api";
+import { useBoardEvents } from "../lib/boardEvents";
 import {
   DndContext,
   useSensor,
@@ -20,12 +21,21 @@ import { BoardHeader } from "../components/BoardHeader";
 import { StatusColumn } from "../components/StatusColumn";
 import { GripVertical } from "lucide-react";
 
+// Cards within a column are ordered by rank, then id (see boards/ranking.py).
+const compareRank = (a, b) =>
+  (a.rank || "") < (b.rank || "")
+    ? -1
+    : (a.rank || "") > (b.rank || "")
+    ? 1
+    : a.id - b.id;
+
 const BoardDetail = () => {
   const { boardId } = useParams();
   const navigate = useNavigate();
   const { user } = useAuth();
   const queryClient = useQueryClient();
   const [activeTask, setActiveTask] = useState(null);
+  useBoardEvents(boardId);
 
   const sensors = useSensors(
     useSensor(PointerSensor, {
@@ -53,20 +63,44 @@ const BoardDetail = () => {
   // Debug: Check what data is being received
   console.log("Board data:", board);
 
-  const updateTaskStatusMutation = useMutation({
-    mutationFn: async ({ taskId, status }) => {
-      const response = await axios.patch(
-        `${API_URL}/tasks/${taskId}/`,
-        { status }
-      );
+  const moveTaskMutation = useMutation({
+    mutationFn: async ({ taskId, status, previousStatus, after, before }) => {
+      const response = await axios.post(`${API_URL}/tasks/${taskId}/move/`, {
+        status,
+        after,
+        before,
+        expected_status: previousStatus,
+      });
       return response.data;
     },
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ["board", boardId] });
-      toast.success("Task moved successfully!");
+    onSuccess: (change) => {
+      // The move endpoint answers with a compact delta; patch it into the cached board.
+      queryClient.setQueryData(["board", boardId], (current) =>
+        current && {
+          ...current,
+          tasks: (current.tasks || []).map((task) =>
+            task.id === change.id
+              ? {
+                  ...task,
+                  status: change.status,
+                  rank: change.rank,
+                  updated_at: change.updated_at,
+                }
+              : task
+          ),
+        }
+      );
+      if (change.status !== change.previous_status) {
+        toast.success("Task moved successfully!");
+      }
     },
     onError: (error) => {
       console.error("Error moving task:", error);
+      if (error.response?.status === 409) {
+        queryClient.invalidateQueries({ queryKey: ["board", boardId] });
+        toast.error("Someone else moved this task. The board has been refreshed.");
+        return;
+      }
       toast.error(error.response?.data?.error || "Failed to move task");
     },
   });
@@ -227,14 +261,38 @@ const BoardDetail = () => {
     if (!activeTask) return;
 
     if (over.data.current?.type === "status") {
+      // Dropped on a column: bottom of that column.
       const newStatus = over.data.current.status;
       if (newStatus !== activeTask.status) {
-        updateTaskStatusMutation.mutate({
+        moveTaskMutation.mutate({
           taskId: activeId,
           status: newStatus,
+          previousStatus: activeTask.status,
         });
       }
+      return;
     }
+
+    // Dropped on a card: take its place, pushing it down (or up when moving
+    // further down the same column).
+    const overTask = board?.tasks?.find((task) => task.id === overId);
+    if (!overTask) return;
+    const column = getTasksByStatus(overTask.status).filter(
+      (task) => task.id !== activeId
+    );
+    const overIndex = column.findIndex((task) => task.id === overId);
+    const movingDown =
+      overTask.status === activeTask.status &&
+      compareRank(activeTask, overTask) < 0;
+    const after = movingDown ? overTask : column[overIndex - 1];
+    const before = movingDown ? column[overIndex + 1] : overTask;
+    moveTaskMutation.mutate({
+      taskId: activeId,
+      status: overTask.status,
+      previousStatus: activeTask.status,
+      after: after?.id,
+      before: before?.id,
+    });
   };
 
   const handleDragCancel = () => {
@@ -267,7 +325,9 @@ const BoardDetail = () => {
   };
 
   const getTasksByStatus = (status) =>
-    board?.tasks?.filter((task) => task.status === status) || [];
+    (board?.tasks?.filter((task) => task.status === status) || []).sort(
+      compareRank
+    );
 
   const canDeleteBoard = user && board?.owner && user.id === board.owner.id;
   const canEditTask = (task) =>